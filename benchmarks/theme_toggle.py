@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Theme toggle time of the store view against store size.
+
+    python benchmarks/theme_toggle.py --sizes 8,32,128 --output theme.json
+
+The catalog is repeated to each number of store cards and the day/night
+theme is toggled --toggles times. 'toggle' covers the switch and one pass
+of the event loop, i.e. until the screen shows the new theme; 'settled'
+runs on until the widgets off screen are restyled too. The dashboard runs
+offscreen against an in-process fake_podman, so neither a display nor
+Podman is needed. Prints a JSON report.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Bump when a change makes reports incomparable with older ones
+BENCHMARK_VERSION = 1
+
+
+def _summarize(samples):
+    """Millisecond statistics for a list of durations in seconds."""
+    if not samples:
+        return {'n': 0}
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        'n': len(ms),
+        'min_ms': round(ms[0], 3),
+        'median_ms': round(statistics.median(ms), 3),
+        'p95_ms': round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        'max_ms': round(ms[-1], 3),
+    }
+
+
+def run_theme_benchmark(sizes, toggles):
+    """Time theme toggles on the store view for each store size in sizes."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from dataclasses import replace
+    from PyQt6.QtWidgets import QApplication, QWidget
+    from ui.components import Dashboard
+    from ui.styles import theme_manager
+    from utils.file_utils import load_features
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    catalog = load_features()
+    report = {
+        'benchmark_version': BENCHMARK_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'host': {'cpus': os.cpu_count(), 'kernel': platform.release(), 'machine': platform.machine()},
+        'toggles': toggles,
+        'sizes': {},
+    }
+
+    def toggle():
+        started = time.perf_counter()
+        theme_manager.toggle_theme()
+        app.processEvents()
+        shown = time.perf_counter() - started
+        while theme_manager.pending_restyles():
+            app.processEvents()
+        return shown, time.perf_counter() - started
+
+    for size in sizes:
+        features = [
+            replace(catalog[i % len(catalog)], name=f"{catalog[i % len(catalog)].name} {i}",
+                    location=f"{catalog[i % len(catalog)].location}-{i}")
+            for i in range(size)
+        ]
+        dashboard = Dashboard(features, set())
+        dashboard.show()
+        dashboard.show_store()
+        # Let the page slide finish so it does not paint during the samples
+        deadline = time.perf_counter() + 1.0
+        while time.perf_counter() < deadline:
+            app.processEvents()
+        # The first toggle to each theme warms up caches; keep it apart
+        first = [toggle()[0] for _ in range(2)]
+        samples = [toggle() for _ in range(toggles)]
+        report['sizes'][str(size)] = {
+            'widgets': len(dashboard.findChildren(QWidget)) + 1,
+            'first_ms': [round(t * 1000, 3) for t in first],
+            'toggle': _summarize([shown for shown, _ in samples]),
+            'settled': _summarize([settled for _, settled in samples]),
+        }
+        dashboard.close()
+        dashboard.deleteLater()
+        app.processEvents()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=lambda text: [int(size) for size in text.split(',')],
+                        default=[8, 32, 128], help='Comma-separated numbers of store cards')
+    parser.add_argument('--toggles', type=int, default=20, help='Timed toggles per store size')
+    parser.add_argument('--output', help='Also write the report to this file')
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output) if args.output else None
+    # The dashboard reads its catalog and settings from resources/
+    os.chdir(ROOT)
+
+    from fake_podman import FakePodmanServer
+
+    # Keep the dashboard's services off the real Podman socket
+    socket_file = os.path.join(tempfile.mkdtemp(prefix='adas-theme-'), 'podman.sock')
+    server = FakePodmanServer(socket_file)
+    server.start_background()
+    os.environ['PODMAN_SOCKET_PATH'] = socket_file
+    try:
+        # Keep the dashboard's own prints out of the JSON on stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            report = run_theme_benchmark(args.sizes, max(1, args.toggles))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1215 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the subset of the Podman REST API used by the dashboard.
+
+Serves HTTP over a Unix socket so the install pipeline can be exercised
+offline, in CI or on a dev laptop:
+
+    python fake_podman.py --socket /tmp/fake-podman.sock --config fake.json
+    PODMAN_SOCKET_PATH=/tmp/fake-podman.sock python main.py
+
+Supported endpoints (with or without the /v<version>/libpod prefix):
+    HEAD|GET /_ping
+    GET  /images/json, /images/{name}/json, /images/{name}/exists
+    POST /images/create?fromImage=&tag=   (Docker-compatible streamed progress)
+    POST /images/pull?reference=          (libpod streamed pull)
+    GET  /containers/json, /containers/{name}/json, /containers/{name}/exists
+    POST /containers/create, /containers/{name}/start, /containers/{name}/wait
+    POST /containers/{name}/stop, DELETE /containers/{name}
+    POST /containers/{name}/checkpoint, /containers/{name}/restore   (with simulated costs)
+    GET  /events?stream=true              (container events, streamed)
+    GET  /containers/{name}/logs?follow=&tail=   (synthetic multiplexed log lines)
+    GET  /containers/stats?containers=&stream=&interval=   (libpod stats)
+    GET  /manifests/{name}/json           (registry manifest with layer digests/sizes)
+    POST /images/load                     (docker-archive tar, plain or gzip, chunked ok)
+    POST /images/{name}/tag, /images/{name}/untag, DELETE /images/{name}
+    GET  /system/df                       (image disk usage, shared/unique bytes)
+
+Latencies, layer sizes, pull throughput and failures come from a JSON
+config merged over DEFAULT_CONFIG (see --help). make_docker_archive()
+(or --make-bundle) writes small image archives for testing offline installs.
+"""
+import argparse
+import copy
+import hashlib
+import io
+import json
+import math
+import os
+import queue
+import random
+import re
+import select
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
+
+DEFAULT_CONFIG = {
+    'latency_ms': 5,                 # Added to every request
+    'pull_rate_mbps': 40.0,          # Simulated registry throughput
+    'progress_interval_ms': 50,      # Spacing of streamed progress events
+    'base_layers_mb': [28.0],        # Layers shared by every image
+    'app_layers_mb': [12.0, 4.0],    # Default image-specific layers
+    'images': {},                    # Per-image overrides: {"adas/x": {"layers_mb": [..]}}
+    'preloaded_images': [],          # Images present before any pull
+    'registries': {},                # Registry stand-ins besides docker.io (which uses the
+                                     # settings above): {"mirror.local:5000": {"pull_rate_mbps": 200,
+                                     # "latency_ms": 2, "down": false, "missing": ["adas/x"],
+                                     # "fail_pull": false}}
+    'containers': {                  # Simulated container operation costs
+        'create_ms': 150,            # Storage setup for a new container
+        'start_ms': 250,             # Runtime setup plus app initialisation
+        'restore_ms': 80,            # Restoring a checkpoint skips app initialisation
+        'stop_ms': 40,               # Signalling the app and tearing down the runtime
+        'checkpoint_supported': True,  # False answers checkpoint like Podman without CRIU
+    },
+    'cpu_hog': {                     # Containers that really burn host CPU while running
+        'images': [],                # Image names, e.g. ["adas/cpu-hog"]
+        'processes': 0,              # Busy processes per container; 0 = four per core
+    },
+    'logs': {                        # Synthetic output of running containers
+        'lines_per_second': 20,
+        'stderr_every': 10,          # Every nth line goes to stderr (0: never)
+    },
+    'stats': {                       # Synthetic load of running containers
+        'cpu_percent': 4.0,          # Mean CPU; samples random-walk around it
+        'mem_mb': 48.0,
+        'mem_limit_mb': 512.0,
+    },
+    'failures': {
+        'ping': False,               # Make /_ping fail
+        'pull': [],                  # Image names whose pull fails part way
+        'pull_fail_at_percent': 50,
+        'pull_probability': 0.0,     # Random pull failure probability
+        'create': [],                # Image names whose container create fails
+        'start': [],                 # Image names whose container start fails
+        'crash_after_seconds': {},   # {"adas/x": 5}: container dies with exit code 1 after start
+        'manifest': [],              # Image names whose manifest inspect fails
+    },
+}
+
+MB = 1024 * 1024
+
+_PREFIX_RE = re.compile(r'^/v[\d.]+')
+
+# Busy loop for cpu_hog containers. The CFS quota is emulated by spinning for
+# duty of every 100 ms period and sleeping the rest; CPU shares become a nice level.
+_HOG_SCRIPT = """
+import os, sys, time
+duty, niceness = float(sys.argv[1]), int(sys.argv[2])
+os.nice(niceness)
+while True:
+    start = time.monotonic()
+    while time.monotonic() - start < 0.1 * duty:
+        pass
+    if duty < 1:
+        time.sleep(0.1 * (1 - duty))
+"""
+
+
+def merge_config(base: dict, override: dict) -> dict:
+    """Recursively merge override into a copy of base."""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_config(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _digest(text: str) -> str:
+    return 'sha256:' + hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def diff_id(digest: str) -> str:
+    """Stand-in for the uncompressed digest Podman lists in RootFS.Layers for a layer blob"""
+    return _digest(f'diff:{digest}')
+
+
+def canonical_reference(reference: str) -> str:
+    """'adas/x' -> 'docker.io/adas/x:latest'"""
+    name = reference
+    first = name.split('/', 1)[0]
+    if '/' not in name or ('.' not in first and ':' not in first and first != 'localhost'):
+        name = f'docker.io/{name}'
+    last = name.rsplit('/', 1)[-1]
+    if ':' not in last and '@' not in last:
+        name = f'{name}:latest'
+    return name
+
+
+def registry_of(reference: str) -> str:
+    """'mirror.local:5000/adas/x:latest' -> 'mirror.local:5000'"""
+    return canonical_reference(reference).split('/', 1)[0]
+
+
+def strip_registry(reference: str) -> str:
+    """'mirror.local:5000/adas/x:latest' -> 'docker.io/adas/x:latest' (same content everywhere)"""
+    return 'docker.io/' + canonical_reference(reference).split('/', 1)[1]
+
+
+def short_name(reference: str) -> str:
+    """'docker.io/adas/x:latest' (or 'docker.io/adas/x@sha256:...') -> 'adas/x'"""
+    name = canonical_reference(reference.split('@', 1)[0])
+    name = name.split('/', 1)[1] if name.startswith('docker.io/') else name
+    return name[:-len(':latest')] if name.endswith(':latest') else name
+
+
+class FakePodmanState:
+    """In-memory images, layers and containers"""
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.lock = threading.Lock()
+        self.images = {}      # image id -> attrs
+        self.layers = set()   # layer (compressed blob) digests present locally
+        self.layer_sizes = {}  # layer digest -> bytes
+        self.image_blobs = {}  # image id -> layer digests; RootFS lists diff IDs instead, as in Podman
+        self.containers = {}  # container id -> attrs
+        self.subscribers = []  # queue.Queue per open events stream
+        self.hogs = {}         # container id -> [Popen] for running cpu_hog containers
+        self.log_started = {}  # container id -> monotonic time its synthetic log began
+        for name in config['preloaded_images']:
+            self.add_image(name)
+
+    # Images -----------------------------------------------------------------
+
+    def image_layers(self, name: str) -> list:
+        """[(digest, size_bytes)] for an image, base layers first."""
+        name = short_name(strip_registry(name))
+        override = self.config['images'].get(name, {})
+        base = override.get('base_layers_mb', self.config['base_layers_mb'])
+        app = override.get('layers_mb', self.config['app_layers_mb'])
+        layers = [(_digest(f'base:{i}:{size}'), int(size * MB)) for i, size in enumerate(base)]
+        layers += [(_digest(f'{name}:{i}:{size}'), int(size * MB)) for i, size in enumerate(app)]
+        return layers
+
+    def add_image(self, reference: str, image_id: str = None, layers: list = None) -> dict:
+        tag = canonical_reference(reference)
+        pulled = layers is None
+        layers = layers if layers is not None else self.image_layers(tag)
+        image_id = image_id or _digest(f'image:{strip_registry(tag)}')[len('sha256:'):]
+        existing = self.images.get(image_id)
+        if existing is not None:
+            # Same content pulled under another name: one image, several tags
+            if tag not in existing['RepoTags']:
+                self.tag_image(existing, tag)
+            return existing
+        digest = _digest(f'manifest:{strip_registry(tag)}')
+        attrs = {
+            'Id': image_id,
+            'RepoTags': [tag],
+            'Names': [tag],
+            'Digest': digest,
+            # Only pulled images have a registry manifest to refer to
+            'RepoDigests': [f"{tag.rsplit(':', 1)[0]}@{digest}"] if pulled else [],
+            'Size': sum(size for _, size in layers),
+            'Created': int(time.time()),
+            'RootFS': {'Type': 'layers', 'Layers': [diff_id(digest) for digest, _ in layers]},
+        }
+        with self.lock:
+            self.images[image_id] = attrs
+            self.image_blobs[image_id] = [digest for digest, _ in layers]
+            self.layers.update(digest for digest, _ in layers)
+            self.layer_sizes.update(layers)
+        return attrs
+
+    def find_image(self, key: str) -> dict | None:
+        key = unquote(key)
+        with self.lock:
+            if key in self.images:
+                return self.images[key]
+            tag = canonical_reference(key)
+            for image_id, attrs in self.images.items():
+                if tag in attrs['RepoTags'] or image_id.startswith(key):
+                    return attrs
+        return None
+
+    def tag_image(self, attrs: dict, reference: str):
+        tag = canonical_reference(reference)
+        with self.lock:
+            for other in self.images.values():
+                if tag in other['RepoTags']:
+                    other['RepoTags'].remove(tag)
+                    other['Names'] = list(other['RepoTags'])
+            attrs['RepoTags'].append(tag)
+            attrs['Names'] = list(attrs['RepoTags'])
+
+    def untag_image(self, attrs: dict, reference: str):
+        tag = canonical_reference(reference)
+        with self.lock:
+            if tag in attrs['RepoTags']:
+                attrs['RepoTags'].remove(tag)
+                attrs['Names'] = list(attrs['RepoTags'])
+
+    def remove_image(self, attrs: dict):
+        with self.lock:
+            self.images.pop(attrs['Id'], None)
+            self.image_blobs.pop(attrs['Id'], None)
+            # Drop layers no remaining image references
+            in_use = {digest for blobs in self.image_blobs.values() for digest in blobs}
+            self.layers &= in_use
+            self.layer_sizes = {digest: size for digest, size in self.layer_sizes.items() if digest in in_use}
+
+    def disk_usage(self) -> dict:
+        """Libpod /system/df report: per-image shared and unique bytes."""
+        with self.lock:
+            users = {}
+            for image_id, attrs in self.images.items():
+                for digest in self.image_blobs[image_id]:
+                    users.setdefault(digest, set()).add(image_id)
+            images = []
+            for image_id, attrs in self.images.items():
+                layers = set(self.image_blobs[image_id])
+                unique = sum(self.layer_sizes.get(d, 0) for d in layers if len(users[d]) == 1)
+                size = sum(self.layer_sizes.get(d, 0) for d in layers)
+                repository, _, tag = (attrs['RepoTags'] or ['<none>:<none>'])[0].rpartition(':')
+                images.append({
+                    'Repository': repository,
+                    'Tag': tag,
+                    'ImageID': image_id,
+                    'Created': attrs['Created'],
+                    'Size': size,
+                    'SharedSize': size - unique,
+                    'UniqueSize': unique,
+                    'Containers': sum(1 for c in self.containers.values() if c['ImageID'] == image_id),
+                })
+            return {
+                'ImagesSize': sum(self.layer_sizes.get(d, 0) for d in users),
+                'Images': images,
+                'Containers': [],
+                'Volumes': [],
+            }
+
+    # Containers -------------------------------------------------------------
+
+    def find_container(self, key: str) -> dict | None:
+        key = unquote(key)
+        with self.lock:
+            for container_id, attrs in self.containers.items():
+                if key in (container_id, attrs['Name']) or container_id.startswith(key):
+                    return attrs
+        return None
+
+    def create_container(self, spec: dict) -> dict:
+        image = self.find_image(spec.get('image', ''))
+        name = spec.get('name') or f'fake-{len(self.containers)}'
+        container_id = _digest(f'container:{name}:{time.time()}')[len('sha256:'):]
+        attrs = {
+            'Id': container_id,
+            'Name': name,
+            'Image': spec.get('image', ''),
+            'ImageName': spec.get('image', ''),
+            'ImageID': image['Id'] if image else '',
+            'Created': int(time.time()),
+            'Config': {'Cmd': spec.get('command') or [], 'Labels': spec.get('labels') or {}},
+            'HostConfig': _host_config(spec.get('resource_limits') or {}),
+            'State': {'Status': 'created', 'Running': False, 'ExitCode': 0, 'StartedAt': ''},
+        }
+        with self.lock:
+            self.containers[container_id] = attrs
+        self.publish('create', attrs)
+        return attrs
+
+    def set_container_status(self, attrs: dict, status: str, exit_code: int = 0):
+        with self.lock:
+            attrs['State'].update(Status=status, Running=status == 'running', ExitCode=exit_code)
+            if status == 'running':
+                attrs['State']['StartedAt'] = time.strftime('%Y-%m-%dT%H:%M:%SZ')
+        if status == 'running':
+            self.log_started.setdefault(attrs['Id'], time.monotonic())
+            self.start_load(attrs)
+        else:
+            self.stop_load(attrs)
+
+    def log_line(self, attrs: dict, index: int) -> tuple:
+        """(stream, bytes) of a container's synthetic log line number index."""
+        every = self.config['logs']['stderr_every']
+        app = short_name(attrs['Image'])
+        if every and index % every == every - 1:
+            return 2, f'WARN {app}[{index}] frame budget exceeded by {index % 7} ms\n'.encode('utf-8')
+        return 1, f'INFO {app}[{index}] processed frame {index} in {5 + index % 11} ms\n'.encode('utf-8')
+
+    def log_lines_written(self, attrs: dict) -> int:
+        """Lines the container has logged so far (lines_per_second since its first start)."""
+        started = self.log_started.get(attrs['Id'])
+        if started is None:
+            return 0
+        return int((time.monotonic() - started) * self.config['logs']['lines_per_second'])
+
+    def start_load(self, attrs: dict):
+        """Spawn busy processes for a cpu_hog container, throttled by its CPU limits."""
+        settings = self.config['cpu_hog']
+        if short_name(attrs['Image']) not in settings['images'] or attrs['Id'] in self.hogs:
+            return
+        processes = settings['processes'] or 4 * (os.cpu_count() or 1)
+        host = attrs['HostConfig']
+        cores = host['CpuQuota'] / host['CpuPeriod'] if host['CpuQuota'] > 0 else processes
+        duty = min(1.0, cores / processes)
+        # Each nice step is about a 1.25x smaller weight; the default weight is 1024
+        shares = host['CpuShares'] or 1024
+        niceness = max(0, min(19, round(math.log(1024 / shares, 1.25)))) if shares < 1024 else 0
+        hogs = [
+            subprocess.Popen([sys.executable, '-c', _HOG_SCRIPT, str(duty), str(niceness)])
+            for _ in range(processes)
+        ]
+        with self.lock:
+            self.hogs[attrs['Id']] = hogs
+
+    def stop_load(self, attrs: dict):
+        with self.lock:
+            hogs = self.hogs.pop(attrs['Id'], [])
+        for hog in hogs:
+            hog.kill()
+            hog.wait()
+
+    def remove_container(self, attrs: dict):
+        with self.lock:
+            self.containers.pop(attrs['Id'], None)
+            self.log_started.pop(attrs['Id'], None)
+        self.stop_load(attrs)
+        self.publish('remove', attrs)
+
+    def schedule_crash(self, attrs: dict, delay: float):
+        """Let a running container die with exit code 1 after delay seconds."""
+        started_at = attrs['State']['StartedAt']
+
+        def crash():
+            if attrs['State']['Running'] and attrs['State']['StartedAt'] == started_at:
+                self.set_container_status(attrs, 'exited', 1)
+                self.publish('died', attrs)
+
+        timer = threading.Timer(delay, crash)
+        timer.daemon = True
+        timer.start()
+
+    # Events -----------------------------------------------------------------
+
+    def subscribe(self) -> queue.Queue:
+        events = queue.Queue()
+        with self.lock:
+            self.subscribers.append(events)
+        return events
+
+    def unsubscribe(self, events: queue.Queue):
+        with self.lock:
+            if events in self.subscribers:
+                self.subscribers.remove(events)
+
+    def publish(self, action: str, attrs: dict):
+        """Fan a container event out to every open events stream (Docker format)."""
+        now = time.time()
+        event = {
+            'Type': 'container',
+            'Action': action,
+            'status': action,
+            'id': attrs['Id'],
+            'from': attrs['Image'],
+            'Actor': {
+                'ID': attrs['Id'],
+                'Attributes': {
+                    'name': attrs['Name'],
+                    'image': attrs['Image'],
+                    'containerExitCode': str(attrs['State']['ExitCode']),
+                },
+            },
+            'time': int(now),
+            'timeNano': int(now * 1e9),
+        }
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for events in subscribers:
+            events.put(event)
+
+    def list_containers(self, all_containers: bool, filters: dict) -> list:
+        names = filters.get('name', [])
+        result = []
+        with self.lock:
+            for attrs in self.containers.values():
+                status = attrs['State']['Status']
+                if not all_containers and status != 'running':
+                    continue
+                if names and not any(n in attrs['Name'] for n in names):
+                    continue
+                # libpod list format: Names is a list, State is a plain string
+                result.append({
+                    'Id': attrs['Id'],
+                    'Names': [attrs['Name']],
+                    'Image': attrs['Image'],
+                    'ImageID': attrs['ImageID'],
+                    'State': status,
+                    'Created': attrs['Created'],
+                })
+        return result
+
+
+class _ChunkedReader:
+    """Minimal reader for a chunked request body"""
+
+    def __init__(self, rfile):
+        self.rfile = rfile
+        self.remaining = 0
+        self.done = False
+
+    def read(self, size: int = -1) -> bytes:
+        out = bytearray()
+        while not self.done and (size < 0 or len(out) < size):
+            if self.remaining == 0:
+                self.remaining = int(self.rfile.readline().split(b';')[0].strip() or b'0', 16)
+                if self.remaining == 0:
+                    self.rfile.readline()  # Blank line after the last chunk
+                    self.done = True
+                    break
+            want = self.remaining if size < 0 else min(self.remaining, size - len(out))
+            data = self.rfile.read(want)
+            if not data:
+                self.done = True
+                break
+            out += data
+            self.remaining -= len(data)
+            if self.remaining == 0:
+                self.rfile.readline()  # CRLF after the chunk
+        return bytes(out)
+
+
+class _LimitedReader:
+    """Reader for a Content-Length request body"""
+
+    def __init__(self, rfile, length: int):
+        self.rfile = rfile
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.rfile.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+
+def _host_config(limits: dict) -> dict:
+    """Inspect-style HostConfig for a libpod create spec's resource_limits."""
+    cpu = limits.get('cpu') or {}
+    return {
+        'CpuShares': cpu.get('shares') or 0,
+        'CpuQuota': cpu.get('quota') or 0,
+        'CpuPeriod': cpu.get('period') or 100000,
+        'Memory': (limits.get('memory') or {}).get('limit') or 0,
+        'PidsLimit': (limits.get('pids') or {}).get('limit') or 0,
+    }
+
+
+def make_docker_archive(path: str, reference: str, layers_mb=(4.0,), seed: int = 0) -> str:
+    """
+    Write a small docker-archive tarball for reference with random layer
+    contents. Returns the image ID (sha256 of the config) that a load yields.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def add(archive, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = 0
+        archive.addfile(info, io.BytesIO(data))
+
+    with tarfile.open(path, 'w:gz' if path.endswith(('.gz', '.tgz')) else 'w') as archive:
+        layer_names = []
+        diff_ids = []
+        for i, size in enumerate(layers_mb):
+            data = rng.randbytes(int(size * MB))
+            digest = hashlib.sha256(data).hexdigest()
+            add(archive, f'{digest}.tar', data)
+            layer_names.append(f'{digest}.tar')
+            diff_ids.append(f'sha256:{digest}')
+        config = json.dumps({
+            'architecture': 'amd64',
+            'os': 'linux',
+            'config': {'Cmd': ['sleep', 'infinity']},
+            'rootfs': {'type': 'layers', 'diff_ids': diff_ids},
+        }).encode('utf-8')
+        config_id = hashlib.sha256(config).hexdigest()
+        add(archive, f'{config_id}.json', config)
+        add(archive, 'manifest.json', json.dumps([{
+            'Config': f'{config_id}.json',
+            'RepoTags': [canonical_reference(reference)],
+            'Layers': layer_names,
+        }]).encode('utf-8'))
+    return f'sha256:{config_id}'
+
+
+class FakePodmanHandler(BaseHTTPRequestHandler):
+    """Routes requests to FakePodmanState; one instance per request"""
+    protocol_version = 'HTTP/1.1'
+    server_version = 'FakePodman/1.0'
+
+    @property
+    def state(self) -> FakePodmanState:
+        return self.server.state
+
+    @property
+    def config(self) -> dict:
+        return self.server.state.config
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            sys.stderr.write(f"[fake-podman] {format % args}\n")
+
+    # Response helpers -------------------------------------------------------
+
+    def _send_json(self, status: int, body=None):
+        data = b'' if body is None else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if data and self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def _send_error(self, status: int, message: str):
+        self._send_json(status, {'cause': message, 'message': message, 'response': status})
+
+    def _start_stream(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+    def _stream(self, event: dict):
+        data = (json.dumps(event) + '\n').encode('utf-8')
+        self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+    def _stream_bytes(self, data: bytes):
+        self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b'0\r\n\r\n')
+        self.wfile.flush()
+
+    def _client_closed(self) -> bool:
+        """True once the peer has hung up on a long-lived stream."""
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        return bool(readable) and not self.connection.recv(1, socket.MSG_PEEK)
+
+    def _body_stream(self):
+        """File-like request body, de-chunking Transfer-Encoding: chunked."""
+        if 'chunked' in (self.headers.get('Transfer-Encoding') or '').lower():
+            return _ChunkedReader(self.rfile)
+        return _LimitedReader(self.rfile, int(self.headers.get('Content-Length') or 0))
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    # Dispatch ---------------------------------------------------------------
+
+    def do_HEAD(self):
+        self._dispatch()
+
+    def do_GET(self):
+        self._dispatch()
+
+    def do_POST(self):
+        self._dispatch()
+
+    def do_DELETE(self):
+        self._dispatch()
+
+    def _dispatch(self):
+        parsed = urlparse(self.path)
+        path = _PREFIX_RE.sub('', parsed.path)
+        if path.startswith('/libpod/'):
+            path = path[len('/libpod'):]
+        self.query_lists = parse_qs(parsed.query)
+        self.query = {k: v[-1] for k, v in self.query_lists.items()}
+
+        latency = self.config['latency_ms']
+        if latency:
+            time.sleep(latency / 1000)
+
+        for method, pattern, handler in self.ROUTES:
+            if method != self.command and not (method == 'GET' and self.command == 'HEAD'):
+                continue
+            match = re.fullmatch(pattern, path)
+            if match:
+                try:
+                    handler(self, *match.groups())
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                return
+        self._send_error(404, f'no route for {self.command} {path}')
+
+    # Handlers ---------------------------------------------------------------
+
+    def ping(self):
+        if self.config['failures']['ping']:
+            self._send_error(500, 'ping failure injected')
+            return
+        data = b'OK'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Libpod-API-Version', '4.9.0')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def list_images(self):
+        with self.state.lock:
+            images = list(self.state.images.values())
+        self._send_json(200, images)
+
+    def inspect_image(self, name):
+        attrs = self.state.find_image(name)
+        if attrs is None:
+            self._send_error(404, f'{name}: image not known')
+        else:
+            self._send_json(200, attrs)
+
+    def image_exists(self, name):
+        if self.state.find_image(name) is None:
+            self._send_error(404, f'{name}: image not known')
+        else:
+            self._send_json(204)
+
+    def load_images(self):
+        # Docker-archive: manifest.json names the config blob and layer files
+        blobs = {}  # member name -> (sha256 hex, size)
+        configs = {}
+        manifest = None
+        body = self._body_stream()
+        try:
+            with tarfile.open(fileobj=body, mode='r|*') as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    data = archive.extractfile(member)
+                    digest = hashlib.sha256()
+                    content = b''
+                    while True:
+                        block = data.read(MB)
+                        if not block:
+                            break
+                        digest.update(block)
+                        if member.name.endswith('.json'):
+                            content += block
+                    blobs[member.name] = (digest.hexdigest(), member.size)
+                    if member.name == 'manifest.json':
+                        manifest = json.loads(content)
+                    elif member.name.endswith('.json'):
+                        configs[member.name] = content
+        except (tarfile.TarError, ValueError) as e:
+            self._send_error(500, f'payload does not match any of the supported image formats: {e}')
+            return
+        finally:
+            # The tar reader stops at the end-of-archive marker; drain the padding
+            # after it so it is not parsed as the next request on the connection
+            while body.read(MB):
+                pass
+        if not manifest:
+            self._send_error(500, 'payload does not match any of the supported image formats (no manifest.json)')
+            return
+
+        names = []
+        for entry in manifest:
+            image_id = blobs[entry['Config']][0]
+            layers = [(f'sha256:{blobs[name][0]}', blobs[name][1]) for name in entry.get('Layers', [])]
+            tags = entry.get('RepoTags') or [f'localhost/{image_id[:12]}:latest']
+            attrs = self.state.add_image(tags[0], image_id=image_id, layers=layers)
+            for tag in tags[1:]:
+                self.state.tag_image(attrs, tag)
+            names.extend(canonical_reference(tag) for tag in tags)
+        self._send_json(200, {'Names': names})
+
+    def tag_image(self, name):
+        attrs = self.state.find_image(name)
+        if attrs is None:
+            self._send_error(404, f'{name}: image not known')
+            return
+        repo = self.query.get('repo', '')
+        tag = self.query.get('tag') or 'latest'
+        self.state.tag_image(attrs, f'{repo}:{tag}')
+        self._send_json(201)
+
+    def untag_image(self, name):
+        attrs = self.state.find_image(name)
+        if attrs is None:
+            self._send_error(404, f'{name}: image not known')
+            return
+        repo = self.query.get('repo', '')
+        tag = self.query.get('tag') or 'latest'
+        self.state.untag_image(attrs, f'{repo}:{tag}')
+        self._send_json(201)
+
+    def remove_image(self, name):
+        attrs = self.state.find_image(name)
+        if attrs is None:
+            self._send_error(404, f'{name}: image not known')
+            return
+        force = self.query.get('force', 'false').lower() in ('1', 'true')
+        users = [c for c in list(self.state.containers.values()) if c['ImageID'] == attrs['Id']]
+        if users and not force:
+            self._send_error(409, f'image used by {users[0]["Id"]}: image is in use by a container')
+            return
+        for container in users:
+            self.state.remove_container(container)
+        self.state.remove_image(attrs)
+        self._send_json(200, {
+            'Deleted': [attrs['Id']],
+            'Untagged': list(attrs['RepoTags']),
+            'Errors': [],
+            'ExitCode': 0,
+        })
+
+    def system_df(self):
+        self._send_json(200, self.state.disk_usage())
+
+    def _registry(self, reference: str) -> dict:
+        """
+        Simulated registry serving a reference: pull rate and extra latency,
+        or an error string when it is down or lacks the image.
+        """
+        registry = registry_of(reference)
+        if registry == 'docker.io':
+            return {'pull_rate_mbps': self.config['pull_rate_mbps'], 'latency_ms': 0}
+        settings = self.config['registries'].get(registry)
+        if settings is None or settings.get('down'):
+            return {'error': f'pinging container registry {registry}: Get "https://{registry}/v2/": '
+                             f'dial tcp: connect: connection refused'}
+        if short_name(strip_registry(reference)) in settings.get('missing', []):
+            return {'error': f'initializing source docker://{canonical_reference(reference)}: '
+                             f'reading manifest latest in {registry}: manifest unknown'}
+        return {'pull_rate_mbps': self.config['pull_rate_mbps'], 'latency_ms': 0, **settings}
+
+    def _should_fail_pull(self, name: str) -> bool:
+        failures = self.config['failures']
+        return (short_name(strip_registry(name)) in failures['pull']
+                or self._registry(name).get('fail_pull', False)
+                or random.random() < failures['pull_probability'])
+
+    def compat_pull(self):
+        from_image = self.query.get('fromImage', '')
+        tag = self.query.get('tag') or 'latest'
+        reference = from_image if ':' in from_image.rsplit('/', 1)[-1] else f'{from_image}:{tag}'
+        registry = self._registry(reference)
+        if 'error' in registry:
+            self._send_error(500, registry['error'])
+            return
+        time.sleep(registry['latency_ms'] / 1000)
+        layers = self.state.image_layers(reference)
+        fail = self._should_fail_pull(reference)
+        fail_at = self.config['failures']['pull_fail_at_percent'] / 100
+        rate = registry['pull_rate_mbps'] * MB
+        interval = self.config['progress_interval_ms'] / 1000
+
+        self._start_stream()
+        self._stream({'status': f'Pulling from {from_image}', 'id': tag})
+        to_fetch = []
+        for digest, size in layers:
+            layer_id = digest[len('sha256:'):][:12]
+            if digest in self.state.layers:
+                self._stream({'status': 'Already exists', 'progressDetail': {}, 'id': layer_id})
+            else:
+                self._stream({'status': 'Pulling fs layer', 'progressDetail': {}, 'id': layer_id})
+                to_fetch.append((layer_id, size))
+
+        total = sum(size for _, size in to_fetch)
+        transferred = 0
+        for layer_id, size in to_fetch:
+            current = 0
+            while current < size:
+                if fail and transferred + current >= total * fail_at:
+                    message = f'fake pull failure for {reference}'
+                    self._stream({'errorDetail': {'message': message}, 'error': message})
+                    self._end_stream()
+                    return
+                time.sleep(interval)
+                current = min(size, current + int(rate * interval) or size)
+                self._stream({
+                    'status': 'Downloading',
+                    'progressDetail': {'current': current, 'total': size},
+                    'id': layer_id,
+                })
+            transferred += size
+            self._stream({'status': 'Download complete', 'progressDetail': {}, 'id': layer_id})
+            self._stream({'status': 'Pull complete', 'progressDetail': {}, 'id': layer_id})
+
+        attrs = self.state.add_image(reference)
+        self._stream({'status': f"Digest: {attrs['Digest']}"})
+        self._stream({'status': f'Status: Downloaded newer image for {canonical_reference(reference)}'})
+        self._end_stream()
+
+    def libpod_pull(self):
+        reference = self.query.get('reference', '')
+        if self._should_fail_pull(reference):
+            self._start_stream()
+            self._stream({'error': f'fake pull failure for {reference}'})
+            self._end_stream()
+            return
+        layers = self.state.image_layers(reference)
+        rate = self.config['pull_rate_mbps'] * MB
+        self._start_stream()
+        for digest, size in layers:
+            if digest not in self.state.layers:
+                time.sleep(size / rate if rate else 0)
+            self._stream({'stream': f'Copying blob {digest[7:19]} done\n'})
+        attrs = self.state.add_image(reference)
+        self._stream({'images': [attrs['Id']], 'id': attrs['Id']})
+        self._end_stream()
+
+    def inspect_manifest(self, name):
+        reference = unquote(name)
+        registry = self._registry(reference)
+        if 'error' in registry:
+            self._send_error(500, registry['error'])
+            return
+        time.sleep(registry['latency_ms'] / 1000)
+        if short_name(strip_registry(reference)) in self.config['failures']['manifest']:
+            self._send_error(404, f'{reference}: manifest unknown')
+            return
+        layers = self.state.image_layers(reference)
+        self._send_json(200, {
+            'schemaVersion': 2,
+            'mediaType': 'application/vnd.docker.distribution.manifest.v2+json',
+            'config': {
+                'mediaType': 'application/vnd.docker.container.image.v1+json',
+                'size': 1024,
+                'digest': _digest(f'config:{strip_registry(reference)}'),
+            },
+            'layers': [
+                {'mediaType': 'application/vnd.docker.image.rootfs.diff.tar.gzip', 'size': size, 'digest': digest}
+                for digest, size in layers
+            ],
+        })
+
+    def list_containers(self):
+        all_containers = self.query.get('all', 'false').lower() in ('1', 'true')
+        filters = json.loads(self.query.get('filters') or '{}')
+        self._send_json(200, self.state.list_containers(all_containers, filters))
+
+    def inspect_container(self, name):
+        attrs = self.state.find_container(name)
+        if attrs is None:
+            self._send_error(404, f'no container with name or ID "{name}" found: no such container')
+        else:
+            self._send_json(200, attrs)
+
+    def container_logs(self, name):
+        attrs = self.state.find_container(name)
+        if attrs is None:
+            self._send_error(404, f'no container with name or ID "{name}" found: no such container')
+            return
+        follow = self.query.get('follow', 'false').lower() in ('1', 'true')
+        streams = {
+            1: self.query.get('stdout', 'false').lower() in ('1', 'true'),
+            2: self.query.get('stderr', 'false').lower() in ('1', 'true'),
+        }
+        tail = self.query.get('tail', 'all')
+
+        def frames(first: int, last: int) -> bytes:
+            data = []
+            for index in range(first, last):
+                stream, line = self.state.log_line(attrs, index)
+                if streams[stream]:
+                    data.append(struct.pack('>BxxxL', stream, len(line)) + line)
+            return b''.join(data)
+
+        written = self.state.log_lines_written(attrs)
+        first = 0 if tail == 'all' or int(tail) < 0 else max(0, written - int(tail))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/vnd.docker.multiplexed-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        if written > first:
+            self._stream_bytes(frames(first, written))
+        while follow and attrs['State']['Running'] and not self._client_closed():
+            time.sleep(0.05)
+            now = self.state.log_lines_written(attrs)
+            if now > written:
+                self._stream_bytes(frames(written, now))
+                written = now
+        self._end_stream()
+
+    def container_exists(self, name):
+        if self.state.find_container(name) is None:
+            self._send_error(404, f'no such container: {name}')
+        else:
+            self._send_json(204)
+
+    def create_container(self):
+        spec = json.loads(self._read_body() or b'{}')
+        image = self.state.find_image(spec.get('image', ''))
+        if image is None:
+            self._send_error(404, f"{spec.get('image')}: image not known")
+            return
+        if spec.get('name') and self.state.find_container(spec['name']):
+            self._send_error(409, f"the container name \"{spec['name']}\" is already in use")
+            return
+        if short_name(spec.get('image', '')) in self.config['failures']['create']:
+            self._send_error(500, 'container create failure injected')
+            return
+        time.sleep(self.config['containers']['create_ms'] / 1000)
+        attrs = self.state.create_container(spec)
+        self._send_json(201, {'Id': attrs['Id'], 'Warnings': []})
+
+    def start_container(self, name):
+        attrs = self.state.find_container(name)
+        if attrs is None:
+            self._send_error(404, f'no such container: {name}')
+            return
+        if short_name(attrs['Image']) in self.config['failures']['start']:
+            self._send_error(500, 'container start failure injected')
+            return
+        if attrs['State']['Running']:
+            self._send_json(304)
+            return
+        time.sleep(self.config['containers']['start_ms'] / 1000)
+        self.state.set_container_status(attrs, 'running')
+        attrs['State']['Checkpointed'] = False
+        self.state.publish('start', attrs)
+        crash_after = self.config['failures']['crash_after_seconds'].get(short_name(attrs['Image']))
+        if crash_after is not None:
+            self.state.schedule_crash(attrs, crash_after)
+        self._send_json(204)
+
+    def stop_container(self, name):
+        attrs = self.state.find_container(name)
+        if attrs is None:
+            self._send_error(404, f'no such container: {name}')
+            return
+        if not attrs['State']['Running']:
+            self._send_json(304)
+            return
+        time.sleep(self.config['containers']['stop_ms'] / 1000)
+        self.state.set_container_status(attrs, 'exited', 0)
+        self.state.publish('died', attrs)
+        self.state.publish('stop', attrs)
+        self._send_json(204)
+
+    def checkpoint_container(self, name):
+        attrs = self.state.find_container(name)
+        if attrs is None:
+            self._send_error(404, f'no such container: {name}')
+            return
+        if not self.config['containers']['checkpoint_supported']:
+            self._send_error(500, 'checkpoint/restore requires at least criu 31100')
+            return
+        if not attrs['State']['Running']:
+            self._send_error(500, f'"{attrs["Name"]}" is not running, cannot be checkpointed: container state improper')
+            return
+        self.state.set_container_status(attrs, 'exited', 0)
+        attrs['State']['Checkpointed'] = True
+        self.state.publish('checkpoint', attrs)
+        self._send_json(200, [{'Id': attrs['Id'], 'Err': None}])
+
+    def restore_container(self, name):
+        attrs = self.state.find_container(name)
+        if attrs is None:
+            self._send_error(404, f'no such container: {name}')
+            return
+        if not attrs['State'].get('Checkpointed'):
+            self._send_error(500, f'container {attrs["Id"]} is not checkpointed: container state improper')
+            return
+        time.sleep(self.config['containers']['restore_ms'] / 1000)
+        self.state.set_container_status(attrs, 'running')
+        attrs['State']['Checkpointed'] = False
+        self.state.publish('restore', attrs)
+        self._send_json(200, {'Id': attrs['Id']})
+
+    def remove_container(self, name):
+        attrs = self.state.find_container(name)
+        if attrs is None:
+            self._send_error(404, f'no such container: {name}')
+            return
+        force = self.query.get('force', 'false').lower() in ('1', 'true')
+        if attrs['State']['Running'] and not force:
+            self._send_error(409, 'cannot remove container as it is running - stop it first or use force')
+            return
+        if attrs['State']['Running']:
+            self.state.set_container_status(attrs, 'exited', 137)
+            self.state.publish('died', attrs)
+        self.state.remove_container(attrs)
+        self._send_json(200, [{'Id': attrs['Id'], 'Err': None}])
+
+    def container_stats(self):
+        stream = self.query.get('stream', 'true').lower() in ('1', 'true')
+        interval = float(self.query.get('interval', 5))
+        names = self.query_lists.get('containers', [])
+        settings = self.config['stats']
+        load = {}  # container id -> (cpu, mem) random walk state
+        self._start_stream()
+        while True:
+            frame = []
+            for name in names or [a['Name'] for a in list(self.state.containers.values())]:
+                attrs = self.state.find_container(name)
+                if attrs is None or not attrs['State']['Running']:
+                    continue
+                override = self.config['images'].get(short_name(attrs['Image']), {})
+                mean_cpu = override.get('cpu_percent', settings['cpu_percent'])
+                mean_mem = override.get('mem_mb', settings['mem_mb']) * MB
+                cpu, mem = load.get(attrs['Id'], (mean_cpu, mean_mem))
+                cpu = max(0.0, cpu + random.uniform(-1, 1) * mean_cpu * 0.3 + (mean_cpu - cpu) * 0.2)
+                mem = max(MB, mem + random.uniform(-1, 1) * mean_mem * 0.02 + (mean_mem - mem) * 0.1)
+                load[attrs['Id']] = (cpu, mem)
+                limit = settings['mem_limit_mb'] * MB
+                frame.append({
+                    'ContainerID': attrs['Id'],
+                    'Name': attrs['Name'],
+                    'CPU': round(cpu, 3),
+                    'AvgCPU': round(mean_cpu, 3),
+                    'MemUsage': int(mem),
+                    'MemLimit': int(limit),
+                    'MemPerc': round(mem * 100 / limit, 3),
+                    'PIDs': 1,
+                    'UpTime': 0,
+                })
+            self._stream({'Error': None, 'Stats': frame})
+            if not stream:
+                break
+            deadline = time.monotonic() + interval
+            while time.monotonic() < deadline:
+                if self._client_closed():
+                    return
+                time.sleep(min(0.1, interval))
+        self._end_stream()
+
+    def events(self):
+        filters = json.loads(self.query.get('filters') or '{}')
+        types = filters.get('type', [])
+        subscription = self.state.subscribe()
+        try:
+            self._start_stream()
+            while True:
+                try:
+                    event = subscription.get(timeout=1.0)
+                except queue.Empty:
+                    if self._client_closed():
+                        return
+                    continue
+                if types and event['Type'] not in types:
+                    continue
+                self._stream(event)
+        finally:
+            self.state.unsubscribe(subscription)
+
+    def wait_container(self, name):
+        attrs = self.state.find_container(name)
+        if attrs is None:
+            self._send_error(404, f'no such container: {name}')
+        else:
+            self._send_json(200, attrs['State']['ExitCode'])
+
+    ROUTES = [
+        ('GET', r'/_ping', ping),
+        ('GET', r'/images/json', list_images),
+        ('GET', r'/images/(.+)/json', inspect_image),
+        ('GET', r'/images/(.+)/exists', image_exists),
+        ('POST', r'/images/create', compat_pull),
+        ('POST', r'/images/pull', libpod_pull),
+        ('GET', r'/manifests/(.+)/json', inspect_manifest),
+        ('POST', r'/images/load', load_images),
+        ('POST', r'/images/(.+)/tag', tag_image),
+        ('POST', r'/images/(.+)/untag', untag_image),
+        ('DELETE', r'/images/(.+)', remove_image),
+        ('GET', r'/containers/json', list_containers),
+        ('GET', r'/containers/stats', container_stats),
+        ('POST', r'/containers/create', create_container),
+        ('GET', r'/containers/([^/]+)/json', inspect_container),
+        ('GET', r'/containers/([^/]+)/exists', container_exists),
+        ('GET', r'/containers/([^/]+)/logs', container_logs),
+        ('POST', r'/containers/([^/]+)/start', start_container),
+        ('POST', r'/containers/([^/]+)/wait', wait_container),
+        ('POST', r'/containers/([^/]+)/stop', stop_container),
+        ('POST', r'/containers/([^/]+)/checkpoint', checkpoint_container),
+        ('POST', r'/containers/([^/]+)/restore', restore_container),
+        ('DELETE', r'/containers/([^/]+)', remove_container),
+        ('GET', r'/events', events),
+        ('GET', r'/system/df', system_df),
+    ]
+
+
+class FakePodmanServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server on a Unix socket"""
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, config: dict | None = None, verbose: bool = False):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.state = FakePodmanState(merge_config(DEFAULT_CONFIG, config or {}))
+        self.verbose = verbose
+        super().__init__(socket_path, FakePodmanHandler)
+
+    def get_request(self):
+        # Unix sockets have no peer address; BaseHTTPRequestHandler expects a tuple
+        request, _ = super().get_request()
+        return request, ('fake-podman', 0)
+
+    def start_background(self) -> threading.Thread:
+        """Serve from a daemon thread (for benchmarks and scripted tests)."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self):
+        for attrs in list(self.state.containers.values()):
+            self.state.stop_load(attrs)
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Podman API server on a Unix socket')
+    parser.add_argument('--socket', default='/tmp/fake-podman.sock', help='Unix socket path')
+    parser.add_argument('--config', help='JSON file merged over the default config')
+    parser.add_argument('--latency-ms', type=float, help='Latency added to every request')
+    parser.add_argument('--pull-rate-mbps', type=float, help='Simulated pull throughput')
+    parser.add_argument('--fail-pull', action='append', default=[], help='Image whose pull fails')
+    parser.add_argument('--preload', action='append', default=[], help='Image present at startup')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    parser.add_argument('--make-bundle', nargs=2, metavar=('PATH', 'IMAGE'),
+                        help='Write a test docker-archive for IMAGE to PATH, print its digest and exit')
+    args = parser.parse_args()
+
+    if args.make_bundle:
+        path, image = args.make_bundle
+        print(make_docker_archive(path, image))
+        return
+
+    config = {}
+    if args.config:
+        with open(args.config, 'r') as f:
+            config = json.load(f)
+    if args.latency_ms is not None:
+        config['latency_ms'] = args.latency_ms
+    if args.pull_rate_mbps is not None:
+        config['pull_rate_mbps'] = args.pull_rate_mbps
+    if args.fail_pull:
+        config.setdefault('failures', {})['pull'] = args.fail_pull
+    if args.preload:
+        config['preloaded_images'] = args.preload
+
+    server = FakePodmanServer(args.socket, config, args.verbose)
+    print(f"Fake Podman listening on {args.socket}")
+    print(f"  export PODMAN_SOCKET_PATH={args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
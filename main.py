@@ -31,6 +31,8 @@ def main():
     
     # Initialize and start the alert service
     alert_service = AlertService('resources/results.json', dashboard)
+    # Never prefetch images while a driver alert is on screen
+    dashboard.prefetcher.add_busy_check(lambda: alert_service.dialog is not None)
     
     # Use app.exec() directly instead of sys.exit() for proper terminal return
     return app.exec()
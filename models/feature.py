@@ -1,7 +1,7 @@
 """
 Feature model for representing application features
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -13,6 +13,9 @@ class Feature:
     long_desc: str
     icon: str
     location: Optional[str] = None
+    priority: int = 0  # Higher values are prefetched first
+    digest: str = ''   # Expected image ID (sha256:...), checked when loading offline bundles
+    resources: dict = field(default_factory=dict)  # Resource limit overrides, see services/resource_limits.py
     
     @property
     def image_name(self) -> str:
@@ -45,7 +48,10 @@ class Feature:
             short_desc=short_desc.strip(),
             long_desc=long_desc.strip(),
             icon=data.get('icon', ''),
-            location=data.get('location', '')
+            location=data.get('location', ''),
+            priority=int(data.get('priority', 0) or 0),
+            digest=data.get('digest', '') or '',
+            resources=data.get('resources') if isinstance(data.get('resources'), dict) else {}
         )
     
     def to_dict(self) -> dict:
@@ -55,5 +61,8 @@ class Feature:
             'short_desc': self.short_desc,
             'long_desc': self.long_desc,
             'icon': self.icon,
-            'location': self.location
+            'location': self.location,
+            'priority': self.priority,
+            'digest': self.digest,
+            'resources': self.resources
         } 
\ No newline at end of file
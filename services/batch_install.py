@@ -0,0 +1,381 @@
+"""
+Layer-aware planning and execution of multi-app installs
+"""
+import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import quote
+from PyQt6.QtCore import QThread, pyqtSignal
+from services.bundle_import import find_image_bundle, load_image_bundle
+from services.podman_service import (
+    CANCELLED_MESSAGE, create_podman_client, normalize_image_name, pull_with_mirrors,
+    run_app_container, split_image_reference
+)
+from services.registry_mirrors import get_registry_mirrors
+from services.resource_limits import resolve_limits
+from utils.file_utils import add_installed_image, load_settings
+
+# Parallel manifest lookups while planning
+MANIFEST_WORKERS = 4
+
+# Parallel container creations once images land
+CREATE_WORKERS = 4
+
+_ARCHITECTURES = {'x86_64': 'amd64', 'aarch64': 'arm64', 'armv7l': 'arm'}
+
+# Repo digest -> layer digests of its manifest (content-addressed, so never stale)
+_local_layers: Dict[str, List[str]] = {}
+
+
+def fetch_image_layers(client, image_name: str) -> List[Tuple[str, int]]:
+    """
+    Inspect an image manifest through Podman (which asks the registry when
+    the image is not local) and return its [(layer digest, compressed size)].
+    Registries are asked in mirror order, upstream last. Manifest lists are
+    resolved to the entry for this machine's architecture.
+    """
+    repository, tag = split_image_reference(normalize_image_name(image_name))
+    errors = []
+    for registry in get_registry_mirrors().candidates():
+        reference = f"{registry}/{repository}:{tag}"
+        try:
+            manifest = _inspect_manifest(client, reference)
+            break
+        except Exception as e:
+            errors.append(f"{registry}: {e}")
+    else:
+        raise RuntimeError('; '.join(errors))
+    return _manifest_layers(client, reference.rsplit(':', 1)[0], manifest)
+
+
+def fetch_local_layers(client, images) -> Set[str]:
+    """
+    Layer digests of local images, comparable with fetch_image_layers().
+    RootFS.Layers lists uncompressed diff IDs, never the compressed blob
+    digests of a manifest, so each image's manifest is inspected through its
+    repo digest instead. Results are cached per repo digest; images without
+    one (loaded from a bundle) contribute nothing.
+    """
+    repo_digests = {(image.attrs.get('RepoDigests') or [None])[0] for image in images} - {None}
+    with ThreadPoolExecutor(MANIFEST_WORKERS) as pool:
+        futures = {
+            digest: pool.submit(_inspect_manifest, client, digest)
+            for digest in repo_digests if digest not in _local_layers
+        }
+        for repo_digest, future in futures.items():
+            try:
+                layers = _manifest_layers(client, repo_digest.split('@', 1)[0], future.result())
+            except Exception as e:
+                print(f"Manifest inspect failed for local image {repo_digest}: {e}")
+                continue
+            _local_layers[repo_digest] = [digest for digest, _ in layers]
+    return {layer for digest in repo_digests for layer in _local_layers.get(digest, [])}
+
+
+def _manifest_layers(client, repository: str, manifest: dict) -> List[Tuple[str, int]]:
+    """[(layer digest, size)] of a manifest, resolving a manifest list to this machine's entry."""
+    if 'manifests' in manifest:
+        arch = _ARCHITECTURES.get(platform.machine(), platform.machine())
+        entries = [
+            entry for entry in manifest['manifests']
+            if (entry.get('platform') or {}).get('os', 'linux') == 'linux'
+            and (entry.get('platform') or {}).get('architecture') == arch
+        ]
+        if not entries:
+            raise RuntimeError(f'No {arch} manifest for {repository}')
+        manifest = _inspect_manifest(client, f"{repository}@{entries[0]['digest']}")
+    return [(layer['digest'], int(layer.get('size', 0))) for layer in manifest.get('layers', [])]
+
+
+def _inspect_manifest(client, reference: str) -> dict:
+    response = client.api.get(f'/manifests/{quote(reference)}/json')
+    response.raise_for_status()
+    return response.json()
+
+
+@dataclass
+class BatchPlan:
+    """Pull order for a batch: groups run in parallel, images within a group in order"""
+    groups: List[List[str]]
+    naive_bytes: int      # The images pulled one after another, each reusing layers already on disk
+    planned_bytes: int    # Each missing layer fetched once
+    uninspected: List[str] = field(default_factory=list)  # No manifest; planned blind
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.naive_bytes - self.planned_bytes
+
+    def describe(self) -> str:
+        images = sum(len(group) for group in self.groups)
+        text = (f"{images} apps in {len(self.groups)} pull groups, "
+                f"{self.planned_bytes / (1024 * 1024):.0f} MB to download")
+        if self.bytes_saved > 0:
+            text += f" (saves {self.bytes_saved / (1024 * 1024):.0f} MB)"
+        return text
+
+
+@dataclass
+class BatchReport:
+    """Outcome of a batch install"""
+    plan: Optional[BatchPlan]
+    succeeded: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    downloaded_bytes: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes not transferred compared with naive sequential pulls."""
+        if self.plan is None:
+            return 0
+        return max(0, self.plan.naive_bytes - self.downloaded_bytes)
+
+    def describe(self) -> str:
+        text = f"Installed {len(self.succeeded)} of {len(self.succeeded) + len(self.failed)} apps"
+        if self.plan is not None:
+            text += f" · downloaded {self.downloaded_bytes / (1024 * 1024):.0f} MB"
+            if self.bytes_saved > 0:
+                text += f" · saved {self.bytes_saved / (1024 * 1024):.0f} MB"
+        return text
+
+
+def plan_batch(manifests: Dict[str, List[Tuple[str, int]]], local_layers: Set[str] = frozenset(),
+               uninspected: List[str] = ()) -> BatchPlan:
+    """
+    Group images that share missing layers and order each group so shared
+    layers are fetched once, by the first image that needs them.
+
+    Within a group the image carrying the most shared bytes goes first, then
+    the image with the most bytes already fetched. Groups share nothing, so
+    they can be pulled in parallel; the largest group starts first.
+    Images in uninspected become single-image groups. Layers in local_layers
+    are already on disk and count for neither the plan nor the baseline.
+    """
+    sizes = {}
+    users: Dict[str, List[str]] = {}
+    for image, layers in manifests.items():
+        for digest, size in layers:
+            if digest in local_layers:
+                continue
+            sizes[digest] = size
+            users.setdefault(digest, []).append(image)
+
+    # Union-find over images that share a missing layer
+    parent = {image: image for image in manifests}
+
+    def find(image):
+        while parent[image] != image:
+            parent[image] = parent[parent[image]]
+            image = parent[image]
+        return image
+
+    for images in users.values():
+        for other in images[1:]:
+            parent[find(other)] = find(images[0])
+
+    components: Dict[str, List[str]] = {}
+    for image in sorted(manifests):
+        components.setdefault(find(image), []).append(image)
+
+    def missing(image) -> Set[str]:
+        return {digest for digest, _ in manifests[image] if digest not in local_layers}
+
+    groups = []
+    for members in components.values():
+        remaining = set(members)
+        fetched: Set[str] = set()
+        order = []
+        first = max(sorted(remaining), key=lambda image: sum(
+            sizes[digest] * (len(users[digest]) - 1) for digest in missing(image)
+        ))
+        while remaining:
+            image = first if not order else max(sorted(remaining), key=lambda candidate: (
+                sum(sizes[digest] for digest in missing(candidate) & fetched),
+                -sum(sizes[digest] for digest in missing(candidate) - fetched),
+            ))
+            order.append(image)
+            remaining.discard(image)
+            fetched |= missing(image)
+        groups.append(order)
+
+    groups.sort(key=lambda group: -sum(sizes[d] for image in group for d in missing(image)))
+    groups.extend([image] for image in uninspected)
+
+    # Baseline: the images pulled one at a time in request order, each pull
+    # skipping layers that are on disk by then
+    naive = 0
+    on_disk = set(local_layers)
+    for image in manifests:
+        naive += sum(sizes[digest] for digest in missing(image) - on_disk)
+        on_disk |= missing(image)
+    return BatchPlan(groups=groups, naive_bytes=naive, planned_bytes=sum(sizes.values()),
+                     uninspected=list(uninspected))
+
+
+class BatchInstallWorker(QThread):
+    """
+    Installs several apps as one batch: inspects manifests, pulls along a
+    BatchPlan with independent groups in parallel, and creates each app's
+    container on a separate pool as soon as its image has landed.
+    Images with a verifiable offline bundle are loaded from it instead and
+    left out of the pull plan.
+    """
+    plan_ready = pyqtSignal(object)             # BatchPlan
+    status_update = pyqtSignal(str, str)        # image_name, status text
+    progress_update = pyqtSignal(str, object)   # image_name, PullProgress
+    image_finished = pyqtSignal(str, bool, str) # image_name, success, message
+    finished = pyqtSignal(object)               # BatchReport
+
+    def __init__(self, image_names: List[str], max_parallel_pulls: int = 2,
+                 digests: Optional[Dict[str, str]] = None,
+                 resources: Optional[Dict[str, dict]] = None, parent=None):
+        super().__init__(parent)
+        self.image_names = list(image_names)
+        self.max_parallel_pulls = max(1, max_parallel_pulls)
+        self.digests = digests or {}
+        self.resources = resources or {}  # image_name -> catalog resource limit overrides
+        self._cancelled: Set[str] = set()
+        self._lock = threading.Lock()
+        self._report = BatchReport(plan=None)
+        self.start_containers = not load_settings()['warm_pool']['enabled']
+
+    def cancel_image(self, image_name: str):
+        """Skip an image's remaining steps (thread-safe)."""
+        with self._lock:
+            self._cancelled.add(image_name)
+
+    def cancel_all(self):
+        with self._lock:
+            self._cancelled.update(self.image_names)
+
+    def _is_cancelled(self, image_name: str) -> bool:
+        with self._lock:
+            return image_name in self._cancelled
+
+    def run(self):
+        try:
+            client = create_podman_client()
+        except Exception as e:
+            for image_name in self.image_names:
+                self._finish(image_name, False, f'Connection failed: {e}')
+            self.finished.emit(self._report)
+            return
+
+        try:
+            present = set()
+            images = client.images.list()
+            for image in images:
+                for tag in image.tags:
+                    present.add(normalize_image_name(tag))
+            bundles = self._find_bundles([name for name in self.image_names if name not in present])
+            to_pull = [name for name in self.image_names if name not in present and name not in bundles]
+
+            for image_name in to_pull:
+                self.status_update.emit(image_name, 'Inspecting image layers...')
+            manifests, uninspected = self._fetch_manifests(client, to_pull)
+            local_layers = fetch_local_layers(client, images) if manifests else set()
+            plan = plan_batch(manifests, local_layers, uninspected)
+            self._report.plan = plan
+            self.plan_ready.emit(plan)
+
+            with ThreadPoolExecutor(CREATE_WORKERS) as creators:
+                for image_name in self.image_names:
+                    if image_name in present:
+                        creators.submit(self._create, client, image_name)
+                with ThreadPoolExecutor(self.max_parallel_pulls) as pulls:
+                    for image_name, path in bundles.items():
+                        pulls.submit(self._load_bundle, client, image_name, path, creators)
+                    for group in plan.groups:
+                        pulls.submit(self._pull_group, client, group, creators)
+        except Exception as e:
+            for image_name in self.image_names:
+                if image_name not in self._report.succeeded and image_name not in self._report.failed:
+                    self._finish(image_name, False, str(e))
+
+        self.finished.emit(self._report)
+
+    def _find_bundles(self, image_names: List[str]) -> Dict[str, str]:
+        settings = load_settings()['bundles']
+        bundles = {}
+        for image_name in image_names:
+            path = find_image_bundle(image_name, settings['directories'])
+            if path and (self.digests.get(image_name) or not settings['require_digest']):
+                bundles[image_name] = path
+        return bundles
+
+    def _load_bundle(self, client, image_name: str, path: str, creators: ThreadPoolExecutor):
+        if self._is_cancelled(image_name):
+            self._finish(image_name, False, CANCELLED_MESSAGE)
+            return
+        self.status_update.emit(image_name, f'Loading image from bundle {path}...')
+        try:
+            image_id = load_image_bundle(
+                client, path, image_name, self.digests.get(image_name, ''),
+                lambda progress: self.progress_update.emit(image_name, progress),
+                lambda: self._is_cancelled(image_name),
+            )
+        except Exception as e:
+            self._finish(image_name, False, f'Bundle load failed: {e}')
+            return
+        if not image_id:
+            self._finish(image_name, False, CANCELLED_MESSAGE)
+            return
+        creators.submit(self._create, client, image_name)
+
+    def _fetch_manifests(self, client, image_names: List[str]):
+        manifests = {}
+        uninspected = []
+        with ThreadPoolExecutor(MANIFEST_WORKERS) as pool:
+            futures = {name: pool.submit(fetch_image_layers, client, name) for name in image_names}
+            for image_name, future in futures.items():
+                try:
+                    manifests[image_name] = future.result()
+                except Exception as e:
+                    print(f"Manifest inspect failed for {image_name}: {e}")
+                    uninspected.append(image_name)
+        return manifests, uninspected
+
+    def _pull_group(self, client, group: List[str], creators: ThreadPoolExecutor):
+        for image_name in group:
+            if self._is_cancelled(image_name):
+                self._finish(image_name, False, CANCELLED_MESSAGE)
+                continue
+            try:
+                tracker = pull_with_mirrors(
+                    client,
+                    image_name,
+                    on_progress=lambda progress, name=image_name: self.progress_update.emit(name, progress),
+                    should_stop=lambda name=image_name: self._is_cancelled(name),
+                    on_registry=lambda registry, name=image_name: self.status_update.emit(
+                        name, f'Pulling image: {registry}/{name}...'
+                    ),
+                )
+            except Exception as e:
+                self._finish(image_name, False, f'Image pull failed: {e}')
+                continue
+            if tracker is None:
+                self._finish(image_name, False, CANCELLED_MESSAGE)
+                continue
+            with self._lock:
+                self._report.downloaded_bytes += tracker.downloaded_bytes
+            creators.submit(self._create, client, image_name)
+
+    def _create(self, client, image_name: str):
+        if self._is_cancelled(image_name):
+            self._finish(image_name, False, CANCELLED_MESSAGE)
+            return
+        self.status_update.emit(image_name, f'Running container from {image_name}...')
+        try:
+            limits = resolve_limits(self.resources.get(image_name))
+            self.status_update.emit(image_name, run_app_container(client, image_name, self.start_containers, limits))
+            add_installed_image(image_name)
+        except Exception as e:
+            self._finish(image_name, False, f'Container creation failed: {e}')
+            return
+        self._finish(image_name, True, 'Container ran successfully.')
+
+    def _finish(self, image_name: str, success: bool, message: str):
+        with self._lock:
+            (self._report.succeeded if success else self._report.failed).append(image_name)
+        self.image_finished.emit(image_name, success, message)
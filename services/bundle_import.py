@@ -0,0 +1,132 @@
+"""
+Offline image install from local docker/OCI archive bundles
+"""
+import os
+from typing import Callable, List, Optional
+from services.pull_progress import PullProgressTracker
+
+# Read size for streaming an archive to Podman
+CHUNK_SIZE = 1024 * 1024
+
+BUNDLE_SUFFIXES = ('.tar', '.tar.gz', '.tgz')
+
+
+class BundleLoadCancelled(Exception):
+    """Raised from the upload generator to abort a load"""
+
+
+def bundle_file_stem(image_name: str) -> str:
+    """'adas/lane-detection' -> 'adas_lane-detection'"""
+    return image_name.replace('/', '_').replace(':', '_')
+
+
+def find_image_bundle(image_name: str, directories: List[str]) -> Optional[str]:
+    """Return the first archive for the image in the bundle directories, if any."""
+    stem = bundle_file_stem(image_name)
+    for directory in directories:
+        for suffix in BUNDLE_SUFFIXES:
+            path = os.path.join(directory, stem + suffix)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+class _ProgressReader:
+    """File-like archive body that reports upload progress and can be stopped"""
+
+    def __init__(self, path: str, total: int, tracker: PullProgressTracker,
+                 on_progress: Optional[Callable], should_stop: Optional[Callable[[], bool]]):
+        self._file = open(path, 'rb')
+        self._total = total
+        self._sent = 0
+        self._tracker = tracker
+        self._on_progress = on_progress
+        self._should_stop = should_stop
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self):
+        while True:
+            data = self.read(CHUNK_SIZE)
+            if not data:
+                return
+            yield data
+
+    def read(self, size: int = -1) -> bytes:
+        if self._should_stop and self._should_stop():
+            raise BundleLoadCancelled()
+        data = self._file.read(CHUNK_SIZE if size is None or size < 0 else min(size, CHUNK_SIZE))
+        if data:
+            self._sent += len(data)
+            self._tracker.update({
+                'id': 'bundle', 'status': 'Downloading',
+                'progressDetail': {'current': self._sent, 'total': self._total},
+            })
+            if self._on_progress and self._tracker.should_emit():
+                self._on_progress(self._tracker.snapshot())
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+def _strip_digest(digest: str) -> str:
+    return digest.split(':', 1)[1] if ':' in digest else digest
+
+
+def load_image_bundle(client, path: str, image_name: str, expected_digest: str,
+                      on_progress: Callable = None, should_stop: Callable[[], bool] = None) -> str:
+    """
+    Stream an image archive to Podman's load endpoint and verify the result.
+
+    The file is read in CHUNK_SIZE pieces while it is sent (the Unix socket
+    adapter cannot do chunked encoding, so the size is declared up front),
+    so memory use does not grow with the archive. When expected_digest (from the
+    catalog entry) is given the loaded image ID must match it; on mismatch the
+    image is removed and RuntimeError raised. The image is tagged docker.io/<image_name>:latest,
+    the name network installs use, if the archive carried a different one.
+    Returns the image ID, or '' if stopped.
+    """
+    total = os.path.getsize(path)
+    # The archive is reported as a single layer so the usual progress UI applies
+    tracker = PullProgressTracker(image_name, 'bundle')
+
+    reader = _ProgressReader(path, total, tracker, on_progress, should_stop)
+    try:
+        response = client.api.post(
+            '/images/load',
+            data=reader,
+            headers={'Content-Type': 'application/x-tar'},
+        )
+    except BundleLoadCancelled:
+        return ''
+    except Exception as e:
+        # requests may wrap errors raised while reading the body
+        if isinstance(e.__context__, BundleLoadCancelled):
+            return ''
+        raise
+    finally:
+        reader.close()
+    tracker.update({'id': 'bundle', 'status': 'Download complete'})
+    response.raise_for_status()
+    names = response.json().get('Names') or []
+    if not names:
+        raise RuntimeError(f'No image found in {os.path.basename(path)}')
+    if on_progress:
+        on_progress(tracker.snapshot())
+
+    image = client.images.get(names[0])
+    if expected_digest and _strip_digest(image.id) != _strip_digest(expected_digest):
+        try:
+            client.images.remove(image.id, force=True)
+        except Exception as e:
+            print(f"Failed to remove unverified image {image.id}: {e}")
+        raise RuntimeError(
+            f'Digest mismatch for {image_name}: bundle has sha256:{_strip_digest(image.id)}, '
+            f'catalog expects {expected_digest}'
+        )
+
+    if f'docker.io/{image_name}:latest' not in names:
+        image.tag(f'docker.io/{image_name}', 'latest')
+    return image.id
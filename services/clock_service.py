@@ -0,0 +1,67 @@
+"""
+Shared wall clock for the clock displays, ticking on minute boundaries
+"""
+import re
+from datetime import datetime
+from typing import Callable, Dict, List
+import pytz
+from PyQt6.QtCore import QObject
+from services.scheduler import get_scheduler
+
+# strftime directives that change every second
+_SECONDS_DIRECTIVES = re.compile(r'%[-#]?[STXcrs]')
+
+
+class ClockService(QObject):
+    """
+    Renders the time in clock.timezone for every subscribed strftime
+    format from one scheduler job. The job runs on each full minute, or
+    on each full second while a subscribed format shows seconds. A
+    subscriber is only called when its rendered text changes, so a
+    "%I:%M %p" label is set once a minute and a date label once a day.
+    """
+
+    def __init__(self, settings: dict, parent=None):
+        super().__init__(parent)
+        self.timezone = pytz.timezone(settings['timezone'])
+        self._subscribers: Dict[str, List[Callable[[str], None]]] = {}
+        self._texts: Dict[str, str] = {}  # Format -> last rendered text
+        self.job = None
+        self.ticks = 0
+        self.notifications = 0
+
+    def now(self) -> datetime:
+        return datetime.now(self.timezone)
+
+    def subscribe(self, fmt: str, callback: Callable[[str], None]):
+        """Call callback with the time rendered in fmt now and whenever that text changes."""
+        text = self._texts.get(fmt)
+        if text is None:
+            text = self._texts[fmt] = self.now().strftime(fmt)
+        self._subscribers.setdefault(fmt, []).append(callback)
+        callback(text)
+        self._schedule()
+
+    def stop(self):
+        if self.job is not None:
+            get_scheduler().remove_job(self.job)
+            self.job = None
+
+    def _schedule(self):
+        interval = 1 if any(_SECONDS_DIRECTIVES.search(fmt) for fmt in self._subscribers) else 60
+        if self.job is not None and self.job.interval == interval:
+            return
+        self.stop()
+        self.job = get_scheduler().add_job('clock', self._tick, interval, aligned=True)
+
+    def _tick(self):
+        self.ticks += 1
+        now = self.now()
+        for fmt, callbacks in self._subscribers.items():
+            text = now.strftime(fmt)
+            if text == self._texts.get(fmt):
+                continue
+            self._texts[fmt] = text
+            for callback in callbacks:
+                self.notifications += 1
+                callback(text)
@@ -0,0 +1,314 @@
+"""
+Event-driven lifecycle tracking and control of adas-* containers
+"""
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from services.podman_service import (
+    CONTAINER_PREFIX, close_stream, create_podman_client, normalize_image_name,
+    summarize_container
+)
+from utils.file_utils import record_start_latency
+
+# Container statuses as reported by Podman
+RUNNING = 'running'
+CREATED = 'created'
+EXITED = 'exited'
+PAUSED = 'paused'
+REMOVED = 'removed'
+
+# Event action -> resulting status
+_ACTION_STATUS = {
+    'create': CREATED,
+    'init': CREATED,
+    'start': RUNNING,
+    'restart': RUNNING,
+    'unpause': RUNNING,
+    'pause': PAUSED,
+    'stop': EXITED,
+    'died': EXITED,
+    'die': EXITED,
+    'checkpoint': EXITED,
+    'restore': RUNNING,
+    'remove': REMOVED,
+}
+
+# Action -> start kind recorded with its latency
+_START_KINDS = {'start': 'warm', 'restore': 'restore'}
+
+# Reconnect backoff bounds for the events stream (seconds)
+_RETRY_MIN = 2
+_RETRY_MAX = 60
+
+
+@dataclass
+class ContainerInfo:
+    """Current state of one adas-* container"""
+    name: str
+    status: str
+    image: str = ''
+    exit_code: int = 0
+    health: str = ''
+    stopped_by_user: bool = False
+    checkpointed: bool = False  # Stopped with a checkpoint that a restore can resume
+
+    @property
+    def image_name(self) -> str:
+        return normalize_image_name(self.image)
+
+    @property
+    def crashed(self) -> bool:
+        """Exited on its own with a non-zero code."""
+        return self.status == EXITED and self.exit_code != 0 and not self.stopped_by_user
+
+
+class ContainerEventsWorker(QThread):
+    """
+    Subscribes once to the Podman events stream and turns container events
+    for adas-* containers into ContainerInfo updates. A bulk list call seeds
+    the table on every (re)connect so nothing is missed between streams.
+    """
+    snapshot = pyqtSignal(object)          # Dict[str, ContainerInfo]
+    container_event = pyqtSignal(object)   # ContainerInfo
+    connection_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._response = None
+        self._response_lock = threading.Lock()
+
+    def stop(self):
+        """Interrupt the blocking stream read and end the thread."""
+        self.requestInterruption()
+        with self._response_lock:
+            if self._response is not None:
+                close_stream(self._response)
+
+    def run(self):
+        delay = _RETRY_MIN
+        while not self.isInterruptionRequested():
+            try:
+                client = create_podman_client()
+                self.snapshot.emit(self._list_containers(client))
+                self.connection_changed.emit(True)
+                delay = _RETRY_MIN
+                self._follow_events(client)
+            except Exception as e:
+                if self.isInterruptionRequested():
+                    break
+                print(f"Container events stream lost: {e}")
+            self.connection_changed.emit(False)
+            # Sleep in short steps so stop() stays responsive
+            for _ in range(delay * 10):
+                if self.isInterruptionRequested():
+                    return
+                self.msleep(100)
+            delay = min(delay * 2, _RETRY_MAX)
+
+    def _list_containers(self, client) -> Dict[str, ContainerInfo]:
+        table = {}
+        for container in client.containers.list(all=True, filters={'name': CONTAINER_PREFIX}):
+            name, status, image = summarize_container(container.attrs)
+            if name.startswith(CONTAINER_PREFIX):
+                table[name] = ContainerInfo(name, status, image, container.attrs.get('ExitCode', 0) or 0)
+        return table
+
+    def _follow_events(self, client):
+        response = client.api.get(
+            '/events',
+            params={'stream': True, 'filters': json.dumps({'type': ['container']})},
+            stream=True,
+        )
+        response.raise_for_status()
+        with self._response_lock:
+            self._response = response
+        try:
+            for line in response.iter_lines():
+                if self.isInterruptionRequested():
+                    return
+                if not line:
+                    continue
+                info = self._parse_event(json.loads(line))
+                if info is not None:
+                    self.container_event.emit(info)
+        finally:
+            with self._response_lock:
+                self._response = None
+            response.close()
+
+    @staticmethod
+    def _parse_event(event: dict) -> Optional[ContainerInfo]:
+        actor = event.get('Actor') or {}
+        attributes = actor.get('Attributes') or {}
+        name = attributes.get('name', '')
+        if not name.startswith(CONTAINER_PREFIX):
+            return None
+
+        action = event.get('Action') or event.get('status', '')
+        image = attributes.get('image') or event.get('from', '')
+        if action == 'health_status':
+            return ContainerInfo(name, RUNNING, image, health=attributes.get('health_status', ''))
+        status = _ACTION_STATUS.get(action)
+        if status is None:
+            return None
+        exit_code = int(attributes.get('containerExitCode', 0) or 0)
+        return ContainerInfo(name, status, image, exit_code, checkpointed=action == 'checkpoint')
+
+
+class ContainerActionWorker(QThread):
+    """
+    Runs a single start/stop/remove/checkpoint/restore call off the GUI
+    thread. Start and restore are one request each, without an inspect
+    first, and their duration is kept in elapsed.
+    """
+    finished = pyqtSignal(str, str, bool, str)  # name, action, success, message
+
+    def __init__(self, container_name: str, action: str, parent=None):
+        super().__init__(parent)
+        self.container_name = container_name
+        self.action = action
+        self.elapsed = 0.0
+
+    def run(self):
+        try:
+            client = create_podman_client()
+            path = f'/containers/{quote(self.container_name)}'
+            started = time.monotonic()
+            if self.action == 'start':
+                client.api.post(f'{path}/start').raise_for_status()
+            elif self.action == 'restore':
+                client.api.post(f'{path}/restore', params={'keep': 'true'}).raise_for_status()
+            elif self.action == 'checkpoint':
+                client.api.post(f'{path}/checkpoint', params={'keep': 'true'}).raise_for_status()
+            elif self.action == 'stop':
+                client.containers.get(self.container_name).stop(timeout=10)
+            elif self.action == 'remove':
+                client.containers.get(self.container_name).remove(force=True)
+            else:
+                raise ValueError(f'Unknown action: {self.action}')
+            self.elapsed = time.monotonic() - started
+            self.finished.emit(self.container_name, self.action, True, '')
+        except Exception as e:
+            self.finished.emit(self.container_name, self.action, False, str(e))
+
+
+class ContainerLifecycleService(QObject):
+    """
+    In-memory state table of adas-* containers, kept current from the
+    Podman events stream instead of polling, plus non-blocking actions.
+    """
+    container_changed = pyqtSignal(str, object)  # container name, ContainerInfo (status REMOVED when gone)
+    action_finished = pyqtSignal(str, str, bool, str)  # name, action, success, message
+    container_started = pyqtSignal(str, str, float)  # name, 'warm' or 'restore', seconds
+    connection_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.containers: Dict[str, ContainerInfo] = {}
+        self.connected = False
+        self.last_start: Dict[str, Tuple[str, float]] = {}  # name -> (kind, seconds)
+        self._actions: Dict[str, ContainerActionWorker] = {}
+        self.worker = ContainerEventsWorker(self)
+        self.worker.snapshot.connect(self._on_snapshot)
+        self.worker.container_event.connect(self._on_event)
+        self.worker.connection_changed.connect(self._on_connection_changed)
+
+    def start(self):
+        """Start following the events stream."""
+        self.worker.start()
+
+    def stop(self):
+        """Stop following events and wait for pending actions."""
+        self.worker.stop()
+        self.worker.wait()
+        for worker in list(self._actions.values()):
+            worker.wait()
+
+    def get(self, container_name: str) -> Optional[ContainerInfo]:
+        return self.containers.get(container_name)
+
+    def is_busy(self, container_name: str) -> bool:
+        """True while an action for the container is in flight."""
+        return container_name in self._actions
+
+    def start_container(self, container_name: str) -> bool:
+        """Start the container, restoring its checkpoint if it has one."""
+        info = self.containers.get(container_name)
+        return self._run_action(container_name, 'restore' if info and info.checkpointed else 'start')
+
+    def checkpoint_container(self, container_name: str) -> bool:
+        """Stop the container with a checkpoint (kept) so a restore resumes it."""
+        return self._run_action(container_name, 'checkpoint')
+
+    def stop_container(self, container_name: str) -> bool:
+        return self._run_action(container_name, 'stop')
+
+    def remove_container(self, container_name: str) -> bool:
+        return self._run_action(container_name, 'remove')
+
+    def _run_action(self, container_name: str, action: str) -> bool:
+        if container_name in self._actions:
+            return False
+        worker = ContainerActionWorker(container_name, action, self)
+        worker.finished.connect(self._on_action_finished)
+        self._actions[container_name] = worker
+        worker.start()
+        return True
+
+    def _on_action_finished(self, name: str, action: str, success: bool, message: str):
+        worker = self._actions.pop(name, None)
+        if worker is not None:
+            worker.wait()
+            worker.deleteLater()
+            kind = _START_KINDS.get(action)
+            if success and kind:
+                self._record_start(name, kind, worker.elapsed)
+        self.action_finished.emit(name, action, success, message)
+
+    def _record_start(self, name: str, kind: str, seconds: float):
+        self.last_start[name] = (kind, seconds)
+        info = self.containers.get(name)
+        if info is not None and info.image:
+            try:
+                record_start_latency(info.image_name, kind, seconds)
+            except Exception as e:
+                print(f"Failed to record start latency: {e}")
+        self.container_started.emit(name, kind, seconds)
+
+    def _on_snapshot(self, table: dict):
+        previous = self.containers
+        self.containers = dict(table)
+        for name, info in table.items():
+            old = previous.get(name)
+            if old is None or old.status != info.status:
+                self.container_changed.emit(name, info)
+        for name in previous.keys() - table.keys():
+            self.container_changed.emit(name, ContainerInfo(name, REMOVED, previous[name].image))
+
+    def _on_event(self, info: ContainerInfo):
+        old = self.containers.get(info.name)
+        if info.status == REMOVED:
+            self.containers.pop(info.name, None)
+        else:
+            if old is not None and not info.health:
+                info.health = old.health
+            if info.status == EXITED:
+                # SIGTERM/SIGKILL exit codes from our own stop are not crashes
+                worker = self._actions.get(info.name)
+                info.stopped_by_user = worker is not None and worker.action in ('stop', 'remove', 'checkpoint')
+                # The 'stop' trailing 'died' can arrive after the stop action has finished
+                if (old is not None and old.stopped_by_user and old.status == EXITED
+                        and old.exit_code == info.exit_code):
+                    info.stopped_by_user = True
+            if old == info:
+                return  # 'died' is followed by 'stop' with the same outcome
+            self.containers[info.name] = info
+        self.container_changed.emit(info.name, info)
+
+    def _on_connection_changed(self, connected: bool):
+        self.connected = connected
+        self.connection_changed.emit(connected)
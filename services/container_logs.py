@@ -0,0 +1,159 @@
+"""
+Streaming logs of adas-* containers into a bounded ring buffer
+"""
+import struct
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from PyQt6.QtCore import QThread, pyqtSignal
+from services.podman_service import close_stream, create_podman_client
+
+# Stream ids in Podman's multiplexed log frames
+STDOUT = 1
+STDERR = 2
+
+# Longest kept line; longer ones are cut so one runaway line cannot exhaust the buffer
+MAX_LINE_CHARS = 2000
+
+_FRAME_HEADER = struct.Struct('>BxxxL')
+
+
+def demux_log_stream(chunks: Iterable[bytes]) -> Iterator[Tuple[int, bytes]]:
+    """
+    Split Podman's multiplexed log stream (8-byte header: stream id, 3 zero
+    bytes, big-endian length) into (stream, payload) pieces. Streams of
+    containers with a TTY carry no headers and come back as STDOUT.
+    """
+    buffer = b''
+    raw = None
+    for chunk in chunks:
+        if raw:
+            yield STDOUT, chunk
+            continue
+        buffer += chunk
+        if raw is None and buffer:
+            raw = buffer[0] not in (0, STDOUT, STDERR)
+            if raw:
+                yield STDOUT, buffer
+                buffer = b''
+                continue
+        while len(buffer) >= _FRAME_HEADER.size:
+            stream, length = _FRAME_HEADER.unpack_from(buffer)
+            end = _FRAME_HEADER.size + length
+            if len(buffer) < end:
+                break
+            yield (STDERR if stream == STDERR else STDOUT), buffer[_FRAME_HEADER.size:end]
+            buffer = buffer[end:]
+
+
+class LogBuffer:
+    """
+    Fixed-capacity ring of (text, is_stderr) lines addressed by sequence
+    number, so readers can keep positions while old lines are overwritten.
+    Thread-safe: the stream worker appends while the GUI reads.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._lines: List[Optional[Tuple[str, bool]]] = [None] * self.capacity
+        self._end = 0  # Sequence number of the next line
+        self._lock = threading.Lock()
+
+    def append(self, lines: List[Tuple[str, bool]]):
+        with self._lock:
+            # Lines cut off below were never visible; they still count as written,
+            # and before the rest so every kept line lands in its sequence's slot
+            self._end += max(0, len(lines) - self.capacity)
+            for line in lines[-self.capacity:]:
+                self._lines[self._end % self.capacity] = line
+                self._end += 1
+
+    def clear(self):
+        with self._lock:
+            self._lines = [None] * self.capacity
+            self._end = 0
+
+    def span(self) -> Tuple[int, int]:
+        """(first retained sequence number, next sequence number)"""
+        with self._lock:
+            return max(0, self._end - self.capacity), self._end
+
+    def get(self, seq: int) -> Optional[Tuple[str, bool]]:
+        """The line with this sequence number, or None once overwritten."""
+        with self._lock:
+            if seq < max(0, self._end - self.capacity) or seq >= self._end:
+                return None
+            return self._lines[seq % self.capacity]
+
+    def snapshot(self, start: int, end: int) -> List[Tuple[str, bool]]:
+        """Copies of the retained lines in [start, end)."""
+        with self._lock:
+            start = max(start, self._end - self.capacity, 0)
+            end = min(end, self._end)
+            return [self._lines[seq % self.capacity] for seq in range(start, end)]
+
+
+class LogStreamWorker(QThread):
+    """
+    Follows one container's log stream (stdout and stderr) and appends
+    complete lines to a LogBuffer. Nothing is emitted per line; readers poll
+    the buffer, so a chatty app costs the GUI one update per poll.
+    """
+    stream_ended = pyqtSignal(str)  # Reason, '' when the container stopped
+
+    def __init__(self, container_name: str, buffer: LogBuffer, tail: int, parent=None):
+        super().__init__(parent)
+        self.container_name = container_name
+        self.buffer = buffer
+        self.tail = tail
+        self._response = None
+        self._response_lock = threading.Lock()
+
+    def stop(self):
+        """Interrupt the blocking stream read and end the thread."""
+        self.requestInterruption()
+        with self._response_lock:
+            if self._response is not None:
+                close_stream(self._response)
+
+    def run(self):
+        try:
+            client = create_podman_client()
+            response = client.api.get(
+                f'/containers/{quote(self.container_name, safe="")}/logs',
+                params={'follow': True, 'stdout': True, 'stderr': True, 'tail': self.tail},
+                stream=True,
+            )
+            response.raise_for_status()
+            with self._response_lock:
+                self._response = response
+            try:
+                self._follow(response)
+            finally:
+                with self._response_lock:
+                    self._response = None
+                response.close()
+        except Exception as e:
+            if not self.isInterruptionRequested():
+                self.stream_ended.emit(str(e))
+            return
+        if not self.isInterruptionRequested():
+            self.stream_ended.emit('')
+
+    def _follow(self, response):
+        partial = {STDOUT: b'', STDERR: b''}
+        for stream, payload in demux_log_stream(response.iter_content(chunk_size=65536)):
+            if self.isInterruptionRequested():
+                return
+            data = partial[stream] + payload
+            *complete, partial[stream] = data.split(b'\n')
+            if complete:
+                self.buffer.append([
+                    (line.decode('utf-8', 'replace').rstrip('\r')[:MAX_LINE_CHARS], stream == STDERR)
+                    for line in complete
+                ])
+            if len(partial[stream]) > MAX_LINE_CHARS * 4:
+                partial[stream] = partial[stream][:MAX_LINE_CHARS]
+        for stream, rest in partial.items():
+            if rest:
+                self.buffer.append([(rest.decode('utf-8', 'replace')[:MAX_LINE_CHARS], stream == STDERR)])
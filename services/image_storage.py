@@ -0,0 +1,299 @@
+"""
+Disk-budgeted storage of app images: LRU pruning and full uninstall
+"""
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from services.podman_service import (
+    CONTAINER_PREFIX, container_name_for, create_podman_client, normalize_image_name,
+    summarize_container
+)
+from utils.file_utils import (
+    load_image_usage, save_image_usage, load_prefetched_images, save_prefetched_images,
+    update_installed_images
+)
+
+MB = 1024 * 1024
+
+# Seconds between writes of image_usage.json; stop() writes what is pending
+USAGE_SAVE_INTERVAL = 60
+
+
+def read_disk_usage(client) -> int:
+    """Bytes Podman's image store occupies, with shared layers counted once."""
+    response = client.api.get('/system/df')
+    response.raise_for_status()
+    return int(response.json().get('ImagesSize', 0))
+
+
+def choose_eviction(images: Dict[str, dict], excluded: Iterable[str]) -> Optional[str]:
+    """
+    The least recently used image in images ({name: {'last_used', 'size'}})
+    that is not excluded. Images that were never used count as oldest; among
+    images last used at the same time (e.g. prefetched, never started) the
+    largest goes first, so fewer removals get back under budget.
+    """
+    excluded = set(excluded)
+    candidates = [name for name in images if name not in excluded]
+    if not candidates:
+        return None
+    return min(sorted(candidates), key=lambda name: (images[name].get('last_used', 0),
+                                                      -images[name].get('size', 0)))
+
+
+@dataclass
+class StorageReport:
+    """Outcome of an uninstall or pruning pass"""
+    removed: Dict[str, int] = field(default_factory=dict)   # image_name -> bytes freed
+    failed: Dict[str, str] = field(default_factory=dict)    # image_name -> error
+    used_bytes: int = 0
+    budget_bytes: int = 0
+    over_budget: bool = False  # Still over budget with nothing left to evict
+    pruned: List[str] = field(default_factory=list)          # Removed to meet the budget
+    sizes: Dict[str, int] = field(default_factory=dict)      # image_name -> image size when listed
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        return sum(self.removed.values())
+
+    def describe(self) -> str:
+        text = f"Storage {self.used_bytes / MB:.0f} of {self.budget_bytes / MB:.0f} MB"
+        uninstalled = [name for name in self.removed if name not in self.pruned]
+        if uninstalled:
+            text += (f" · freed {sum(self.removed[name] for name in uninstalled) / MB:.0f} MB"
+                     f" by uninstalling {len(uninstalled)} "
+                     f"{'app' if len(uninstalled) == 1 else 'apps'}")
+        if self.pruned:
+            text += (f" · freed {sum(self.removed[name] for name in self.pruned) / MB:.0f} MB"
+                     f" by removing {len(self.pruned)} unused "
+                     f"{'app' if len(self.pruned) == 1 else 'apps'}")
+        if self.over_budget:
+            text += " · over budget, all remaining apps in use"
+        return text
+
+
+class StorageWorker(QThread):
+    """
+    Uninstalls the requested apps, then, if prune is set, evicts the
+    least recently used app images that are not running until Podman's
+    image store fits in it, largest first among equally old ones. Freed bytes are measured with a disk usage
+    report before and after each removal, so layers still shared with
+    other images are not counted.
+    """
+    finished = pyqtSignal(object)  # StorageReport
+
+    def __init__(self, uninstall: List[str], app_images: Set[str], usage: Dict[str, dict],
+                 budget_bytes: int, prune: bool = False, protected: Iterable[str] = (), parent=None):
+        super().__init__(parent)
+        self.uninstall = list(uninstall)
+        self.app_images = set(app_images)
+        self.usage = {name: dict(entry) for name, entry in usage.items()}
+        self.budget_bytes = budget_bytes
+        self.prune = prune
+        self.protected = set(protected)
+
+    def run(self):
+        report = StorageReport(budget_bytes=self.budget_bytes)
+        try:
+            client = create_podman_client()
+            used = read_disk_usage(client)
+            stored, running, report.sizes = self._list_app_images(client)
+
+            for image_name in self.uninstall:
+                try:
+                    self._remove_app(client, image_name, stored.get(image_name))
+                except Exception as e:
+                    report.failed[image_name] = str(e)
+                    continue
+                after = read_disk_usage(client)
+                report.removed[image_name] = max(0, used - after)
+                used = after
+
+            if self.prune:
+                excluded = running | self.protected | set(report.removed) | set(report.failed)
+                while used > self.budget_bytes:
+                    image_name = choose_eviction({
+                        name: {'last_used': self.usage.get(name, {}).get('last_used', 0),
+                               'size': report.sizes.get(name, 0)}
+                        for name in stored
+                    }, excluded)
+                    if image_name is None:
+                        report.over_budget = True
+                        break
+                    excluded.add(image_name)
+                    try:
+                        self._remove_app(client, image_name, stored[image_name])
+                    except Exception as e:
+                        report.failed[image_name] = str(e)
+                        continue
+                    after = read_disk_usage(client)
+                    report.removed[image_name] = max(0, used - after)
+                    report.pruned.append(image_name)
+                    used = after
+            report.used_bytes = used
+        except Exception as e:
+            for image_name in self.uninstall:
+                if image_name not in report.removed:
+                    report.failed.setdefault(image_name, str(e))
+        self.finished.emit(report)
+
+    def _list_app_images(self, client) -> Tuple[Dict[str, str], Set[str], Dict[str, int]]:
+        """({app image name: image id}, {app images with a running container}, {app image name: size})"""
+        stored, sizes = {}, {}
+        for image in client.images.list():
+            for tag in image.tags:
+                name = normalize_image_name(tag)
+                if name in self.app_images:
+                    stored[name] = image.id
+                    sizes[name] = int(image.attrs.get('Size') or 0)
+        running = set()
+        for container in client.containers.list(all=True, filters={'name': CONTAINER_PREFIX}):
+            name, status, image = summarize_container(container.attrs)
+            if status == 'running':
+                running.add(normalize_image_name(image))
+        return stored, running, sizes
+
+    @staticmethod
+    def _remove_app(client, image_name: str, image_id: Optional[str]):
+        """Remove the app's container and image (all of its tags)."""
+        container_name = container_name_for(image_name)
+        if client.containers.exists(container_name):
+            client.containers.get(container_name).remove(force=True)
+        if image_id:
+            client.images.remove(image_id, force=True)
+
+
+class ImageStorageManager(QObject):
+    """
+    Records when each app image was last used, and its size, and keeps Podman's image
+    store under storage.budget_mb by evicting least recently used apps that
+    are not running. uninstall() removes an app's container, image and
+    installed registry entry together. One StorageWorker runs at a time;
+    requests made meanwhile are merged into the next pass.
+    """
+    uninstall_finished = pyqtSignal(str, bool, str, object)  # image_name, success, message, bytes freed
+    report_ready = pyqtSignal(object)                     # StorageReport
+    busy_changed = pyqtSignal(str)                        # image_name
+
+    def __init__(self, installed_images: set, catalog_images: Iterable[str], settings: dict, parent=None):
+        super().__init__(parent)
+        self.installed_images = installed_images
+        self.catalog_images = set(catalog_images)
+        self.budget_bytes = int(settings['budget_mb'] * MB)
+        self.auto_prune = settings['auto_prune']
+        self.usage = load_image_usage()
+        self._usage_dirty = False
+        self._usage_saved_at = 0.0
+        self._in_use: Set[str] = set()
+        self.worker: Optional[StorageWorker] = None
+        self.last_report: Optional[StorageReport] = None
+        self._pending: deque = deque()
+        self._prune_requested = False
+        self._protected: Set[str] = set()
+        self._running: List[str] = []
+
+    def touch(self, image_name: str):
+        """Mark an app image as used now (installed or started)."""
+        self.usage.setdefault(image_name, {'last_used': 0, 'size': 0})['last_used'] = time.time()
+        self._usage_dirty = True
+        if time.monotonic() - self._usage_saved_at >= USAGE_SAVE_INTERVAL:
+            self.flush()
+
+    def set_running(self, image_name: str, running: bool):
+        """Follow an app's container; the image counts as used when it starts running."""
+        if running and image_name not in self._in_use:
+            self.touch(image_name)
+        if running:
+            self._in_use.add(image_name)
+        else:
+            self._in_use.discard(image_name)
+
+    def flush(self):
+        """Write pending usage changes to image_usage.json."""
+        if self._usage_dirty:
+            save_image_usage(self.usage)
+            self._usage_dirty = False
+            self._usage_saved_at = time.monotonic()
+
+    def is_busy(self, image_name: str) -> bool:
+        return image_name in self._pending or image_name in self._running
+
+    def uninstall(self, image_name: str) -> bool:
+        """Queue removal of an app's container, image and registry entry."""
+        if self.is_busy(image_name):
+            return False
+        self._pending.append(image_name)
+        self.busy_changed.emit(image_name)
+        self._pump()
+        return True
+
+    def enforce_budget(self, protected: Iterable[str] = ()):
+        """Queue a pruning pass; images in protected (e.g. installing) are kept."""
+        self._prune_requested = True
+        self._protected |= set(protected)
+        self._pump()
+
+    def stop(self):
+        self._pending.clear()
+        self._prune_requested = False
+        if self.worker is not None:
+            self.worker.wait()
+        self.flush()
+
+    def _pump(self):
+        if self.worker is not None or not (self._pending or self._prune_requested):
+            return
+        self._running = list(self._pending)
+        self._pending.clear()
+        prefetched = load_prefetched_images()
+        self.worker = StorageWorker(
+            self._running,
+            (self.installed_images | prefetched) & self.catalog_images,
+            self.usage,
+            self.budget_bytes,
+            self._prune_requested,
+            self._protected,
+            self,
+        )
+        self._prune_requested = False
+        self._protected = set()
+        self.worker.finished.connect(self._on_finished)
+        self.worker.start()
+
+    def _on_finished(self, report: StorageReport):
+        worker = self.worker
+        self.worker = None
+        worker.wait()
+        worker.deleteLater()
+
+        for image_name, size in report.sizes.items():
+            entry = self.usage.setdefault(image_name, {'last_used': 0, 'size': 0})
+            if entry['size'] != size:
+                entry['size'] = size
+                self._usage_dirty = True
+        if report.removed:
+            prefetched = load_prefetched_images()
+            for image_name in report.removed:
+                self.installed_images.discard(image_name)
+                prefetched.discard(image_name)
+                self.usage.pop(image_name, None)
+            update_installed_images(removed=report.removed)
+            save_prefetched_images(prefetched)
+            self._usage_dirty = True
+        self.flush()
+
+        running, self._running = self._running, []
+        for image_name in running:
+            if image_name in report.removed:
+                freed = report.removed[image_name]
+                self.uninstall_finished.emit(image_name, True, f"Uninstalled · freed {freed / MB:.0f} MB", freed)
+            else:
+                message = report.failed.get(image_name, 'Not removed')
+                self.uninstall_finished.emit(image_name, False, message, 0)
+            self.busy_changed.emit(image_name)
+
+        self.last_report = report
+        self.report_ready.emit(report)
+        self._pump()
@@ -0,0 +1,256 @@
+"""
+Install manager for running Podman installs in the background
+"""
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QObject, pyqtSignal
+from services.podman_service import PodmanWorker, CANCELLED_MESSAGE
+from services.batch_install import BatchInstallWorker
+from services.pull_progress import PullProgress
+from utils.file_utils import extract_image_name
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+CANCELLING = 'cancelling'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+ACTIVE_STATES = (QUEUED, RUNNING, CANCELLING)
+
+# Job priorities (lower value runs first)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+@dataclass
+class InstallJob:
+    """State of a single queued or running install"""
+    image_name: str
+    location: str
+    priority: int = PRIORITY_NORMAL
+    digest: str = ''  # Catalog image digest, for verifying offline bundles
+    resources: dict = field(default_factory=dict)  # Catalog resource limit overrides
+    state: str = QUEUED
+    status: str = ''
+    message: str = ''
+    progress: Optional[PullProgress] = None
+    worker: Optional[PodmanWorker] = field(default=None, repr=False)
+    batch: Optional[BatchInstallWorker] = field(default=None, repr=False)
+
+    @property
+    def is_active(self) -> bool:
+        """Returns True while the job is queued or running."""
+        return self.state in ACTIVE_STATES
+
+
+class InstallManager(QObject):
+    """
+    Runs installs on a bounded pool of PodmanWorker threads.
+
+    Requests for an image that already has an active job are merged into
+    that job, queued jobs start in priority order (FIFO within a priority)
+    and every state change is announced through job_changed.
+
+    submit_batch() installs several apps through one BatchInstallWorker,
+    which orders pulls by shared layers; its jobs show up like any other.
+    """
+    job_changed = pyqtSignal(str)           # image_name
+    job_status = pyqtSignal(str, str)       # image_name, status text
+    job_progress = pyqtSignal(str, object)  # image_name, PullProgress
+    job_finished = pyqtSignal(str, bool, str)  # image_name, success, message
+    batch_planned = pyqtSignal(object)      # BatchPlan
+    batch_finished = pyqtSignal(object)     # BatchReport
+
+    def __init__(self, installed_images: set, max_workers: int = 2, parent=None):
+        super().__init__(parent)
+        self.installed_images = installed_images
+        self.max_workers = max(1, max_workers)
+        self._jobs: Dict[str, InstallJob] = {}
+        self._queue = []  # heap of (priority, seq, image_name)
+        self._seq = itertools.count()
+        self._running = 0
+        self._batches: List[BatchInstallWorker] = []
+
+    def submit(self, location: str, priority: int = PRIORITY_NORMAL, digest: str = '',
+               resources: Optional[dict] = None) -> Optional[InstallJob]:
+        """Queue an install, or return the active job for the same image."""
+        image_name = extract_image_name(location)
+        if not image_name:
+            return None
+
+        job = self._jobs.get(image_name)
+        if job and job.is_active:
+            if job.state == QUEUED and priority < job.priority:
+                # Re-queue with the higher priority; the stale entry is skipped later
+                job.priority = priority
+                heapq.heappush(self._queue, (priority, next(self._seq), image_name))
+            return job
+
+        job = InstallJob(image_name=image_name, location=location, priority=priority, digest=digest,
+                         resources=resources or {})
+        self._jobs[image_name] = job
+        heapq.heappush(self._queue, (priority, next(self._seq), image_name))
+        self.job_changed.emit(image_name)
+        self._pump()
+        return job
+
+    def submit_batch(self, locations: List[str], digests: Optional[Dict[str, str]] = None,
+                     resources: Optional[Dict[str, dict]] = None) -> List[InstallJob]:
+        """
+        Install several apps as one layer-aware batch. Images that already
+        have an active job are left to that job. digests maps image names to
+        catalog digests for verifying offline bundles, resources to catalog
+        resource limit overrides.
+        """
+        digests = digests or {}
+        resources = resources or {}
+        jobs = []
+        for location in locations:
+            image_name = extract_image_name(location)
+            if not image_name or any(job.image_name == image_name for job in jobs):
+                continue
+            existing = self._jobs.get(image_name)
+            if existing and existing.is_active:
+                continue
+            jobs.append(InstallJob(image_name=image_name, location=location,
+                                   digest=digests.get(image_name, ''),
+                                   resources=resources.get(image_name) or {}, state=RUNNING))
+        if not jobs:
+            return []
+
+        worker = BatchInstallWorker(
+            [job.image_name for job in jobs], self.max_workers,
+            {job.image_name: job.digest for job in jobs},
+            {job.image_name: job.resources for job in jobs}, self
+        )
+        worker.status_update.connect(self._on_status)
+        worker.progress_update.connect(self._on_progress)
+        worker.image_finished.connect(self._on_batch_image_finished)
+        worker.plan_ready.connect(self.batch_planned)
+        worker.finished.connect(lambda report, w=worker: self._on_batch_finished(w, report))
+        self._batches.append(worker)
+        for job in jobs:
+            job.batch = worker
+            self._jobs[job.image_name] = job
+            self.job_changed.emit(job.image_name)
+        worker.start()
+        return jobs
+
+    def cancel(self, image_name: str) -> bool:
+        """Cancel a queued or running install. Returns False if nothing was active."""
+        job = self._jobs.get(image_name)
+        if not job or not job.is_active:
+            return False
+
+        if job.state == QUEUED:
+            job.state = CANCELLED
+            job.message = CANCELLED_MESSAGE
+            self.job_changed.emit(image_name)
+            self.job_finished.emit(image_name, False, CANCELLED_MESSAGE)
+        elif job.state == RUNNING:
+            job.state = CANCELLING
+            if job.batch is not None:
+                job.batch.cancel_image(image_name)
+            else:
+                job.worker.requestInterruption()
+            self.job_changed.emit(image_name)
+        return True
+
+    def get_job(self, image_name: str) -> Optional[InstallJob]:
+        """Return the most recent job for an image, if any."""
+        return self._jobs.get(image_name)
+
+    def active_jobs(self) -> List[InstallJob]:
+        """Return all queued and running jobs."""
+        return [job for job in self._jobs.values() if job.is_active]
+
+    def shutdown(self):
+        """Cancel all jobs and wait for running workers to stop."""
+        for job in self.active_jobs():
+            self.cancel(job.image_name)
+        for job in self._jobs.values():
+            if job.worker is not None:
+                job.worker.wait()
+        for worker in self._batches:
+            worker.wait()
+
+    def _pump(self):
+        """Start queued jobs while there are free worker slots."""
+        while self._running < self.max_workers and self._queue:
+            priority, _, image_name = heapq.heappop(self._queue)
+            job = self._jobs.get(image_name)
+            if not job or job.state != QUEUED or job.priority != priority:
+                continue
+            self._start(job)
+
+    def _start(self, job: InstallJob):
+        """Start a PodmanWorker for the job."""
+        job.state = RUNNING
+        job.worker = PodmanWorker(job.location, self, expected_digest=job.digest, resources=job.resources)
+        job.worker.status_update.connect(
+            lambda text, name=job.image_name: self._on_status(name, text)
+        )
+        job.worker.progress_update.connect(
+            lambda progress, name=job.image_name: self._on_progress(name, progress)
+        )
+        job.worker.finished.connect(
+            lambda success, msg, name=job.image_name: self._on_finished(name, success, msg)
+        )
+        self._running += 1
+        self.job_changed.emit(job.image_name)
+        job.worker.start()
+
+    def _on_status(self, image_name: str, text: str):
+        job = self._jobs.get(image_name)
+        if job:
+            job.status = text
+            self.job_status.emit(image_name, text)
+
+    def _on_progress(self, image_name: str, progress: PullProgress):
+        job = self._jobs.get(image_name)
+        if job:
+            job.progress = progress
+            self.job_progress.emit(image_name, progress)
+
+    def _on_finished(self, image_name: str, success: bool, message: str):
+        job = self._jobs[image_name]
+        worker = job.worker
+        job.worker = None
+        # finished is emitted just before run() returns
+        worker.wait()
+        worker.deleteLater()
+        self._running -= 1
+        self._complete(job, success, message)
+        self._pump()
+
+    def _on_batch_image_finished(self, image_name: str, success: bool, message: str):
+        job = self._jobs.get(image_name)
+        if job and job.batch is not None and job.is_active:
+            job.batch = None
+            self._complete(job, success, message)
+
+    def _on_batch_finished(self, worker: BatchInstallWorker, report):
+        worker.wait()
+        self._batches.remove(worker)
+        worker.deleteLater()
+        self.batch_finished.emit(report)
+
+    def _complete(self, job: InstallJob, success: bool, message: str):
+        """Record a job's outcome and announce it."""
+        image_name = job.image_name
+        job.message = message
+        if success:
+            job.state = SUCCEEDED
+            self.installed_images.add(image_name)
+        elif message == CANCELLED_MESSAGE or job.state == CANCELLING:
+            job.state = CANCELLED
+        else:
+            job.state = FAILED
+
+        self.job_changed.emit(image_name)
+        self.job_finished.emit(image_name, success, message)
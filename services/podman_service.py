@@ -2,9 +2,20 @@
 Podman service for managing container operations
 """
 import os
+import json
+import socket
+import time
 from podman import PodmanClient
 from PyQt6.QtCore import QThread, pyqtSignal
-from utils.file_utils import extract_image_name, load_installed_images, save_installed_images
+from services.pull_progress import PullProgressTracker
+from services.bundle_import import find_image_bundle, load_image_bundle
+from services.registry_mirrors import get_registry_mirrors
+from services.resource_limits import ResourceLimits, resolve_limits
+from utils.file_utils import (
+    extract_image_name, add_installed_image, append_pull_stats, load_settings, record_start_latency
+)
+
+CANCELLED_MESSAGE = 'Cancelled'
 
 def get_podman_socket_path():
     """
@@ -38,19 +49,249 @@ def get_podman_socket_path():
     # If no socket found, return None and let the caller handle the error
     return None
 
+def create_podman_client() -> PodmanClient:
+    """
+    Connect to the detected Podman socket and verify it with a ping.
+    Raises RuntimeError if no socket is available.
+    """
+    socket_path = get_podman_socket_path()
+    if not socket_path:
+        raise RuntimeError('Podman socket not available')
+    client = PodmanClient(base_url=socket_path)
+    client.ping()
+    return client
+
+def summarize_container(attrs: dict) -> tuple:
+    """
+    Return (name, status, image) from container attrs. Handles both the
+    list format (Names list, State string) and the inspect format.
+    """
+    names = attrs.get('Names') or [attrs.get('Name', '')]
+    name = names[0].lstrip('/') if names else ''
+    state = attrs.get('State', '')
+    status = state.get('Status', '') if isinstance(state, dict) else state
+    return name, status, attrs.get('Image', '')
+
+def close_stream(response) -> None:
+    """
+    Close a streaming API response from another thread. Shutting the socket
+    down wakes a reader blocked in iter_lines(); close() alone may not.
+    """
+    try:
+        connection = getattr(response.raw, '_connection', None)
+        sock = getattr(connection, 'sock', None)
+        if sock is not None:
+            sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    try:
+        response.close()
+    except Exception:
+        pass
+
+def split_image_reference(reference: str) -> tuple:
+    """Split 'registry/repo:tag' into ('registry/repo', 'tag'), defaulting to 'latest'."""
+    repository, _, tag = reference.rpartition(':')
+    if not repository or '/' in tag:
+        return reference, 'latest'
+    return repository, tag
+
+def pull_image_streaming(client, pull_reference: str, image_name: str,
+                         on_progress=None, should_stop=None,
+                         record_stats: bool = True) -> PullProgressTracker | None:
+    """
+    Pull an image through the Docker-compatible /images/create endpoint,
+    which streams per-layer progress events.
+
+    on_progress receives throttled PullProgress snapshots; should_stop is
+    polled on every event. Per-layer timings go to the pull stats file
+    unless record_stats is False. Returns the tracker, or None if stopped.
+    Raises on API or pull errors.
+    """
+    repository, tag = split_image_reference(pull_reference)
+    tracker = PullProgressTracker(image_name, repository.split('/', 1)[0])
+    response = client.api.post(
+        '/images/create',
+        params={'fromImage': repository, 'tag': tag},
+        compatible=True,
+        stream=True,
+    )
+    response.raise_for_status()
+    try:
+        for line in response.iter_lines():
+            if should_stop and should_stop():
+                return None
+            if not line:
+                continue
+            event = json.loads(line)
+            if 'error' in event:
+                raise RuntimeError(event['error'])
+            tracker.update(event)
+            if on_progress and tracker.should_emit():
+                on_progress(tracker.snapshot())
+    finally:
+        response.close()
+
+    if on_progress:
+        on_progress(tracker.snapshot())
+    if not record_stats:
+        return tracker
+    try:
+        append_pull_stats(tracker.layer_records())
+    except Exception as e:
+        print(f"Failed to record pull stats: {e}")
+    return tracker
+
+def pull_with_mirrors(client, image_name: str, on_progress=None, should_stop=None,
+                      on_registry=None) -> PullProgressTracker | None:
+    """
+    Pull an app image through the configured registry mirrors, falling back
+    in order to the upstream registry. Each attempt's time to first
+    progress event and download throughput are recorded for that registry.
+    A mirror's image is retagged <upstream>/<image_name> so the rest of the
+    dashboard sees the usual name.
+
+    on_registry is called with each registry before it is tried. Returns the
+    tracker of the successful pull, or None if stopped; raises if every
+    registry fails.
+    """
+    mirrors = get_registry_mirrors()
+    repository, tag = split_image_reference(image_name)
+    errors = []
+    for registry in mirrors.candidates():
+        reference = f"{registry}/{repository}:{tag}"
+        if on_registry:
+            on_registry(registry)
+        started = time.monotonic()
+        first_event = []
+
+        def stop_requested() -> bool:
+            # Polled once per stream event, so the first call marks the first byte
+            if not first_event:
+                first_event.append(time.monotonic())
+            return bool(should_stop and should_stop())
+
+        try:
+            tracker = pull_image_streaming(client, reference, image_name, on_progress, stop_requested)
+        except Exception as e:
+            mirrors.record_failure(registry, str(e))
+            errors.append(f"{registry}: {e}")
+            print(f"Pull of {image_name} from {registry} failed: {e}")
+            continue
+        if tracker is None:
+            return None
+        finished = time.monotonic()
+        latency = (first_event[0] if first_event else finished) - started
+        mirrors.record_success(registry, latency, tracker.downloaded_bytes, finished - started - latency)
+        if registry != mirrors.upstream:
+            _retag_from_mirror(client, reference, f"{mirrors.upstream}/{repository}", tag)
+        return tracker
+    raise RuntimeError('All registries failed: ' + '; '.join(errors))
+
+def _retag_from_mirror(client, reference: str, repository: str, tag: str):
+    """Give a mirror-pulled image its upstream name and drop the mirror name."""
+    image = client.images.get(reference)
+    image.tag(repository, tag)
+    mirror_repository, mirror_tag = split_image_reference(reference)
+    try:
+        client.api.post(
+            f'/images/{image.id}/untag',
+            params={'repo': mirror_repository, 'tag': mirror_tag},
+        ).raise_for_status()
+    except Exception as e:
+        print(f"Failed to untag {reference}: {e}")
+
+CONTAINER_PREFIX = 'adas-'
+
+def container_name_for(image_name: str) -> str:
+    """Container name used for an installed image, e.g. adas-adas-lane-detection."""
+    return f"{CONTAINER_PREFIX}{image_name.replace('/', '-').replace(':', '-')}"
+
+def normalize_image_name(reference: str) -> str:
+    """
+    Reduce a Podman image reference to the catalog image name.
+    'docker.io/adas/lane-detection:latest' -> 'adas/lane-detection'
+    The configured upstream registry is stripped like docker.io.
+    """
+    name = reference
+    for prefix in (f'{get_registry_mirrors().upstream}/', 'docker.io/', 'localhost/'):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    if name.endswith(':latest'):
+        name = name[:-len(':latest')]
+    return name
+
+def run_app_container(client, image_name: str, start: bool = True,
+                      limits: ResourceLimits = None) -> str:
+    """
+    Start the app container for an image, creating it if needed. With
+    start=False (warm pool mode) the container is only created, so a later
+    start is a single API call. A new container gets limits (CPU, memory,
+    pids); an existing one keeps those it was created with. A fresh
+    create-and-start is recorded as the app's cold start time. Returns a
+    status message; raises if the container cannot be created.
+    """
+    container_name = container_name_for(image_name)
+    limit_kwargs = limits.create_kwargs() if limits else {}
+    try:
+        # Check if container already exists
+        existing_container = client.containers.get(container_name)
+    except Exception:
+        existing_container = None
+    if existing_container is not None:
+        if existing_container.status == 'running':
+            return f"Container '{container_name}' is already running."
+        if not start:
+            return f"Container '{container_name}' is ready to start."
+        existing_container.start()
+        return f"Started existing container '{container_name}'."
+
+    if not start:
+        client.containers.create(
+            image_name,
+            name=container_name,
+            command=['sleep', 'infinity'],
+            **limit_kwargs
+        )
+        return f"Created container '{container_name}' (warm, not started)."
+
+    # Container doesn't exist, create and run it using original image name
+    started = time.monotonic()
+    client.containers.run(
+        image_name,
+        detach=True,
+        remove=False,  # Don't auto-remove so we can manage it
+        name=container_name,
+        command=['sleep', 'infinity'],
+        **limit_kwargs
+    )
+    try:
+        record_start_latency(image_name, 'cold', time.monotonic() - started)
+    except Exception as e:
+        print(f"Failed to record start latency: {e}")
+    return f"Created and started container '{container_name}'."
+
 class PodmanWorker(QThread):
-    """Worker thread for Podman operations using Podman socket API"""
+    """
+    Worker thread for Podman operations using Podman socket API.
+
+    Cancellation uses QThread.requestInterruption(); the worker checks for it
+    between steps and finishes with (False, CANCELLED_MESSAGE).
+    """
     status_update = pyqtSignal(str)
+    progress_update = pyqtSignal(object)  # PullProgress, throttled to 10 Hz
     finished = pyqtSignal(bool, str)
 
-    def __init__(self, image_url: str, parent=None):
+    def __init__(self, image_url: str, parent=None, expected_digest: str = '',
+                 resources: dict = None):
         super().__init__(parent)
         self.image_url = image_url
         self.image_name = extract_image_name(image_url)
-        # For pulling: add docker.io/ prefix to ensure user images can be downloaded
-        self.pull_image_name = f"docker.io/{self.image_name}" if not self.image_name.startswith('docker.io/') else self.image_name
+        self.expected_digest = expected_digest
+        self.resources = resources or {}  # Catalog entry's resource limit overrides
         # Use a more robust container naming strategy
-        self.container_name = f"adas-{self.image_name.replace('/', '-').replace(':', '-')}"
+        self.container_name = container_name_for(self.image_name)
 
     def run(self):
         """Pull image, run container, and save installed image using Podman socket API."""
@@ -85,57 +326,55 @@ Expected socket locations:
                 self.finished.emit(False, f'Connection failed: {e}')
                 return
 
+            if self._cancel_requested():
+                return
+
             # Check if image is already pulled to avoid redundant pulls
             self.status_update.emit(f'Checking if image {self.image_name} is already available...')
             try:
                 client.images.get(self.image_name)
                 self.status_update.emit(f'Image {self.image_name} is already available.')
             except Exception:
-                # Image not found, pull it with docker.io/ prefix
-                self.status_update.emit(f'Pulling image: {self.pull_image_name}...')
-                try:
-                    client.images.pull(self.pull_image_name)
-                    self.status_update.emit(f'Successfully pulled image: {self.pull_image_name}')
-                except Exception as e:
-                    self.status_update.emit(f'Failed to pull image: {e}')
-                    self.finished.emit(False, f'Image pull failed: {e}')
-                    return
+                bundle = self._find_bundle()
+                if bundle:
+                    self.status_update.emit(f'Loading image from bundle {bundle}...')
+                    try:
+                        if not load_image_bundle(client, bundle, self.image_name, self.expected_digest,
+                                                 self.progress_update.emit, self.isInterruptionRequested):
+                            self._cancel_requested()
+                            return
+                        self.status_update.emit(f'Loaded and verified {self.image_name} from bundle.')
+                    except Exception as e:
+                        self.status_update.emit(f'Failed to load bundle: {e}')
+                        self.finished.emit(False, f'Bundle load failed: {e}')
+                        return
+                else:
+                    # Image not found, pull it through the mirrors, then upstream
+                    try:
+                        if not self._pull_with_progress(client):
+                            return
+                        self.status_update.emit(f'Successfully pulled image: {self.image_name}')
+                    except Exception as e:
+                        self.status_update.emit(f'Failed to pull image: {e}')
+                        self.finished.emit(False, f'Image pull failed: {e}')
+                        return
+
+            if self._cancel_requested():
+                return
 
             self.status_update.emit(f'Running container from {self.image_name}...')
             try:
-                # Check if container already exists
-                existing_container = client.containers.get(self.container_name)
-                if existing_container.status == 'running':
-                    self.status_update.emit(f"Container '{self.container_name}' is already running.")
-                else:
-                    existing_container.start()
-                    self.status_update.emit(f"Started existing container '{self.container_name}'.")
+                start = not load_settings()['warm_pool']['enabled']
+                limits = resolve_limits(self.resources)
+                self.status_update.emit(run_app_container(client, self.image_name, start, limits))
             except Exception as e:
-                # Container doesn't exist, create and run it using original image name
-                try:
-                    client.containers.run(
-                        self.image_name,
-                        detach=True,
-                        remove=False,  # Don't auto-remove so we can manage it
-                        name=self.container_name,
-                        command=['sleep', 'infinity']
-                    )
-                    self.status_update.emit(f"Created and started container '{self.container_name}'.")
-                except Exception as e:
-                    self.status_update.emit(f'Failed to create container: {e}')
-                    self.finished.emit(False, f'Container creation failed: {e}')
-                    return
+                self.status_update.emit(f'Failed to create container: {e}')
+                self.finished.emit(False, f'Container creation failed: {e}')
+                return
 
             # Save the installed image to the JSON file
             try:
-                installed_images = load_installed_images()
-                # Handle both set and list types for backward compatibility
-                if hasattr(installed_images, 'add'):
-                    installed_images.add(self.image_name)
-                elif isinstance(installed_images, list):
-                    if self.image_name not in installed_images:
-                        installed_images.append(self.image_name)
-                save_installed_images(installed_images)
+                add_installed_image(self.image_name)
                 self.status_update.emit(f'Saved {self.image_name} to installed images.')
             except Exception as e:
                 self.status_update.emit(f'Warning: Failed to save installed image info: {e}')
@@ -146,4 +385,40 @@ Expected socket locations:
 
         except Exception as e:
             self.status_update.emit('An unexpected error occurred.')
-            self.finished.emit(False, str(e)) 
\ No newline at end of file
+            self.finished.emit(False, str(e)) 
+
+    def _find_bundle(self):
+        """Return a verifiable offline bundle for the image, if one is present."""
+        settings = load_settings()['bundles']
+        bundle = find_image_bundle(self.image_name, settings['directories'])
+        if bundle and not self.expected_digest and settings['require_digest']:
+            self.status_update.emit(f'Ignoring bundle {bundle}: catalog entry has no digest to verify.')
+            return None
+        return bundle
+
+    def _cancel_requested(self) -> bool:
+        """Finish the worker as cancelled if an interruption was requested."""
+        if not self.isInterruptionRequested():
+            return False
+        self.status_update.emit('Installation cancelled.')
+        self.finished.emit(False, CANCELLED_MESSAGE)
+        return True
+
+    def _pull_with_progress(self, client) -> bool:
+        """
+        Pull the image through the registry mirrors and the streaming
+        endpoint, emitting aggregated progress. Returns False if cancelled.
+        """
+        tracker = pull_with_mirrors(
+            client,
+            self.image_name,
+            on_progress=self.progress_update.emit,
+            should_stop=self.isInterruptionRequested,
+            on_registry=lambda registry: self.status_update.emit(
+                f'Pulling image: {registry}/{self.image_name}...'
+            ),
+        )
+        if tracker is None:
+            self._cancel_requested()
+            return False
+        return True
@@ -0,0 +1,213 @@
+"""
+Speculative image pre-pull while the dashboard is idle
+"""
+import time
+from typing import Callable, List, Optional, Set
+from PyQt6.QtCore import QObject, QThread, QTimer, QEvent, pyqtSignal
+from services.podman_service import (
+    create_podman_client, normalize_image_name, pull_with_mirrors
+)
+from utils.file_utils import (
+    load_prefetched_images, save_prefetched_images, load_store_interest
+)
+
+# Input events that count as user activity
+_ACTIVITY_EVENTS = (
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.KeyPress,
+    QEvent.Type.TouchBegin,
+    QEvent.Type.Wheel,
+)
+
+
+def rank_prefetch_candidates(features: list, installed_images: set, interest: dict) -> List[str]:
+    """
+    Order catalog images by likelihood of being installed: the static
+    priority field first, then how often the store info dialog was opened.
+    Installed images are excluded.
+    """
+    candidates = [
+        feature for feature in features
+        if feature.image_name and feature.image_name not in installed_images
+    ]
+    candidates.sort(
+        key=lambda feature: (feature.priority, interest.get(feature.image_name, 0)),
+        reverse=True
+    )
+    return [feature.image_name for feature in candidates]
+
+
+class PrefetchWorker(QThread):
+    """
+    Pulls candidate images one at a time within bandwidth and disk limits.
+    A pull stops as soon as the layer sizes reported so far would take the
+    prefetched images over the disk budget; smaller candidates are tried next.
+    """
+    image_prefetched = pyqtSignal(str)
+    finished = pyqtSignal(bool, str)
+
+    def __init__(self, candidates: List[str], bandwidth_limit_mbps: float,
+                 disk_budget_mb: int, parent=None):
+        super().__init__(parent)
+        self.candidates = candidates
+        self.bandwidth_limit = bandwidth_limit_mbps * 1024 * 1024  # bytes per second
+        self.disk_budget = disk_budget_mb * 1024 * 1024
+
+    def run(self):
+        try:
+            client = create_podman_client()
+            # One bulk call for both "already present" and disk accounting
+            present = {}
+            for image in client.images.list():
+                for tag in image.tags:
+                    present[normalize_image_name(tag)] = image.attrs.get('Size', 0)
+
+            prefetched = load_prefetched_images()
+            used = sum(present.get(name, 0) for name in prefetched)
+
+            over_budget = []
+            for image_name in self.candidates:
+                if self.isInterruptionRequested():
+                    self.finished.emit(False, 'Paused for activity')
+                    return
+                if image_name in present:
+                    continue
+                if used >= self.disk_budget:
+                    self.finished.emit(True, 'Disk budget reached')
+                    return
+
+                def on_progress(progress, used=used, image_name=image_name):
+                    # Layer sizes arrive as their downloads start, long before the pull is done
+                    if used + progress.total_bytes > self.disk_budget:
+                        over_budget.append(image_name)
+
+                started = time.monotonic()
+                tracker = pull_with_mirrors(
+                    client,
+                    image_name,
+                    on_progress=on_progress,
+                    should_stop=lambda name=image_name: self.isInterruptionRequested() or name in over_budget,
+                )
+                if tracker is None and image_name in over_budget:
+                    continue
+                if tracker is None:
+                    self.finished.emit(False, 'Paused for activity')
+                    return
+
+                pulled_bytes = tracker.total_bytes
+                used += pulled_bytes
+                prefetched.add(image_name)
+                save_prefetched_images(prefetched)
+                self.image_prefetched.emit(image_name)
+
+                # Podman has no per-transfer rate limit, so hold the average
+                # rate under the cap by idling after each pull
+                if self.bandwidth_limit > 0:
+                    elapsed = time.monotonic() - started
+                    delay = pulled_bytes / self.bandwidth_limit - elapsed
+                    while delay > 0 and not self.isInterruptionRequested():
+                        self.msleep(int(min(delay, 0.5) * 1000))
+                        delay -= 0.5
+
+            if over_budget:
+                self.finished.emit(True, 'Disk budget reached')
+            else:
+                self.finished.emit(True, 'All candidates prefetched')
+        except Exception as e:
+            self.finished.emit(False, str(e))
+
+
+class ImagePrefetcher(QObject):
+    """
+    Starts a PrefetchWorker once the dashboard has been idle for
+    idle_seconds, and interrupts it on any user activity or when a busy
+    check (running installs, visible alerts) reports work in progress.
+    """
+    image_prefetched = pyqtSignal(str)
+
+    def __init__(self, features: list, installed_images: set, settings: dict, parent=None):
+        super().__init__(parent)
+        self.features = features
+        self.installed_images = installed_images
+        self.enabled = settings['enabled']
+        self.idle_seconds = settings['idle_seconds']
+        self.bandwidth_limit_mbps = settings['bandwidth_limit_mbps']
+        self.disk_budget_mb = settings['disk_budget_mb']
+        self.max_images = settings['max_images']
+        self.worker: Optional[PrefetchWorker] = None
+        self._busy_checks: List[Callable[[], bool]] = []
+        self._exhausted: Set[str] = set()
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self._on_idle)
+        if self.enabled:
+            self.idle_timer.start(self.idle_seconds * 1000)
+
+    def add_busy_check(self, check: Callable[[], bool]):
+        """Register a callable that returns True while prefetching must not run."""
+        self._busy_checks.append(check)
+
+    def notify_activity(self):
+        """Pause any running prefetch and restart the idle countdown."""
+        if not self.enabled:
+            return
+        if self.worker is not None:
+            self.worker.requestInterruption()
+        self.idle_timer.start(self.idle_seconds * 1000)
+
+    def eventFilter(self, obj, event):
+        """Application-wide event filter that treats input as activity."""
+        if event.type() in _ACTIVITY_EVENTS:
+            self.notify_activity()
+        return False
+
+    def stop(self):
+        """Stop prefetching and wait for the worker."""
+        self.enabled = False
+        self.idle_timer.stop()
+        if self.worker is not None:
+            self.worker.requestInterruption()
+            self.worker.wait()
+
+    def _on_idle(self):
+        if self.worker is not None:
+            return
+        if any(check() for check in self._busy_checks):
+            self.idle_timer.start(self.idle_seconds * 1000)
+            return
+
+        # Installed images no longer count as speculative
+        prefetched = load_prefetched_images()
+        if prefetched & self.installed_images:
+            prefetched -= self.installed_images
+            save_prefetched_images(prefetched)
+
+        ranked = rank_prefetch_candidates(self.features, self.installed_images, load_store_interest())
+        remaining = self.max_images - len(prefetched)
+        candidates = [
+            name for name in ranked
+            if name not in self._exhausted and name not in prefetched
+        ][:max(0, remaining)]
+        if not candidates:
+            return
+
+        self.worker = PrefetchWorker(candidates, self.bandwidth_limit_mbps, self.disk_budget_mb, self)
+        self.worker.image_prefetched.connect(self._on_image_prefetched)
+        self.worker.finished.connect(self._on_finished)
+        self.worker.start()
+
+    def _on_image_prefetched(self, image_name: str):
+        self._exhausted.add(image_name)
+        self.image_prefetched.emit(image_name)
+
+    def _on_finished(self, success: bool, message: str):
+        worker = self.worker
+        self.worker = None
+        worker.wait()
+        worker.deleteLater()
+        if success:
+            # Everything we wanted is present (or the budget is full)
+            self._exhausted.update(worker.candidates)
+        else:
+            print(f"Prefetch stopped: {message}")
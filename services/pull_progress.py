@@ -0,0 +1,163 @@
+"""
+Progress aggregation for streamed image pulls
+"""
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Minimum seconds between progress emissions (10 Hz)
+PROGRESS_INTERVAL = 0.1
+
+# Seconds of samples used for the throughput estimate
+RATE_WINDOW = 3.0
+
+# Layer statuses that mean no more bytes will be transferred
+_LAYER_DONE_STATUSES = ('Download complete', 'Pull complete', 'Already exists', 'Verifying Checksum')
+
+
+@dataclass
+class PullProgress:
+    """A snapshot of overall pull progress for the UI"""
+    image_name: str
+    percent: int
+    downloaded_bytes: int
+    total_bytes: int
+    bytes_per_second: float
+    eta_seconds: Optional[float]
+    layers_done: int
+    layers_total: int
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_per_second / (1024 * 1024)
+
+    def describe(self) -> str:
+        """Short human readable summary, e.g. '42% · 3.1 MB/s · 12s left'"""
+        parts = [f"{self.percent}%"]
+        if self.bytes_per_second > 0:
+            parts.append(f"{self.mb_per_second:.1f} MB/s")
+        if self.eta_seconds is not None:
+            parts.append(f"{int(round(self.eta_seconds))}s left")
+        return ' · '.join(parts)
+
+
+@dataclass
+class LayerTiming:
+    """Transfer bookkeeping for a single layer"""
+    layer_id: str
+    total: int = 0
+    current: int = 0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    cached: bool = False
+
+
+class PullProgressTracker:
+    """
+    Aggregates per-layer events from the Docker-compatible pull stream
+    into overall percent, throughput and ETA.
+    """
+
+    def __init__(self, image_name: str, registry: str = ''):
+        self.image_name = image_name
+        self.registry = registry
+        self.started = time.monotonic()
+        self.layers: Dict[str, LayerTiming] = {}
+        self._samples = deque()  # (timestamp, downloaded_bytes)
+        self._last_emit = 0.0
+
+    def update(self, event: dict) -> None:
+        """Apply one decoded stream event."""
+        layer_id = event.get('id')
+        status = event.get('status', '')
+        # Events without progressDetail (e.g. 'Pulling from x') describe the image, not a layer
+        if not layer_id or 'progressDetail' not in event and status not in _LAYER_DONE_STATUSES:
+            return
+
+        now = time.monotonic()
+        layer = self.layers.get(layer_id)
+        if layer is None:
+            layer = self.layers[layer_id] = LayerTiming(layer_id)
+
+        if status == 'Already exists':
+            layer.cached = True
+            layer.finished = now
+        elif status == 'Downloading':
+            detail = event.get('progressDetail') or {}
+            if layer.started is None:
+                layer.started = now
+            layer.total = detail.get('total', layer.total) or layer.total
+            layer.current = detail.get('current', layer.current)
+        elif status in _LAYER_DONE_STATUSES and layer.finished is None:
+            if layer.total:
+                layer.current = layer.total
+            layer.finished = now
+
+        self._samples.append((now, self.downloaded_bytes))
+        while self._samples and now - self._samples[0][0] > RATE_WINDOW:
+            self._samples.popleft()
+
+    @property
+    def downloaded_bytes(self) -> int:
+        return sum(layer.current for layer in self.layers.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(layer.total for layer in self.layers.values())
+
+    def bytes_per_second(self) -> float:
+        """Throughput over the recent sample window."""
+        if len(self._samples) < 2:
+            return 0.0
+        (t0, b0), (t1, b1) = self._samples[0], self._samples[-1]
+        if t1 <= t0:
+            return 0.0
+        return max(0.0, (b1 - b0) / (t1 - t0))
+
+    def should_emit(self) -> bool:
+        """Throttle progress emission to PROGRESS_INTERVAL."""
+        now = time.monotonic()
+        if now - self._last_emit < PROGRESS_INTERVAL:
+            return False
+        self._last_emit = now
+        return True
+
+    def snapshot(self) -> PullProgress:
+        """Build the current PullProgress."""
+        downloaded = self.downloaded_bytes
+        total = self.total_bytes
+        rate = self.bytes_per_second()
+        done = sum(1 for layer in self.layers.values() if layer.finished is not None)
+        percent = int(downloaded * 100 / total) if total else 0
+        if self.layers and done == len(self.layers):
+            percent = 100
+        eta = (total - downloaded) / rate if rate > 0 and total else None
+        return PullProgress(
+            image_name=self.image_name,
+            percent=min(percent, 100),
+            downloaded_bytes=downloaded,
+            total_bytes=total,
+            bytes_per_second=rate,
+            eta_seconds=eta,
+            layers_done=done,
+            layers_total=len(self.layers),
+        )
+
+    def layer_records(self) -> List[dict]:
+        """Per-layer timing records for transferred layers, for persisting."""
+        records = []
+        for layer in self.layers.values():
+            if layer.cached or layer.started is None or layer.finished is None:
+                continue
+            seconds = max(layer.finished - layer.started, 1e-6)
+            records.append({
+                'image': self.image_name,
+                'registry': self.registry,
+                'layer': layer.layer_id,
+                'bytes': layer.total,
+                'seconds': round(seconds, 3),
+                'bytes_per_second': int(layer.total / seconds),
+                'timestamp': int(time.time()),
+            })
+        return records
@@ -0,0 +1,137 @@
+"""
+Reconciles the installed-images registry with the real Podman state
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from services.podman_service import (
+    CONTAINER_PREFIX, container_name_for, create_podman_client, normalize_image_name,
+    summarize_container
+)
+from services.scheduler import get_scheduler
+from utils.file_utils import load_podman_state, save_podman_state
+
+
+@dataclass
+class PodmanState:
+    """Bulk snapshot of local images and adas-* containers"""
+    images: Set[str] = field(default_factory=set)
+    containers: Dict[str, str] = field(default_factory=dict)  # container name -> status
+    timestamp: float = 0.0
+
+    def is_installed(self, image_name: str) -> bool:
+        """An app is installed when its image exists and its container was created."""
+        return image_name in self.images and container_name_for(image_name) in self.containers
+
+    def to_dict(self) -> dict:
+        return {
+            'images': sorted(self.images),
+            'containers': self.containers,
+            'timestamp': self.timestamp,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PodmanState':
+        return cls(
+            images=set(data.get('images', [])),
+            containers=dict(data.get('containers', {})),
+            timestamp=data.get('timestamp', 0.0),
+        )
+
+
+class ReconcileWorker(QThread):
+    """Fetches all images and adas-* containers in two bulk API calls"""
+    finished = pyqtSignal(bool, object)  # success, PodmanState or error message
+
+    def run(self):
+        try:
+            # Stamped with the start: anything that changes during the listing may be missed
+            started = time.time()
+            client = create_podman_client()
+            images = set()
+            for image in client.images.list():
+                for tag in image.tags:
+                    images.add(normalize_image_name(tag))
+
+            containers = {}
+            for container in client.containers.list(all=True, filters={'name': CONTAINER_PREFIX}):
+                name, status, _ = summarize_container(container.attrs)
+                if name.startswith(CONTAINER_PREFIX):
+                    containers[name] = status
+
+            self.finished.emit(True, PodmanState(images, containers, started))
+        except Exception as e:
+            self.finished.emit(False, str(e))
+
+
+class InstalledStateReconciler(QObject):
+    """
+    Periodically diffs the installed-images registry against Podman.
+
+    The last PodmanState is cached on disk, so startup can use it without
+    waiting for Podman; refreshes run on a background thread.
+    """
+    state_changed = pyqtSignal(object)  # PodmanState
+
+    def __init__(self, interval_seconds: int = 300, parent=None):
+        super().__init__(parent)
+        self.worker: Optional[ReconcileWorker] = None
+        cached = load_podman_state()
+        self.state: Optional[PodmanState] = PodmanState.from_dict(cached) if cached else None
+
+        self.job = None
+        if interval_seconds > 0:
+            self.job = get_scheduler().add_job('reconcile', self.refresh, interval_seconds)
+
+    def refresh(self):
+        """Start a background refresh unless one is already running."""
+        if self.worker is not None:
+            return
+        self.worker = ReconcileWorker(self)
+        self.worker.finished.connect(self._on_finished)
+        self.worker.start()
+
+    def stop(self):
+        """Stop periodic refreshes and wait for a running one."""
+        if self.job is not None:
+            get_scheduler().remove_job(self.job)
+        if self.worker is not None:
+            self.worker.wait()
+
+    def _on_finished(self, success: bool, result):
+        worker = self.worker
+        self.worker = None
+        worker.wait()
+        worker.deleteLater()
+        if not success:
+            # Keep the cached state; an unreachable Podman says nothing about what is installed
+            print(f"Podman state refresh failed: {result}")
+            return
+
+        self.state = result
+        try:
+            save_podman_state(result.to_dict())
+        except Exception as e:
+            print(f"Failed to cache Podman state: {e}")
+        self.state_changed.emit(result)
+
+
+def reconcile_installed(installed_images: set, catalog_images: Set[str], state: PodmanState,
+                        skip: Set[str] = frozenset()) -> bool:
+    """
+    Update installed_images in place from a PodmanState.
+
+    Only catalog images are considered; images in skip (e.g. with an
+    install in progress) are left untouched. Returns True if anything changed.
+    """
+    changed = False
+    for image_name in catalog_images - set(skip):
+        installed = state.is_installed(image_name)
+        if installed and image_name not in installed_images:
+            installed_images.add(image_name)
+            changed = True
+        elif not installed and image_name in installed_images:
+            installed_images.discard(image_name)
+            changed = True
+    return changed
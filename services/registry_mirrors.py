@@ -0,0 +1,151 @@
+"""
+Registry mirror selection with per-mirror latency and throughput
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+from utils.file_utils import load_mirror_stats, save_mirror_stats, load_settings
+
+# Weight of the newest sample in the moving averages
+EWMA_ALPHA = 0.3
+
+# Pull size used to compare mirrors: latency + REFERENCE_BYTES / throughput
+REFERENCE_BYTES = 50 * 1024 * 1024
+
+# Cap on the failure cooldown after repeated failures (seconds)
+MAX_COOLDOWN = 3600
+
+# Pull errors meaning the registry works but lacks the image
+_MISSING_IMAGE_ERRORS = ('manifest unknown', 'name unknown', 'not found')
+
+
+@dataclass
+class MirrorStats:
+    """Pull history of one registry"""
+    pulls: int = 0
+    failures: int = 0
+    misses: int = 0           # Reachable, but without the requested image
+    consecutive_failures: int = 0
+    latency: float = 0.0      # Seconds to the first progress event (moving average)
+    throughput: float = 0.0   # Bytes per second while downloading (moving average)
+    last_failure: float = 0.0
+    last_error: str = ''
+
+    def estimated_seconds(self) -> float:
+        """Expected time for a REFERENCE_BYTES pull; 0 when never measured."""
+        if not self.throughput:
+            return self.latency
+        return self.latency + REFERENCE_BYTES / self.throughput
+
+
+class RegistryMirrors:
+    """
+    Ordered registry candidates for pulls: healthy mirrors fastest first,
+    then the upstream registry as the fallback. Mirrors without
+    measurements are tried before measured ones, so every mirror gets
+    measured, with the configured order breaking ties. A failing mirror
+    sits out failure_cooldown_seconds, doubled per consecutive failure.
+    Thread-safe; stats are persisted in resources/mirror_stats.json.
+    """
+
+    def __init__(self, settings: dict):
+        self.upstream = settings['upstream']
+        self.mirrors = [m for m in settings['mirrors'] if m != self.upstream]
+        self.cooldown = settings['failure_cooldown_seconds']
+        self._lock = threading.Lock()
+        self.stats: Dict[str, MirrorStats] = {}
+        for registry, data in load_mirror_stats().items():
+            try:
+                self.stats[registry] = MirrorStats(**data)
+            except TypeError:
+                continue
+
+    def candidates(self) -> List[str]:
+        """Registries to try, in order; the upstream registry is always last."""
+        now = time.time()
+        with self._lock:
+            healthy = [m for m in self.mirrors if not self._cooling_down(m, now)]
+            ranked = sorted(healthy, key=lambda m: (
+                self._stats(m).estimated_seconds(), self.mirrors.index(m)
+            ))
+        return ranked + [self.upstream]
+
+    def record_success(self, registry: str, latency: float, downloaded_bytes: int, download_seconds: float):
+        with self._lock:
+            stats = self._stats(registry)
+            stats.pulls += 1
+            stats.consecutive_failures = 0
+            stats.latency = _ewma(stats.latency, latency, stats.pulls == 1)
+            # Pulls of already-present layers say nothing about throughput
+            if downloaded_bytes > 0 and download_seconds > 0:
+                stats.throughput = _ewma(stats.throughput, downloaded_bytes / download_seconds,
+                                         not stats.throughput)
+            self._save()
+
+    def record_failure(self, registry: str, error: str):
+        """
+        Count a failed pull. A missing image is only a miss; anything else
+        puts the registry into cooldown.
+        """
+        with self._lock:
+            stats = self._stats(registry)
+            if any(marker in error.lower() for marker in _MISSING_IMAGE_ERRORS):
+                stats.misses += 1
+                self._save()
+                return
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            stats.last_failure = time.time()
+            stats.last_error = error.splitlines()[0][:200] if error else ''
+            self._save()
+
+    def describe(self) -> str:
+        """One line per registry: health, latency and throughput."""
+        lines = []
+        with self._lock:
+            for registry in self.mirrors + [self.upstream]:
+                stats = self._stats(registry)
+                state = 'cooling down' if self._cooling_down(registry, time.time()) else 'ok'
+                lines.append(
+                    f"{registry}: {state}, {stats.pulls} pulls, {stats.failures} failures, "
+                    f"{stats.misses} misses, "
+                    f"{stats.latency * 1000:.0f} ms to first byte, "
+                    f"{stats.throughput / (1024 * 1024):.1f} MB/s"
+                )
+        return '\n'.join(lines)
+
+    def _stats(self, registry: str) -> MirrorStats:
+        if registry not in self.stats:
+            self.stats[registry] = MirrorStats()
+        return self.stats[registry]
+
+    def _cooling_down(self, registry: str, now: float) -> bool:
+        stats = self.stats.get(registry)
+        if stats is None or not stats.consecutive_failures:
+            return False
+        cooldown = min(self.cooldown * 2 ** (stats.consecutive_failures - 1), MAX_COOLDOWN)
+        return now - stats.last_failure < cooldown
+
+    def _save(self):
+        try:
+            save_mirror_stats({registry: asdict(stats) for registry, stats in self.stats.items()})
+        except Exception as e:
+            print(f"Failed to save mirror stats: {e}")
+
+
+def _ewma(previous: float, sample: float, first: bool) -> float:
+    return sample if first else EWMA_ALPHA * sample + (1 - EWMA_ALPHA) * previous
+
+
+_registry_mirrors: Optional[RegistryMirrors] = None
+_registry_mirrors_lock = threading.Lock()
+
+
+def get_registry_mirrors() -> RegistryMirrors:
+    """The process-wide RegistryMirrors, created from settings on first use."""
+    global _registry_mirrors
+    with _registry_mirrors_lock:
+        if _registry_mirrors is None:
+            _registry_mirrors = RegistryMirrors(load_settings()['registries'])
+        return _registry_mirrors
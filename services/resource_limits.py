@@ -0,0 +1,85 @@
+"""
+Cgroup resource limits applied to app containers at create time
+"""
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+from utils.file_utils import load_settings
+
+# CFS period the CPU quota is expressed against (microseconds)
+CPU_PERIOD_US = 100000
+
+MB = 1024 * 1024
+
+
+@dataclass
+class ResourceLimits:
+    """
+    Limits for one app container; 0 leaves a resource unlimited.
+    cpu_shares is the relative weight under contention (the dashboard runs
+    at the default 1024), cpu_percent a hard cap in percent of one core.
+    """
+    cpu_shares: int = 0
+    cpu_percent: float = 0.0
+    memory_mb: int = 0
+    pids_limit: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict, base: Optional['ResourceLimits'] = None) -> 'ResourceLimits':
+        """Limits from a policy dict over base; unknown or invalid keys keep base's value."""
+        limits = replace(base) if base else cls()
+        for item in fields(cls):
+            if item.name not in data:
+                continue
+            try:
+                value = item.type(data[item.name] or 0)
+            except (TypeError, ValueError):
+                print(f"Ignoring invalid resource limit {item.name}={data[item.name]!r}")
+                continue
+            setattr(limits, item.name, max(value, 0))
+        return limits
+
+    @property
+    def is_unlimited(self) -> bool:
+        return not (self.cpu_shares or self.cpu_percent or self.memory_mb or self.pids_limit)
+
+    def create_kwargs(self) -> dict:
+        """Keyword arguments for client.containers.create()/run()."""
+        kwargs = {}
+        if self.cpu_shares:
+            kwargs['cpu_shares'] = int(self.cpu_shares)
+        if self.cpu_percent:
+            kwargs['cpu_period'] = CPU_PERIOD_US
+            kwargs['cpu_quota'] = int(CPU_PERIOD_US * self.cpu_percent / 100)
+        if self.memory_mb:
+            kwargs['mem_limit'] = int(self.memory_mb * MB)
+        if self.pids_limit:
+            kwargs['pids_limit'] = int(self.pids_limit)
+        return kwargs
+
+    def describe(self) -> str:
+        """Short summary, e.g. 'CPU 50% (shares 512), 512 MB, 256 pids'"""
+        if self.is_unlimited:
+            return 'no limits'
+        parts = []
+        if self.cpu_percent or self.cpu_shares:
+            cpu = f"CPU {self.cpu_percent:g}%" if self.cpu_percent else 'CPU'
+            if self.cpu_shares:
+                cpu += f" (shares {self.cpu_shares})"
+            parts.append(cpu)
+        if self.memory_mb:
+            parts.append(f"{self.memory_mb} MB")
+        if self.pids_limit:
+            parts.append(f"{self.pids_limit} pids")
+        return ', '.join(parts)
+
+
+def resolve_limits(catalog_resources: Optional[dict] = None, settings: Optional[dict] = None) -> ResourceLimits:
+    """
+    Limits for an app: the resource_limits.default policy with the catalog
+    entry's 'resources' keys on top. With resource_limits.enabled off,
+    containers are created without limits.
+    """
+    settings = settings if settings is not None else load_settings()['resource_limits']
+    if not settings['enabled']:
+        return ResourceLimits()
+    return ResourceLimits.from_dict(catalog_resources or {}, ResourceLimits.from_dict(settings['default']))
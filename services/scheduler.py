@@ -0,0 +1,293 @@
+"""
+Central scheduler for the dashboard's recurring jobs
+"""
+import math
+import random
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+from PyQt6.QtCore import QObject, Qt, QThread, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QNetworkInformation
+from utils.file_utils import load_settings
+
+# Job states reported by Scheduler.stats()
+IDLE = 'idle'
+RUNNING = 'running'
+BACKOFF = 'backoff'
+WAITING_NETWORK = 'waiting-network'
+
+# Jobs due this close to a timer firing run with it
+TIMER_SLACK = 0.002
+
+# Aligned jobs run this long after the wall-clock boundary, so they see the new minute
+ALIGN_SLACK = 0.005
+
+
+@dataclass
+class Job:
+    """A recurring job and its run statistics"""
+    name: str
+    run: Callable[[], Any]
+    interval: float                  # Seconds from the end of one run to the next
+    aligned: bool = False            # Run on wall-clock multiples of interval instead
+    background: bool = False         # Run on a worker thread; network jobs always are
+    network: bool = False            # Paused while offline; runs are jittered
+    on_result: Optional[Callable[[Any], None]] = None  # GUI thread, after a background run succeeds
+    retry: float = 0.0               # First retry delay after a failure, doubled per failure; 0 means interval
+    next_run: float = 0.0            # time.monotonic() of the next run
+    running: bool = False
+    waiting_network: bool = False
+    runs: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_error: str = ''
+    last_run: float = 0.0            # Epoch seconds the last run started
+    last_duration: float = 0.0
+    total_duration: float = 0.0
+    max_duration: float = 0.0
+    _started: float = 0.0
+
+
+class JobWorker(QThread):
+    """Runs one background job"""
+    finished = pyqtSignal(bool, object)  # success, result or error message
+
+    def __init__(self, job: Job, parent=None):
+        super().__init__(parent)
+        self.job = job
+
+    def run(self):
+        try:
+            self.finished.emit(True, self.job.run())
+        except Exception as e:
+            self.finished.emit(False, str(e))
+
+
+def probe_connectivity(host: str, port: int, timeout: float) -> bool:
+    """True if a TCP connection to host:port opens within timeout seconds."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class Scheduler(QObject):
+    """
+    Owns the dashboard's recurring jobs behind a single timer armed for the
+    earliest due job. GUI jobs run on the GUI thread; background and
+    network jobs run on a worker thread each, and a job never overlaps
+    itself. A failed run is retried after retry seconds, doubled per
+    consecutive failure up to max_backoff_seconds. Network job delays are
+    jittered by +/- jitter so head units do not retry in lockstep, and
+    network jobs wait while the system is offline, then run as soon as it
+    is back. Connectivity comes from QNetworkInformation when a backend is
+    available, else from a TCP probe every probe_interval_seconds.
+    """
+    job_finished = pyqtSignal(str, bool)  # name, success
+    connectivity_changed = pyqtSignal(bool)
+
+    def __init__(self, settings: dict, parent=None):
+        super().__init__(parent)
+        self.jitter = max(0.0, min(settings['jitter'], 0.9))
+        self.max_backoff = settings['max_backoff_seconds']
+        self.jobs: Dict[str, Job] = {}
+        self.online = True
+        self._workers: Dict[int, JobWorker] = {}  # id(job) -> its running worker
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        # Coarse timers may fire up to 5% early or late, i.e. 3 s for a minute-aligned job
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._run_due)
+        self._setup_connectivity(settings)
+
+    def add_job(self, name: str, run: Callable[[], Any], interval: float, *, aligned: bool = False,
+                background: bool = False, network: bool = False,
+                on_result: Optional[Callable[[Any], None]] = None,
+                retry: float = 0.0, delay: Optional[float] = None) -> Job:
+        """
+        Run run() every interval seconds, the first time after delay
+        (default: interval). An aligned job runs at the wall-clock multiples
+        of interval, e.g. on every full minute, and ignores delay. A job of
+        the same name is replaced.
+        """
+        job = Job(name, run, interval, aligned=aligned, background=background or network,
+                  network=network, on_result=on_result, retry=retry)
+        if aligned:
+            job.next_run = time.monotonic() + self._until_aligned(interval)
+        else:
+            first = interval if delay is None else delay
+            job.next_run = time.monotonic() + (self._jittered(first) if network else first)
+        self.jobs[name] = job
+        self._arm()
+        return job
+
+    def remove_job(self, job: Job):
+        """Stop scheduling job; a running background run still finishes."""
+        if self.jobs.get(job.name) is job:
+            del self.jobs[job.name]
+            self._arm()
+
+    def run_now(self, job: Job):
+        """Run job as soon as possible (once online, for network jobs)."""
+        if self.jobs.get(job.name) is job and not job.running:
+            job.next_run = time.monotonic()
+            self._arm()
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-job state, run times (ms) and seconds until the next run."""
+        now = time.monotonic()
+        stats = {}
+        for name, job in self.jobs.items():
+            if job.running:
+                state = RUNNING
+            elif job.waiting_network:
+                state = WAITING_NETWORK
+            elif job.consecutive_failures:
+                state = BACKOFF
+            else:
+                state = IDLE
+            stats[name] = {
+                'state': state,
+                'network': job.network,
+                'interval': job.interval,
+                'aligned': job.aligned,
+                'runs': job.runs,
+                'failures': job.failures,
+                'consecutive_failures': job.consecutive_failures,
+                'last_error': job.last_error,
+                'last_run': job.last_run,
+                'last_ms': job.last_duration * 1000,
+                'avg_ms': job.total_duration / job.runs * 1000 if job.runs else 0.0,
+                'max_ms': job.max_duration * 1000,
+                'next_run_in': None if job.running or job.waiting_network else max(0.0, job.next_run - now),
+            }
+        return stats
+
+    def stop(self):
+        """Stop scheduling and wait for running background jobs."""
+        self.timer.stop()
+        self.jobs.clear()
+        for worker in list(self._workers.values()):
+            worker.wait()
+
+    def set_online(self, online: bool):
+        """Record connectivity; coming back online runs waiting network jobs right away."""
+        if online == self.online:
+            return
+        self.online = online
+        if online:
+            now = time.monotonic()
+            for job in self.jobs.values():
+                # Failures while offline say nothing about the server: skip their backoff
+                if job.network and (job.waiting_network or job.consecutive_failures):
+                    job.waiting_network = False
+                    job.next_run = now
+        self.connectivity_changed.emit(online)
+        self._arm()
+
+    def _setup_connectivity(self, settings: dict):
+        if QNetworkInformation.loadBackendByFeatures(QNetworkInformation.Feature.Reachability):
+            info = QNetworkInformation.instance()
+            if info.reachability() != QNetworkInformation.Reachability.Unknown:
+                info.reachabilityChanged.connect(self._on_reachability_changed)
+                self._on_reachability_changed(info.reachability())
+                return
+        host, port = settings['probe_host'], settings['probe_port']
+        self.add_job('connectivity', lambda: probe_connectivity(host, port, 3.0),
+                     settings['probe_interval_seconds'], background=True,
+                     on_result=self.set_online, delay=0)
+
+    def _on_reachability_changed(self, reachability):
+        self.set_online(reachability == QNetworkInformation.Reachability.Online)
+
+    @staticmethod
+    def _until_aligned(interval: float) -> float:
+        return interval - time.time() % interval + ALIGN_SLACK
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _arm(self):
+        due = [job.next_run for job in self.jobs.values()
+               if not job.running and not (job.network and not self.online)]
+        if not due:
+            self.timer.stop()
+            return
+        # Rounded up: a timer armed short of the due time would find nothing due and spin
+        self.timer.start(max(0, math.ceil((min(due) - time.monotonic()) * 1000)))
+
+    def _run_due(self):
+        now = time.monotonic() + TIMER_SLACK
+        for job in list(self.jobs.values()):
+            if job.running or job.next_run > now:
+                continue
+            if job.network and not self.online:
+                job.waiting_network = True
+                continue
+            self._start(job)
+        self._arm()
+
+    def _start(self, job: Job):
+        job.running = True
+        job.waiting_network = False
+        job.last_run = time.time()
+        job._started = time.perf_counter()
+        if job.background:
+            worker = JobWorker(job, self)
+            worker.finished.connect(lambda success, result: self._on_worker_finished(job, success, result))
+            self._workers[id(job)] = worker
+            worker.start()
+            return
+        try:
+            job.run()
+            self._finish(job, True, None)
+        except Exception as e:
+            self._finish(job, False, str(e))
+
+    def _on_worker_finished(self, job: Job, success: bool, result):
+        worker = self._workers.pop(id(job), None)
+        if worker is not None:
+            worker.wait()
+            worker.deleteLater()
+        self._finish(job, success, result)
+
+    def _finish(self, job: Job, success: bool, result):
+        duration = time.perf_counter() - job._started
+        job.running = False
+        job.runs += 1
+        job.last_duration = duration
+        job.total_duration += duration
+        job.max_duration = max(job.max_duration, duration)
+        if success:
+            job.consecutive_failures = 0
+            job.last_error = ''
+            delay = self._until_aligned(job.interval) if job.aligned else job.interval
+            # A removed job's result has no one waiting for it
+            if job.on_result is not None and job.background and self.jobs.get(job.name) is job:
+                try:
+                    job.on_result(result)
+                except Exception as e:
+                    print(f"Scheduled job {job.name} result handler failed: {e}")
+        else:
+            job.failures += 1
+            job.consecutive_failures += 1
+            job.last_error = result
+            print(f"Scheduled job {job.name} failed: {result}")
+            delay = min(self.max_backoff, (job.retry or job.interval) * 2 ** (job.consecutive_failures - 1))
+        job.next_run = time.monotonic() + (self._jittered(delay) if job.network else delay)
+        self.job_finished.emit(job.name, success)
+        self._arm()
+
+
+_scheduler: Optional[Scheduler] = None
+
+
+def get_scheduler() -> Scheduler:
+    """The process-wide Scheduler, configured from settings on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = Scheduler(load_settings()['scheduler'])
+    return _scheduler
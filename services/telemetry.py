@@ -0,0 +1,301 @@
+"""
+CPU and memory telemetry for adas-* containers
+"""
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from services.podman_service import CONTAINER_PREFIX, close_stream, create_podman_client
+
+# History resolutions: (seconds per point, points kept).
+# 2 minutes at 1 s, 30 minutes at 10 s and 4 hours at 1 min.
+RESOLUTIONS = ((1, 120), (10, 180), (60, 240))
+
+# Window over which collector CPU time is compared with the budget (seconds)
+BUDGET_WINDOW = 30.0
+
+# Upper bound for the stats interval when backing off to meet the budget
+MAX_INTERVAL = 16
+
+
+@dataclass
+class StatsSample:
+    """One stats reading for a container"""
+    timestamp: float
+    cpu_percent: float
+    mem_bytes: int
+    mem_limit: int = 0
+
+
+class DownsampledSeries:
+    """
+    Fixed-size ring buffer of (cpu, mem) points at one resolution.
+
+    Samples falling in the same step-aligned bucket are merged: CPU is
+    averaged and memory keeps the peak, so short spikes survive downsampling.
+    """
+
+    def __init__(self, step: int, capacity: int):
+        self.step = step
+        self.points = deque(maxlen=capacity)  # (bucket start, cpu, mem)
+        self._bucket = None
+        self._cpu_sum = 0.0
+        self._count = 0
+        self._mem_max = 0
+
+    def add(self, sample: StatsSample):
+        bucket = int(sample.timestamp // self.step)
+        if bucket != self._bucket:
+            self._flush()
+            self._bucket = bucket
+        self._cpu_sum += sample.cpu_percent
+        self._count += 1
+        self._mem_max = max(self._mem_max, sample.mem_bytes)
+
+    def _flush(self):
+        if self._count:
+            self.points.append((self._bucket * self.step, self._cpu_sum / self._count, self._mem_max))
+        self._cpu_sum = 0.0
+        self._count = 0
+        self._mem_max = 0
+
+    def _current(self) -> list:
+        """Completed points plus the partial bucket in progress."""
+        points = list(self.points)
+        if self._count:
+            points.append((self._bucket * self.step, self._cpu_sum / self._count, self._mem_max))
+        return points[-self.points.maxlen:]
+
+    def cpu_values(self) -> List[float]:
+        return [cpu for _, cpu, _ in self._current()]
+
+    def mem_values(self) -> List[int]:
+        return [mem for _, _, mem in self._current()]
+
+
+class ContainerHistory:
+    """Multi-resolution history and latest sample for one container"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latest: Optional[StatsSample] = None
+        self.series = [DownsampledSeries(step, capacity) for step, capacity in RESOLUTIONS]
+
+    def add(self, sample: StatsSample):
+        self.latest = sample
+        for series in self.series:
+            series.add(sample)
+
+
+class StatsStreamWorker(QThread):
+    """
+    Follows one libpod stats stream covering all requested containers.
+
+    The thread's own CPU time plus the GUI-thread time reported through
+    add_gui_time() is measured against cpu_budget_percent of one core; when
+    over budget the stats interval is doubled (up to MAX_INTERVAL) and the
+    stream reopened, which also lowers the work Podman does for us.
+    """
+    samples = pyqtSignal(object)     # Dict[str, StatsSample]
+    overhead = pyqtSignal(float, int)  # collector CPU percent, current interval
+
+    def __init__(self, names: List[str], interval: int, cpu_budget_percent: float, parent=None):
+        super().__init__(parent)
+        self.names = names
+        self.base_interval = interval
+        self.interval = interval
+        self.cpu_budget = cpu_budget_percent
+        self._response = None
+        self._response_lock = threading.Lock()
+        self._gui_time = 0.0
+        self._gui_time_lock = threading.Lock()
+
+    def add_gui_time(self, seconds: float):
+        """Count CPU time the GUI thread spent handling samples (thread-safe)."""
+        with self._gui_time_lock:
+            self._gui_time += seconds
+
+    def _take_gui_time(self) -> float:
+        with self._gui_time_lock:
+            seconds, self._gui_time = self._gui_time, 0.0
+            return seconds
+
+    def stop(self):
+        self.requestInterruption()
+        with self._response_lock:
+            if self._response is not None:
+                close_stream(self._response)
+
+    def run(self):
+        delay = 2
+        while not self.isInterruptionRequested():
+            try:
+                client = create_podman_client()
+                if self._follow(client):
+                    delay = 2
+                    continue  # Interval changed; reopen immediately
+            except Exception as e:
+                if self.isInterruptionRequested():
+                    break
+                print(f"Container stats stream lost: {e}")
+            for _ in range(delay * 10):
+                if self.isInterruptionRequested():
+                    return
+                self.msleep(100)
+            delay = min(delay * 2, 60)
+
+    def _follow(self, client) -> bool:
+        """Read the stream; True means reopen with a new interval."""
+        response = client.api.get(
+            '/containers/stats',
+            params={'containers': self.names, 'stream': True, 'interval': self.interval},
+            stream=True,
+        )
+        response.raise_for_status()
+        with self._response_lock:
+            self._response = response
+        window_wall = time.monotonic()
+        window_cpu = time.thread_time()
+        self._take_gui_time()
+        try:
+            for line in response.iter_lines():
+                if self.isInterruptionRequested():
+                    return False
+                if not line:
+                    continue
+                batch = self._parse(json.loads(line))
+                if batch:
+                    self.samples.emit(batch)
+
+                elapsed = time.monotonic() - window_wall
+                if elapsed >= BUDGET_WINDOW:
+                    used = (time.thread_time() - window_cpu + self._take_gui_time()) / elapsed * 100
+                    window_wall = time.monotonic()
+                    window_cpu = time.thread_time()
+                    interval = self.interval
+                    if used > self.cpu_budget:
+                        interval = min(interval * 2, MAX_INTERVAL)
+                    elif used < self.cpu_budget / 4:
+                        interval = max(interval // 2, self.base_interval)
+                    self.overhead.emit(used, interval)
+                    if interval != self.interval:
+                        self.interval = interval
+                        return True
+        finally:
+            with self._response_lock:
+                self._response = None
+            response.close()
+        return False
+
+    @staticmethod
+    def _parse(frame: dict) -> Dict[str, StatsSample]:
+        if frame.get('Error'):
+            raise RuntimeError(frame['Error'])
+        now = time.time()
+        batch = {}
+        for stats in frame.get('Stats') or []:
+            name = stats.get('Name', '')
+            if name.startswith(CONTAINER_PREFIX):
+                batch[name] = StatsSample(
+                    now,
+                    float(stats.get('CPU', 0.0)),
+                    int(stats.get('MemUsage', 0)),
+                    int(stats.get('MemLimit', 0)),
+                )
+        return batch
+
+
+class HistoryNotifier(QObject):
+    """Signals new samples for one container's history"""
+    updated = pyqtSignal()
+
+
+class TelemetryCollector(QObject):
+    """
+    Keeps bounded CPU/memory histories for running adas-* containers.
+
+    The set of containers comes from the lifecycle service; the collector
+    only streams while at least one of them is running.
+
+    The CPU budget covers the GUI side too: handling a sample batch, including
+    the card updates it triggers, is timed on the GUI thread and counted with
+    the stream thread. Each container has its own notifier, so a batch only
+    reaches the cards of the containers in it. Repaints that Qt runs later
+    are not counted.
+    """
+
+    def __init__(self, settings: dict, parent=None):
+        super().__init__(parent)
+        self.enabled = settings['enabled']
+        self.interval = max(1, int(settings['interval_seconds']))
+        self.cpu_budget_percent = settings['cpu_budget_percent']
+        self.histories: Dict[str, ContainerHistory] = {}
+        self.overhead_percent = 0.0
+        self.current_interval = self.interval
+        self.worker: Optional[StatsStreamWorker] = None
+        self._names: List[str] = []
+        self._notifiers: Dict[str, HistoryNotifier] = {}
+
+    def history(self, container_name: str) -> Optional[ContainerHistory]:
+        return self.histories.get(container_name)
+
+    def notifier(self, container_name: str) -> HistoryNotifier:
+        """The notifier whose updated() fires when this container's history gets samples."""
+        notifier = self._notifiers.get(container_name)
+        if notifier is None:
+            notifier = self._notifiers[container_name] = HistoryNotifier(self)
+        return notifier
+
+    def set_containers(self, names: Iterable[str]):
+        """Stream stats for exactly these containers (restarting if the set changed)."""
+        names = sorted(names)
+        if not self.enabled or names == self._names:
+            return
+        self._names = names
+        self._stop_worker()
+        if not names:
+            return
+        self.worker = StatsStreamWorker(names, self.interval, self.cpu_budget_percent, self)
+        self.worker.samples.connect(self._on_samples)
+        self.worker.overhead.connect(self._on_overhead)
+        self.worker.start()
+
+    def forget(self, container_name: str):
+        """Drop the history of a removed container."""
+        self.histories.pop(container_name, None)
+
+    def stop(self):
+        self.enabled = False
+        self._stop_worker()
+
+    def _stop_worker(self):
+        if self.worker is not None:
+            worker = self.worker
+            self.worker = None
+            worker.samples.disconnect(self._on_samples)
+            worker.stop()
+            worker.wait()
+            worker.deleteLater()
+
+    def _on_samples(self, batch: dict):
+        started = time.thread_time()
+        for name, sample in batch.items():
+            history = self.histories.get(name)
+            if history is None:
+                history = self.histories[name] = ContainerHistory(name)
+            history.add(sample)
+            notifier = self._notifiers.get(name)
+            if notifier is not None:
+                notifier.updated.emit()
+        if self.worker is not None:
+            self.worker.add_gui_time(time.thread_time() - started)
+
+    def _on_overhead(self, percent: float, interval: int):
+        self.overhead_percent = percent
+        self.current_interval = interval
+        if percent > self.cpu_budget_percent:
+            print(f"Telemetry over CPU budget ({percent:.2f}% > {self.cpu_budget_percent}%), "
+                  f"stats interval now {interval}s")
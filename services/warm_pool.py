@@ -0,0 +1,144 @@
+"""
+Warm-start pool for installed ADAS apps
+"""
+import statistics
+import time
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QObject, pyqtSignal
+from services.container_lifecycle import ContainerLifecycleService, RUNNING
+from utils.file_utils import load_start_latency
+
+# Pool policies when max_running apps are already up
+LRU = 'lru'        # Stop (or checkpoint) the app that has been running longest
+REJECT = 'reject'  # Refuse the start
+
+
+def summarize_start_latency(image_name: str, latency: Optional[dict] = None) -> Dict[str, float]:
+    """Median start time in milliseconds per kind ('cold', 'warm', 'restore') for an app."""
+    latency = load_start_latency() if latency is None else latency
+    return {
+        kind: statistics.median(samples) * 1000
+        for kind, samples in latency.get(image_name, {}).items() if samples
+    }
+
+
+class WarmPool(QObject):
+    """
+    Starts and stops app containers for the store cards.
+
+    In warm pool mode installs only create the container (see
+    run_app_container), so starting an app is a single start request, or a
+    restore when checkpoints are enabled and the app was stopped with one.
+    At most max_running pool apps run at once. Starting another one either
+    first stops the one running longest ('lru') or is refused ('reject').
+    Checkpointing falls back to a plain stop the first time Podman
+    reports it unsupported.
+
+    With the mode off, starts and stops go straight to the lifecycle service.
+    Cold, warm and restore start times are recorded either way, in
+    resources/start_latency.json; stops made to stay under the cap are
+    counted in stats().
+    """
+    start_rejected = pyqtSignal(str, str)  # container name, reason
+
+    def __init__(self, lifecycle: ContainerLifecycleService, settings: dict, parent=None):
+        super().__init__(parent)
+        self.lifecycle = lifecycle
+        self.enabled = settings['enabled']
+        self.max_running = max(1, int(settings['max_running']))
+        self.policy = settings['policy']
+        self.use_checkpoints = settings['checkpoint']
+        self.checkpoint_supported = True
+        self._running_since: Dict[str, float] = {}  # container name -> monotonic time
+        self._start_after: Dict[str, str] = {}      # container being parked -> container to start
+        self._latency: Dict[str, Dict[str, float]] = {}  # image name -> summarize_start_latency()
+        self.evictions = 0   # Apps stopped to make room for a start
+        self.cap_stops = 0   # Apps stopped because one started outside the dashboard
+        lifecycle.container_changed.connect(self._on_container_changed)
+        lifecycle.action_finished.connect(self._on_action_finished)
+        lifecycle.container_started.connect(self._on_container_started)
+
+    def start(self, container_name: str) -> bool:
+        """Start an app, making room under max_running first if needed."""
+        if not self.enabled:
+            return self.lifecycle.start_container(container_name)
+        running = self._running_apps(exclude=container_name)
+        if len(running) < self.max_running:
+            return self.lifecycle.start_container(container_name)
+        if self.policy == REJECT:
+            self.start_rejected.emit(container_name, f"{self.max_running} apps already running")
+            return False
+        # Start only once the oldest app is down, so the two never run together
+        oldest = running[0]
+        if not self.stop(oldest):
+            return False
+        self.evictions += 1
+        self._start_after[oldest] = container_name
+        return True
+
+    def stop(self, container_name: str) -> bool:
+        """Stop an app, with a checkpoint when enabled and supported."""
+        if self.enabled and self.use_checkpoints and self.checkpoint_supported:
+            return self.lifecycle.checkpoint_container(container_name)
+        return self.lifecycle.stop_container(container_name)
+
+    def is_pending(self, container_name: str) -> bool:
+        """True while the container waits for another app to stop."""
+        return container_name in self._start_after.values()
+
+    def start_latency(self, image_name: str) -> Dict[str, float]:
+        """Median start times in ms per kind for an app (cached)."""
+        if image_name not in self._latency:
+            self._latency[image_name] = summarize_start_latency(image_name)
+        return self._latency[image_name]
+
+    def stats(self) -> dict:
+        return {
+            'enabled': self.enabled,
+            'policy': self.policy,
+            'running': len(self._running_apps()),
+            'max_running': self.max_running,
+            'pending_starts': len(self._start_after),
+            'evictions': self.evictions,
+            'cap_stops': self.cap_stops,
+            'checkpoint_supported': self.checkpoint_supported,
+        }
+
+    def _running_apps(self, exclude: str = '') -> List[str]:
+        """Running containers other than exclude, longest running first."""
+        names = [
+            name for name, info in self.lifecycle.containers.items()
+            if info.status == RUNNING and name != exclude and not self.lifecycle.is_busy(name)
+        ]
+        return sorted(names, key=lambda name: self._running_since.get(name, 0.0))
+
+    def _on_container_changed(self, container_name: str, info):
+        if info.status != RUNNING:
+            self._running_since.pop(container_name, None)
+            return
+        self._running_since.setdefault(container_name, time.monotonic())
+        # Apps started outside the dashboard count against the cap too
+        if self.enabled and self.policy == LRU and not self._start_after:
+            running = self._running_apps(exclude=container_name)
+            if len(running) >= self.max_running and self.stop(running[0]):
+                self.cap_stops += 1
+
+    def _on_action_finished(self, container_name: str, action: str, success: bool, message: str):
+        if action == 'checkpoint' and not success:
+            print(f"Checkpoint failed for {container_name} ({message}); stopping without one")
+            self.checkpoint_supported = False
+            if self.lifecycle.stop_container(container_name):
+                return  # The pending start follows the plain stop
+        waiting = self._start_after.pop(container_name, None)
+        if waiting is None or action not in ('stop', 'checkpoint'):
+            return
+        if success:
+            self.lifecycle.start_container(waiting)
+        else:
+            self.start_rejected.emit(waiting, f"Could not stop {container_name} to make room")
+
+    def _on_container_started(self, container_name: str, kind: str, seconds: float):
+        # The lifecycle service has recorded the sample; drop the stale medians
+        info = self.lifecycle.get(container_name)
+        if info is not None and info.image:
+            self._latency.pop(info.image_name, None)
@@ -0,0 +1,78 @@
+"""
+Shared current-weather data: one background fetch per TTL for every widget
+"""
+import time
+from typing import Callable, Optional
+from PyQt6.QtCore import QObject, pyqtSignal
+from services.scheduler import get_scheduler
+from utils.file_utils import load_weather_snapshot, save_weather_snapshot
+from utils.weather import fetch_current_weather
+
+
+class WeatherService(QObject):
+    """
+    Holds the current weather for weather.location and refetches it once it
+    is ttl_seconds old, as a network job of the scheduler: off the GUI
+    thread, paused while offline and backed off from retry_seconds after a
+    failed fetch. Widgets subscribe() and get the cached data right away,
+    then every update; re-rendering for a theme change never fetches. The
+    last snapshot is kept on disk, so the dashboard shows weather at
+    startup before the first fetch completes.
+    """
+    weather_changed = pyqtSignal(object)  # The API's "current" block
+
+    def __init__(self, settings: dict, parent=None):
+        super().__init__(parent)
+        self.location = settings['location']
+        self.ttl = max(60, settings['ttl_seconds'])
+        self.current: Optional[dict] = None
+        self.fetched_at = 0.0
+
+        snapshot = load_weather_snapshot()
+        if snapshot and snapshot.get('location') == self.location and snapshot.get('current'):
+            self.current = snapshot['current']
+            self.fetched_at = snapshot.get('fetched_at', 0.0)
+
+        # First fetch once the snapshot expires (right away if there is none)
+        self.job = get_scheduler().add_job(
+            'weather', self._fetch, self.ttl, network=True, on_result=self._on_fetched,
+            retry=settings['retry_seconds'], delay=max(0.0, self.fetched_at + self.ttl - time.time()),
+        )
+
+    def is_fresh(self) -> bool:
+        return self.current is not None and time.time() - self.fetched_at < self.ttl
+
+    def subscribe(self, callback: Callable[[dict], None]):
+        """Call callback with the cached weather now, if any, and on every update."""
+        self.weather_changed.connect(callback)
+        if self.current is not None:
+            callback(self.current)
+
+    def refresh(self, force: bool = False):
+        """Fetch as soon as possible unless the data is still fresh."""
+        if force or not self.is_fresh():
+            get_scheduler().run_now(self.job)
+
+    def stop(self):
+        """Stop periodic fetches."""
+        get_scheduler().remove_job(self.job)
+
+    def _fetch(self) -> dict:
+        # Worker thread
+        data = fetch_current_weather(self.location)
+        if not data or 'current' not in data:
+            raise RuntimeError(f"no weather data for {self.location}")
+        return data['current']
+
+    def _on_fetched(self, current: dict):
+        self.current = current
+        self.fetched_at = time.time()
+        try:
+            save_weather_snapshot({
+                'location': self.location,
+                'fetched_at': self.fetched_at,
+                'current': self.current,
+            })
+        except Exception as e:
+            print(f"Failed to cache weather snapshot: {e}")
+        self.weather_changed.emit(self.current)
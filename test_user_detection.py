@@ -2,10 +2,31 @@
 """
 Test script to verify user ID detection and Podman socket path resolution.
 This helps debug issues with different user IDs on different machines.
+
+    python test_user_detection.py            # socket detection report
+    python test_user_detection.py probe      # Podman performance probe (JSON)
+
+The probe measures socket connect and ping latency, image list/inspect
+latency with many images present, pull throughput from a registry, and
+container create/start/stop/remove times. Its JSON report can be compared
+against one from another head-unit build with --baseline to catch Podman
+regressions; the exit code is 2 when anything got slower than --tolerance.
 """
 
+import argparse
+import contextlib
+import hashlib
+import io
+import json
 import os
+import platform
+import socket
+import statistics
 import sys
+import tarfile
+import tempfile
+import time
+from urllib.parse import quote
 
 def test_user_detection():
     """Test and display current user information and Podman socket detection."""
@@ -60,5 +81,581 @@ def test_user_detection():
     except Exception as e:
         print(f"✗ Error testing Podman service: {e}")
 
+
+
+# Bumped when report fields change meaning, so old baselines are not compared
+PROBE_VERSION = 1
+
+# Probe containers and images; not 'adas-' so the dashboard never lists them
+PROBE_CONTAINER_PREFIX = 'probe-'
+PROBE_REPOSITORY = 'localhost/adas-probe'
+
+
+def _summarize(samples):
+    """Millisecond statistics for a list of durations in seconds."""
+    if not samples:
+        return {'n': 0}
+    ms = sorted(sample * 1000 for sample in samples)
+    return {
+        'n': len(ms),
+        'min_ms': round(ms[0], 3),
+        'median_ms': round(statistics.median(ms), 3),
+        'p95_ms': round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        'max_ms': round(ms[-1], 3),
+    }
+
+
+def _timed(action):
+    """(seconds, result) of calling action()."""
+    started = time.perf_counter()
+    result = action()
+    return time.perf_counter() - started, result
+
+
+def probe_socket(client, socket_file, iterations):
+    """Raw Unix socket connect time, first ping and keep-alive ping latency."""
+    connects = []
+    for _ in range(iterations):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            seconds, _ = _timed(lambda: sock.connect(socket_file))
+        finally:
+            sock.close()
+        connects.append(seconds)
+
+    pings = []
+    api_version = ''
+    for _ in range(iterations + 1):
+        seconds, response = _timed(lambda: client.api.get('/_ping'))
+        response.raise_for_status()
+        api_version = response.headers.get('Libpod-API-Version', api_version)
+        pings.append(seconds)
+    return {
+        'api_version': api_version,
+        'connect': _summarize(connects),
+        'first_ping_ms': round(pings[0] * 1000, 3),
+        'ping': _summarize(pings[1:]),
+    }
+
+
+def make_probe_archive(count, seed):
+    """
+    A docker-archive holding count tiny distinct images named
+    PROBE_REPOSITORY-<i>. Each has one layer with a single file, so Podman
+    can load it without a registry. Returns (archive bytes, image names).
+    """
+    buffer = io.BytesIO()
+
+    def add(archive, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = 0
+        archive.addfile(info, io.BytesIO(data))
+
+    names = []
+    manifest = []
+    with tarfile.open(fileobj=buffer, mode='w') as archive:
+        for i in range(count):
+            layer_buffer = io.BytesIO()
+            with tarfile.open(fileobj=layer_buffer, mode='w') as layer:
+                add(layer, 'probe', f'{seed}-{i}\n'.encode('utf-8'))
+            layer_data = layer_buffer.getvalue()
+            diff_id = hashlib.sha256(layer_data).hexdigest()
+            add(archive, f'{diff_id}/layer.tar', layer_data)
+            config = json.dumps({
+                'architecture': 'amd64',
+                'os': 'linux',
+                'config': {'Cmd': ['/probe']},
+                'rootfs': {'type': 'layers', 'diff_ids': [f'sha256:{diff_id}']},
+            }).encode('utf-8')
+            config_id = hashlib.sha256(config).hexdigest()
+            add(archive, f'{config_id}.json', config)
+            name = f'{PROBE_REPOSITORY}-{i}:latest'
+            names.append(name)
+            manifest.append({
+                'Config': f'{config_id}.json',
+                'RepoTags': [name],
+                'Layers': [f'{diff_id}/layer.tar'],
+            })
+        add(archive, 'manifest.json', json.dumps(manifest).encode('utf-8'))
+    return buffer.getvalue(), names
+
+
+def probe_images(client, count, iterations):
+    """
+    Image list latency before and after loading count probe images, and
+    inspect latency with them present. The probe images are removed again.
+    """
+    def list_images():
+        response = client.api.get('/images/json')
+        response.raise_for_status()
+        return response.json()
+
+    before = []
+    for _ in range(iterations):
+        seconds, images = _timed(list_images)
+        before.append(seconds)
+    result = {'images_before': len(images), 'images_added': count, 'list_before': _summarize(before)}
+    if not count:
+        return result
+
+    archive, names = make_probe_archive(count, os.getpid())
+    try:
+        seconds, response = _timed(lambda: client.api.post(
+            '/images/load', data=archive, headers={'Content-Type': 'application/x-tar'}
+        ))
+        response.raise_for_status()
+        result['load_ms'] = round(seconds * 1000, 3)
+
+        after = []
+        for _ in range(iterations):
+            seconds, images = _timed(list_images)
+            after.append(seconds)
+        result['images_after'] = len(images)
+        result['list'] = _summarize(after)
+
+        inspects = []
+        for i in range(iterations):
+            name = names[i % len(names)]
+            seconds, response = _timed(lambda: client.api.get(f'/images/{quote(name, safe="")}/json'))
+            response.raise_for_status()
+            inspects.append(seconds)
+        result['inspect'] = _summarize(inspects)
+    finally:
+        removes = []
+        for name in names:
+            try:
+                seconds, response = _timed(lambda: client.api.delete(f'/images/{quote(name, safe="")}'))
+                if response.ok:
+                    removes.append(seconds)
+            except Exception as e:
+                print(f"Failed to remove probe image {name}: {e}", file=sys.stderr)
+        result['remove'] = _summarize(removes)
+    return result
+
+
+def probe_pull(client, registry, image, fresh):
+    """
+    Pull image from registry and measure time to first byte and download
+    throughput. An image already present only re-checks its layers, so
+    fresh removes it first (never forced; images in use are kept).
+    Returns (result, reference, whether the probe pulled it).
+    """
+    from services.podman_service import pull_image_streaming, split_image_reference
+
+    repository, tag = split_image_reference(image)
+    reference = f'{registry}/{repository}:{tag}'
+    present = client.images.exists(reference)
+    if present and fresh:
+        client.images.remove(reference)
+        present = False
+
+    first_event = []
+
+    def stop_requested():
+        # Polled once per stream event, so the first call marks the first byte
+        if not first_event:
+            first_event.append(time.perf_counter())
+        return False
+
+    started = time.perf_counter()
+    tracker = pull_image_streaming(client, reference, image, should_stop=stop_requested, record_stats=False)
+    finished = time.perf_counter()
+    first_byte = (first_event[0] if first_event else finished) - started
+    download_seconds = max(finished - started - first_byte, 1e-6)
+    result = {
+        'registry': registry,
+        'reference': reference,
+        'already_present': present,
+        'seconds': round(finished - started, 3),
+        'first_byte_ms': round(first_byte * 1000, 3),
+        'layers': len(tracker.layers),
+        'cached_layers': sum(1 for layer in tracker.layers.values() if layer.cached),
+        'downloaded_bytes': tracker.downloaded_bytes,
+        'mb_per_second': round(tracker.downloaded_bytes / download_seconds / (1024 * 1024), 3),
+    }
+    return result, reference, not present
+
+
+def probe_containers(client, image, iterations, stop_timeout):
+    """Create, start, stop and remove times of throwaway containers from image."""
+    times = {'create': [], 'start': [], 'stop': [], 'remove': []}
+    names = [f'{PROBE_CONTAINER_PREFIX}{os.getpid()}-{i}' for i in range(iterations)]
+    try:
+        for name in names:
+            seconds, container = _timed(lambda: client.containers.create(
+                image, command=['sleep', 'infinity'], name=name
+            ))
+            times['create'].append(seconds)
+            times['start'].append(_timed(container.start)[0])
+            times['stop'].append(_timed(lambda: container.stop(timeout=stop_timeout))[0])
+            times['remove'].append(_timed(lambda: container.remove(force=True))[0])
+    finally:
+        for name in names:
+            try:
+                if client.containers.exists(name):
+                    client.containers.get(name).remove(force=True)
+            except Exception as e:
+                print(f"Failed to remove probe container {name}: {e}", file=sys.stderr)
+    result = {name: _summarize(samples) for name, samples in times.items()}
+    result['image'] = image
+    result['stop_timeout'] = stop_timeout
+    return result
+
+
+def _metrics(report, path=''):
+    """{'results.socket.ping.median_ms': value, ...} for comparable numbers."""
+    metrics = {}
+    for key, value in report.items():
+        name = f'{path}.{key}' if path else key
+        if isinstance(value, dict):
+            metrics.update(_metrics(value, name))
+        elif key in ('median_ms', 'first_ping_ms', 'first_byte_ms', 'load_ms', 'mb_per_second') \
+                and isinstance(value, (int, float)):
+            metrics[name] = value
+    return metrics
+
+
+def compare_reports(report, baseline, tolerance):
+    """
+    Metrics that got worse than baseline by more than tolerance (a
+    fraction): slower times, or lower throughput for mb_per_second.
+    """
+    current = _metrics(report['results'], 'results')
+    regressions = []
+    for name, old in _metrics(baseline.get('results', {}), 'results').items():
+        new = current.get(name)
+        if new is None or not old:
+            continue
+        higher_is_better = name.endswith('mb_per_second')
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > tolerance:
+            regressions.append({
+                'metric': name, 'baseline': old, 'current': new, 'change': round(change, 3),
+            })
+    return regressions
+
+
+def run_probe(args):
+    """Run the selected probe phases and return the JSON report."""
+    from services.podman_service import create_podman_client, get_podman_socket_path
+    from utils.file_utils import load_settings
+
+    socket_path = get_podman_socket_path()
+    report = {
+        'probe_version': PROBE_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'host': {
+            'hostname': socket.gethostname(),
+            'kernel': platform.release(),
+            'machine': platform.machine(),
+            'python': platform.python_version(),
+            'uid': os.getuid(),
+        },
+        'socket': socket_path,
+        'fake': args.fake,
+        'settings': {
+            'iterations': args.iterations,
+            'images': args.images,
+            'stop_timeout': args.stop_timeout,
+        },
+        'results': {},
+        'errors': {},
+    }
+    if not socket_path:
+        report['errors']['socket'] = 'Podman socket not available'
+        return report
+    try:
+        client = create_podman_client()
+    except Exception as e:
+        report['errors']['socket'] = str(e)
+        return report
+
+    def phase(name, action):
+        try:
+            return action()
+        except Exception as e:
+            report['errors'][name] = f'{type(e).__name__}: {e}'
+            return None
+
+    results = report['results']
+    results['socket'] = phase('socket', lambda: probe_socket(
+        client, socket_path[len('unix://'):], args.iterations
+    ))
+    if not args.skip_images:
+        results['images'] = phase('images', lambda: probe_images(client, args.images, args.iterations))
+
+    registry = args.registry or load_settings()['registries']['upstream']
+    container_image = f'{registry}/{args.pull_image}'
+    pulled = False
+    if not args.skip_pull:
+        pull = phase('pull', lambda: probe_pull(client, registry, args.pull_image, args.fresh_pull))
+        if pull is not None:
+            results['pull'], container_image, pulled = pull
+    try:
+        if not args.skip_containers:
+            results['containers'] = phase('containers', lambda: probe_containers(
+                client, container_image, args.iterations, args.stop_timeout
+            ))
+    finally:
+        if pulled and not args.keep_image:
+            phase('cleanup', lambda: client.images.remove(container_image))
+    results = {name: value for name, value in results.items() if value is not None}
+    report['results'] = results
+    return report
+
+
+# Stand-in app for the stress test with --fake; fake_podman burns real CPU while it runs
+STRESS_HOG_IMAGE = 'adas/cpu-hog'
+
+# Target frame interval of the dashboard under test (60 Hz)
+FRAME_INTERVAL_MS = 16
+
+
+def _measure_dashboard(app, dashboard, alert_service, results_path, seconds):
+    """
+    Drive the dashboard for seconds: repaint it every FRAME_INTERVAL_MS and
+    record how late each frame came and how long painting took, and raise a
+    drowsiness alert every half second and record how long it took the
+    alert dialog to appear, from the results file write.
+    """
+    from PyQt6.QtCore import QEventLoop, Qt, QTimer
+
+    intervals, paints, alerts = [], [], []
+    state = {'last_tick': None, 'triggered': None, 'next_alert': time.perf_counter() + 0.5, 'missed': 0}
+
+    def write_results(drowsy):
+        with open(results_path, 'w') as f:
+            json.dump({'drowsy': drowsy, 'distracted': False, 'yawning': False}, f)
+
+    def on_alert_checked():
+        # Runs right after AlertService.update_alert for the same debounce timeout
+        if state['triggered'] is not None and alert_service.dialog is not None:
+            alerts.append(time.perf_counter() - state['triggered'])
+            state['triggered'] = None
+            write_results(False)
+
+    def tick():
+        now = time.perf_counter()
+        if state['last_tick'] is not None:
+            intervals.append(now - state['last_tick'])
+        state['last_tick'] = now
+        paints.append(_timed(dashboard.repaint)[0])
+        if state['triggered'] is not None and now - state['triggered'] > 2.0:
+            state['missed'] += 1
+            state['triggered'] = None
+            write_results(False)
+        elif state['triggered'] is None and alert_service.dialog is None and now >= state['next_alert']:
+            state['triggered'] = time.perf_counter()
+            state['next_alert'] = now + 0.5
+            write_results(True)
+
+    alert_service.debounce_timer.timeout.connect(on_alert_checked)
+    timer = QTimer()
+    timer.setTimerType(Qt.TimerType.PreciseTimer)
+    timer.setInterval(FRAME_INTERVAL_MS)
+    timer.timeout.connect(tick)
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    timer.start()
+    loop.exec()
+    timer.stop()
+    alert_service.debounce_timer.timeout.disconnect(on_alert_checked)
+    write_results(False)
+    app.processEvents()
+    return {
+        'frame_interval': _summarize(intervals),
+        'paint': _summarize(paints),
+        'alert_latency': _summarize(alerts),
+        'alerts_missed': state['missed'],
+    }
+
+
+def run_stress(args):
+    """
+    Measure dashboard frame timing and alert latency while a CPU-hog app
+    runs: with no app, with the hog unlimited, and with the hog under the
+    configured resource limits. Only the last phase is checked against the
+    budgets. Against Podman, args.hog_image must be present and burn CPU
+    when started; with args.fake it runs on fake_podman, which only
+    emulates the limits.
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from services.alert_service import AlertService
+    from services.podman_service import container_name_for, create_podman_client, run_app_container
+    from services.resource_limits import ResourceLimits, resolve_limits
+    from ui.components import Dashboard
+    from utils.file_utils import load_features
+
+    limits = resolve_limits(json.loads(args.limits) if args.limits else None)
+    report = {
+        'probe_version': PROBE_VERSION,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'host': {'cpus': os.cpu_count(), 'kernel': platform.release(), 'machine': platform.machine()},
+        'backend': 'fake_podman' if args.fake else 'podman',
+        'hog': {'image': args.hog_image,
+                'processes': (args.hog_processes or 4 * (os.cpu_count() or 1)) if args.fake else None},
+        'limits': limits.create_kwargs(),
+        'budget': {'frame_interval_p95_ms': args.frame_budget_ms, 'alert_latency_p95_ms': args.alert_budget_ms},
+        'phases': {},
+        'errors': {},
+    }
+    if limits.is_unlimited:
+        report['errors']['limits'] = 'resource_limits are disabled or empty; nothing to verify'
+    try:
+        client = create_podman_client()
+        client.images.get(args.hog_image)
+    except Exception as e:
+        report['errors']['podman'] = str(e)
+        return report
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results_path = os.path.join(tempfile.mkdtemp(prefix='adas-stress-'), 'results.json')
+    with open(results_path, 'w') as f:
+        json.dump({'drowsy': False, 'distracted': False, 'yawning': False}, f)
+    dashboard = Dashboard(load_features(), set())
+    dashboard.show()
+    alert_service = AlertService(results_path, dashboard)
+    container_name = container_name_for(args.hog_image)
+    try:
+        for phase, phase_limits in (('idle', None), ('unlimited', ResourceLimits()), ('limited', limits)):
+            if phase_limits is not None:
+                run_app_container(client, args.hog_image, True, phase_limits)
+            result = _measure_dashboard(app, dashboard, alert_service, results_path, args.seconds)
+            if phase_limits is not None:
+                result['host_config'] = client.containers.get(container_name).attrs['HostConfig']
+                client.containers.get(container_name).remove(force=True)
+            report['phases'][phase] = result
+    finally:
+        if client.containers.exists(container_name):
+            client.containers.get(container_name).remove(force=True)
+        if alert_service.dialog is not None:
+            alert_service.dialog.close()
+        dashboard.close()
+        app.processEvents()
+
+    limited = report['phases']['limited']
+    frame_p95 = limited['frame_interval'].get('p95_ms', 0)
+    alert_p95 = limited['alert_latency'].get('p95_ms', float('inf'))
+    report['within_budget'] = (
+        frame_p95 <= args.frame_budget_ms and alert_p95 <= args.alert_budget_ms
+        and not limited['alerts_missed']
+    )
+    return report
+
+
+def _start_fake_server(config_path=None, overrides=None):
+    """Serve fake_podman in-process on a temporary socket and point the probe at it."""
+    from fake_podman import FakePodmanServer, merge_config
+
+    config = {}
+    if config_path:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+    config = merge_config(overrides or {}, config)
+    socket_file = os.path.join(tempfile.mkdtemp(prefix='adas-probe-'), 'podman.sock')
+    server = FakePodmanServer(socket_file, config)
+    server.start_background()
+    os.environ['PODMAN_SOCKET_PATH'] = socket_file
+    return server
+
+
+def _write_report(report, output):
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+    print(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Podman socket detection and performance probe')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('detect', help='Show user and Podman socket detection (default)')
+    probe = commands.add_parser('probe', help='Benchmark the Podman API and print a JSON report')
+    probe.add_argument('--iterations', type=int, default=10, help='Samples per measurement')
+    probe.add_argument('--images', type=int, default=50,
+                       help='Probe images loaded while timing image list/inspect')
+    probe.add_argument('--registry', help='Registry to pull from (default: registries.upstream setting)')
+    probe.add_argument('--pull-image', default='library/busybox:latest',
+                       help='Image pulled for throughput and used for the container timings')
+    probe.add_argument('--fresh-pull', action='store_true',
+                       help='Remove the image first if present, so every layer is downloaded')
+    probe.add_argument('--keep-image', action='store_true', help='Keep the pulled image afterwards')
+    probe.add_argument('--stop-timeout', type=int, default=0,
+                       help='Seconds Podman waits after SIGTERM before killing a probe container')
+    probe.add_argument('--skip-images', action='store_true')
+    probe.add_argument('--skip-pull', action='store_true')
+    probe.add_argument('--skip-containers', action='store_true')
+    probe.add_argument('--fake', action='store_true', help='Probe an in-process fake_podman server')
+    probe.add_argument('--fake-config', help='JSON config for the fake server (see fake_podman.py)')
+    probe.add_argument('--output', help='Also write the report to this file')
+    probe.add_argument('--baseline', help='Earlier report to compare against')
+    probe.add_argument('--tolerance', type=float, default=0.25,
+                       help='Allowed slowdown against the baseline, as a fraction (default 0.25)')
+    stress = commands.add_parser('stress', help='Dashboard frame timing and alert latency next to a '
+                                                'CPU-hog app on Podman (JSON report)')
+    stress.add_argument('--seconds', type=float, default=5.0, help='Duration of each phase')
+    stress.add_argument('--hog-image', default=STRESS_HOG_IMAGE,
+                        help='Local image whose container burns CPU when started')
+    stress.add_argument('--fake', action='store_true',
+                        help='Run on an in-process fake_podman, which only emulates the limits')
+    stress.add_argument('--hog-processes', type=int, default=0,
+                        help='Busy processes in the fake hog container (default: four per core)')
+    stress.add_argument('--limits', help='Catalog-style "resources" JSON applied over the default policy')
+    stress.add_argument('--frame-budget-ms', type=float, default=33.0,
+                        help='Allowed p95 frame interval with the hog limited')
+    stress.add_argument('--alert-budget-ms', type=float, default=250.0,
+                        help='Allowed p95 alert latency with the hog limited')
+    stress.add_argument('--fake-config', help='JSON config for the fake server (see fake_podman.py)')
+    stress.add_argument('--output', help='Also write the report to this file')
+    args = parser.parse_args(argv)
+
+    if args.command == 'stress':
+        server = _start_fake_server(args.fake_config, {
+            'preloaded_images': [args.hog_image],
+            'cpu_hog': {'images': [args.hog_image], 'processes': args.hog_processes},
+        }) if args.fake else None
+        try:
+            # Keep the dashboard's own prints out of the JSON on stdout
+            with contextlib.redirect_stdout(sys.stderr):
+                report = run_stress(args)
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+        _write_report(report, args.output)
+        if report['errors']:
+            return 1
+        return 0 if report['within_budget'] else 2
+
+    if args.command != 'probe':
+        test_user_detection()
+        return 0
+
+    args.iterations = max(1, args.iterations)
+    server = _start_fake_server(args.fake_config) if args.fake else None
+    try:
+        report = run_probe(args)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    status = 1 if report['errors'] else 0
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get('probe_version') != PROBE_VERSION:
+            report['errors']['baseline'] = f"probe_version {baseline.get('probe_version')} is not comparable"
+        else:
+            report['regressions'] = compare_reports(report, baseline, args.tolerance)
+            if report['regressions']:
+                status = 2
+    _write_report(report, args.output)
+    return status
+
+
 if __name__ == "__main__":
-    test_user_detection() 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Shared fixtures: an isolated resources/ directory and an in-process fake_podman
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture
+def resources_dir(tmp_path, monkeypatch):
+    """Run from an empty directory so settings are the defaults and state files stay out of the tree."""
+    import services.registry_mirrors as registry_mirrors
+
+    (tmp_path / 'resources').mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(registry_mirrors, '_registry_mirrors', None)
+    return tmp_path / 'resources'
+
+
+@pytest.fixture
+def fake_podman(tmp_path, monkeypatch, resources_dir):
+    """Start a fake_podman server with the given config and point the services at it."""
+    from fake_podman import FakePodmanServer
+
+    servers = []
+
+    def start(config=None):
+        socket_file = str(tmp_path / f'podman-{len(servers)}.sock')
+        server = FakePodmanServer(socket_file, config)
+        server.start_background()
+        servers.append(server)
+        monkeypatch.setenv('PODMAN_SOCKET_PATH', socket_file)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,65 @@
+"""
+Batch install planning against layers already on disk
+"""
+from services.batch_install import BatchInstallWorker, fetch_image_layers, fetch_local_layers, plan_batch
+from services.podman_service import create_podman_client
+
+MB = 1024 * 1024
+
+
+def test_plan_without_local_layers_fetches_shared_layers_once():
+    manifests = {
+        'adas/a': [('base', 28 * MB), ('a', 12 * MB)],
+        'adas/b': [('base', 28 * MB), ('b', 4 * MB)],
+    }
+    plan = plan_batch(manifests)
+    assert plan.groups == [['adas/a', 'adas/b']]
+    assert plan.planned_bytes == 44 * MB
+    assert plan.naive_bytes == 44 * MB
+    assert plan.bytes_saved == 0
+
+
+def test_plan_skips_local_layers():
+    manifests = {
+        'adas/a': [('base', 28 * MB), ('a', 12 * MB)],
+        'adas/b': [('base', 28 * MB), ('b', 4 * MB)],
+    }
+    plan = plan_batch(manifests, local_layers={'base'})
+    # Nothing missing is shared any more, so the images pull independently
+    assert sorted(plan.groups) == [['adas/a'], ['adas/b']]
+    assert plan.planned_bytes == 16 * MB
+    assert plan.naive_bytes == 16 * MB
+
+
+def test_batch_with_preinstalled_image(fake_podman):
+    fake_podman({
+        'pull_rate_mbps': 2000,
+        'progress_interval_ms': 1,
+        'preloaded_images': ['adas/voice-assistant'],
+    })
+    worker = BatchInstallWorker(['adas/lane-detection', 'adas/cruise-control'])
+    plans, reports = [], []
+    worker.plan_ready.connect(plans.append)
+    worker.finished.connect(reports.append)
+    worker.run()
+
+    plan, report = plans[0], reports[0]
+    # The shared 28 MB base layer is already on disk; only 12 + 4 MB per app is missing
+    assert plan.planned_bytes == 32 * MB
+    assert plan.naive_bytes == 32 * MB
+    assert sorted(report.succeeded) == ['adas/cruise-control', 'adas/lane-detection']
+    assert report.downloaded_bytes == 32 * MB
+    assert report.bytes_saved == 0
+    assert 'saved' not in report.describe()
+
+
+def test_local_layers_are_manifest_digests_not_diff_ids(fake_podman):
+    fake_podman({'preloaded_images': ['adas/voice-assistant']})
+    client = create_podman_client()
+    images = client.images.list()
+    local = fetch_local_layers(client, images)
+
+    lane = {digest for digest, _ in fetch_image_layers(client, 'adas/lane-detection')}
+    diff_ids = set(client.images.get('adas/voice-assistant').attrs['RootFS']['Layers'])
+    assert len(local & lane) == 1  # The shared base layer
+    assert not diff_ids & lane
@@ -0,0 +1,26 @@
+"""
+Container state table updates from Podman events
+"""
+from types import SimpleNamespace
+
+from services.container_lifecycle import EXITED, ContainerInfo, ContainerLifecycleService
+
+
+def test_user_stop_stays_a_stop_when_trailing_event_arrives_late():
+    service = ContainerLifecycleService()
+    service._actions['adas-lane-detection'] = SimpleNamespace(action='stop')
+    service._on_event(ContainerInfo('adas-lane-detection', EXITED, 'adas/lane-detection', 143))
+    assert service.get('adas-lane-detection').stopped_by_user
+
+    # The stop action finishes before Podman's trailing 'stop' event is handled
+    service._actions.clear()
+    service._on_event(ContainerInfo('adas-lane-detection', EXITED, 'adas/lane-detection', 143))
+    info = service.get('adas-lane-detection')
+    assert info.stopped_by_user
+    assert not info.crashed
+
+
+def test_exit_without_user_action_is_a_crash():
+    service = ContainerLifecycleService()
+    service._on_event(ContainerInfo('adas-lane-detection', EXITED, 'adas/lane-detection', 137))
+    assert service.get('adas-lane-detection').crashed
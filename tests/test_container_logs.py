@@ -0,0 +1,28 @@
+"""
+LogBuffer sequence numbering
+"""
+from services.container_logs import LogBuffer
+
+
+def lines(first, last):
+    return [(f'line {i}', False) for i in range(first, last)]
+
+
+def test_wraps_across_appends():
+    buffer = LogBuffer(4)
+    buffer.append(lines(0, 3))
+    buffer.append(lines(3, 6))
+    assert buffer.span() == (2, 6)
+    assert [buffer.get(seq)[0] for seq in range(2, 6)] == ['line 2', 'line 3', 'line 4', 'line 5']
+    assert buffer.get(1) is None
+
+
+def test_batch_larger_than_capacity_keeps_sequence_order():
+    buffer = LogBuffer(4)
+    buffer.append(lines(0, 6))
+    assert buffer.span() == (2, 6)
+    assert [buffer.get(seq)[0] for seq in range(2, 6)] == ['line 2', 'line 3', 'line 4', 'line 5']
+    assert [text for text, _ in buffer.snapshot(0, 6)] == ['line 2', 'line 3', 'line 4', 'line 5']
+
+    buffer.append(lines(6, 7))
+    assert [text for text, _ in buffer.snapshot(0, 7)] == ['line 3', 'line 4', 'line 5', 'line 6']
@@ -0,0 +1,28 @@
+"""
+Installed images registry writes
+"""
+import json
+import threading
+
+from utils.file_utils import (
+    INSTALLED_FILE, add_installed_image, load_installed_images, update_installed_images
+)
+
+
+def test_concurrent_updates_keep_every_image(resources_dir):
+    update_installed_images(added=['adas/base'])
+    threads = [threading.Thread(target=add_installed_image, args=(f'adas/app-{i}',)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    # A stale caller only passes its own change, so it cannot drop the workers' images
+    update_installed_images(removed=['adas/base'])
+    for thread in threads:
+        thread.join()
+
+    assert load_installed_images() == {f'adas/app-{i}' for i in range(20)}
+
+
+def test_write_replaces_the_file_whole(resources_dir):
+    update_installed_images(added=['adas/lane-detection'])
+    assert json.loads(open(INSTALLED_FILE).read()) == ['adas/lane-detection']
+    assert [path.name for path in resources_dir.iterdir()] == ['installed_images.json']
@@ -0,0 +1,58 @@
+"""
+Storage report summaries, eviction order and image usage bookkeeping
+"""
+import json
+
+from services.image_storage import MB, ImageStorageManager, StorageReport, choose_eviction
+from utils.file_utils import load_image_usage
+
+
+def test_describe_reports_uninstalls_and_pruning_separately():
+    report = StorageReport(
+        removed={'adas/lane-detection': 40 * MB, 'adas/cruise-control': 16 * MB},
+        used_bytes=500 * MB, budget_bytes=1024 * MB, pruned=['adas/cruise-control'],
+    )
+    assert report.describe() == (
+        "Storage 500 of 1024 MB · freed 40 MB by uninstalling 1 app"
+        " · freed 16 MB by removing 1 unused app"
+    )
+
+
+def test_describe_without_removals():
+    assert StorageReport(used_bytes=500 * MB, budget_bytes=1024 * MB).describe() == "Storage 500 of 1024 MB"
+
+
+def test_eviction_prefers_least_recently_used_then_largest():
+    images = {
+        'adas/lane-detection': {'last_used': 100.0, 'size': 900 * MB},
+        'adas/cruise-control': {'last_used': 50.0, 'size': 10 * MB},
+        'adas/parking-assist': {'last_used': 0, 'size': 200 * MB},
+        'adas/blind-spot': {'last_used': 0, 'size': 300 * MB},
+    }
+    assert choose_eviction(images, excluded=[]) == 'adas/blind-spot'
+    assert choose_eviction(images, excluded=['adas/blind-spot', 'adas/parking-assist']) == 'adas/cruise-control'
+    assert choose_eviction(images, excluded=images) is None
+
+
+def test_usage_file_with_bare_timestamps_still_loads(resources_dir):
+    (resources_dir / 'image_usage.json').write_text(json.dumps({'adas/lane-detection': 123.0}))
+    assert load_image_usage() == {'adas/lane-detection': {'last_used': 123.0, 'size': 0}}
+
+
+def test_usage_is_touched_on_start_and_saved_in_batches(resources_dir):
+    storage = ImageStorageManager(set(), [], {'budget_mb': 1024, 'auto_prune': False})
+    usage_file = resources_dir / 'image_usage.json'
+
+    storage.set_running('adas/lane-detection', True)
+    started = storage.usage['adas/lane-detection']['last_used']
+    assert json.loads(usage_file.read_text()) == storage.usage
+
+    # Health updates of a container that is already running are not new uses
+    storage.set_running('adas/lane-detection', True)
+    assert storage.usage['adas/lane-detection']['last_used'] == started
+
+    # Within the save interval further starts stay in memory until stop()
+    storage.set_running('adas/cruise-control', True)
+    assert 'adas/cruise-control' not in json.loads(usage_file.read_text())
+    storage.stop()
+    assert 'adas/cruise-control' in json.loads(usage_file.read_text())
@@ -0,0 +1,26 @@
+"""
+Prefetching within the disk budget
+"""
+from services.prefetcher import PrefetchWorker
+from services.podman_service import create_podman_client
+from utils.file_utils import load_prefetched_images
+
+
+def test_pull_that_would_exceed_budget_is_abandoned(fake_podman):
+    fake_podman({
+        'pull_rate_mbps': 200,
+        'progress_interval_ms': 20,
+        'base_layers_mb': [1.0],
+        'app_layers_mb': [2.0],
+        'images': {'adas/lane-detection': {'layers_mb': [40.0]}},
+    })
+    # 41 MB does not fit a 10 MB budget; the 3 MB image after it does
+    worker = PrefetchWorker(['adas/lane-detection', 'adas/cruise-control'], 0, 10)
+    results = []
+    worker.finished.connect(lambda success, message: results.append((success, message)))
+    worker.run()
+
+    assert results == [(True, 'Disk budget reached')]
+    assert load_prefetched_images() == {'adas/cruise-control'}
+    tags = {tag for image in create_podman_client().images.list() for tag in image.tags}
+    assert tags == {'docker.io/adas/cruise-control:latest'}
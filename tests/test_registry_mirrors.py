@@ -0,0 +1,99 @@
+"""
+Pulls through registry mirrors served by fake_podman
+"""
+import json
+
+import pytest
+
+from services.podman_service import create_podman_client, normalize_image_name, pull_with_mirrors
+from services.registry_mirrors import get_registry_mirrors
+
+FAKE_CONFIG = {
+    'base_layers_mb': [1.0],
+    'app_layers_mb': [1.0],
+    'pull_rate_mbps': 2000,
+    'progress_interval_ms': 10,
+    'registries': {
+        'down.local:5000': {'down': True},
+        'slow.local:5000': {'latency_ms': 200, 'pull_rate_mbps': 5},
+        'fast.local:5000': {'missing': ['adas/lane-detection']},
+    },
+}
+
+
+@pytest.fixture
+def client(fake_podman):
+    fake_podman(FAKE_CONFIG)
+    return create_podman_client()
+
+
+def use_registries(resources_dir, mirrors, upstream='docker.io'):
+    settings = {'registries': {'mirrors': mirrors, 'upstream': upstream, 'failure_cooldown_seconds': 60}}
+    (resources_dir / 'settings.json').write_text(json.dumps(settings))
+
+
+def tags(client):
+    return sorted(tag for image in client.images.list() for tag in image.tags)
+
+
+def test_down_mirror_is_skipped_and_cools_down(client, resources_dir):
+    use_registries(resources_dir, ['down.local:5000', 'fast.local:5000'])
+    tried = []
+    pull_with_mirrors(client, 'adas/cruise-control', on_registry=tried.append)
+
+    assert tried == ['down.local:5000', 'fast.local:5000']
+    assert tags(client) == ['docker.io/adas/cruise-control:latest']
+    mirrors = get_registry_mirrors()
+    assert mirrors.stats['down.local:5000'].failures == 1
+    assert mirrors.candidates() == ['fast.local:5000', 'docker.io']
+
+
+def test_slow_mirror_ranks_behind_fast_one(client, resources_dir):
+    use_registries(resources_dir, ['slow.local:5000', 'fast.local:5000'])
+    # Unmeasured mirrors go first, so each gets one pull
+    first, second = [], []
+    pull_with_mirrors(client, 'adas/cruise-control', on_registry=first.append)
+    pull_with_mirrors(client, 'adas/voice-assistant', on_registry=second.append)
+    assert first == ['slow.local:5000']
+    assert second == ['fast.local:5000']
+
+    mirrors = get_registry_mirrors()
+    assert mirrors.stats['slow.local:5000'].latency >= 0.2
+    assert mirrors.candidates() == ['fast.local:5000', 'slow.local:5000', 'docker.io']
+
+
+def test_image_missing_on_mirror_is_a_miss_not_a_failure(client, resources_dir):
+    use_registries(resources_dir, ['fast.local:5000'])
+    tried = []
+    pull_with_mirrors(client, 'adas/lane-detection', on_registry=tried.append)
+
+    assert tried == ['fast.local:5000', 'docker.io']
+    assert tags(client) == ['docker.io/adas/lane-detection:latest']
+    mirrors = get_registry_mirrors()
+    assert mirrors.stats['fast.local:5000'].misses == 1
+    assert mirrors.stats['fast.local:5000'].failures == 0
+    assert mirrors.candidates() == ['fast.local:5000', 'docker.io']
+
+
+def test_falls_back_to_configured_upstream(client, resources_dir):
+    use_registries(resources_dir, ['down.local:5000'], upstream='slow.local:5000')
+    tried = []
+    tracker = pull_with_mirrors(client, 'adas/cruise-control', on_registry=tried.append)
+
+    assert tracker.downloaded_bytes > 0
+    assert tried == ['down.local:5000', 'slow.local:5000']
+    assert tags(client) == ['slow.local:5000/adas/cruise-control:latest']
+    assert normalize_image_name(tags(client)[0]) == 'adas/cruise-control'
+
+
+def test_mirror_pull_is_retagged_to_configured_upstream(client, resources_dir):
+    use_registries(resources_dir, ['fast.local:5000'], upstream='slow.local:5000')
+    pull_with_mirrors(client, 'adas/cruise-control')
+
+    assert tags(client) == ['slow.local:5000/adas/cruise-control:latest']
+
+
+def test_all_registries_failing_raises(client, resources_dir):
+    use_registries(resources_dir, ['down.local:5000'], upstream='fast.local:5000')
+    with pytest.raises(RuntimeError, match='All registries failed'):
+        pull_with_mirrors(client, 'adas/lane-detection')
@@ -0,0 +1,64 @@
+"""
+Resource limits from settings reach the app container's cgroup config
+"""
+import json
+
+from services.podman_service import container_name_for, create_podman_client, run_app_container
+from services.resource_limits import CPU_PERIOD_US, MB, resolve_limits
+from utils.file_utils import load_settings
+
+IMAGE = 'adas/lane-detection'
+
+
+def test_create_receives_limits_from_settings(resources_dir):
+    (resources_dir / 'settings.json').write_text(json.dumps({'resource_limits': {
+        'enabled': True,
+        'default': {'cpu_shares': 256, 'cpu_percent': 25, 'memory_mb': 128, 'pids_limit': 64},
+    }}))
+    calls = []
+
+    class Containers:
+        def get(self, name):
+            raise LookupError(name)
+
+        def create(self, image, **kwargs):
+            calls.append((image, kwargs))
+
+    class Client:
+        containers = Containers()
+
+    run_app_container(Client(), IMAGE, start=False, limits=resolve_limits(None))
+
+    (image, kwargs), = calls
+    assert image == IMAGE
+    assert kwargs['name'] == container_name_for(IMAGE)
+    assert kwargs['cpu_shares'] == 256
+    assert kwargs['cpu_period'] == CPU_PERIOD_US
+    assert kwargs['cpu_quota'] == CPU_PERIOD_US // 4
+    assert kwargs['mem_limit'] == 128 * MB
+    assert kwargs['pids_limit'] == 64
+
+
+def test_default_limits_land_in_host_config(fake_podman):
+    fake_podman({'preloaded_images': [IMAGE]})
+    client = create_podman_client()
+    default = load_settings()['resource_limits']['default']
+
+    run_app_container(client, IMAGE, start=False, limits=resolve_limits(None))
+
+    host = client.containers.get(container_name_for(IMAGE)).attrs['HostConfig']
+    assert host['CpuShares'] == default['cpu_shares']
+    assert host['CpuPeriod'] == CPU_PERIOD_US
+    assert host['CpuQuota'] == CPU_PERIOD_US * default['cpu_percent'] // 100
+    assert host['Memory'] == default['memory_mb'] * MB
+    assert host['PidsLimit'] == default['pids_limit']
+
+
+def test_disabled_limits_create_an_unlimited_container(fake_podman):
+    fake_podman({'preloaded_images': [IMAGE]})
+    client = create_podman_client()
+
+    run_app_container(client, IMAGE, start=False, limits=resolve_limits(None, {'enabled': False}))
+
+    host = client.containers.get(container_name_for(IMAGE)).attrs['HostConfig']
+    assert (host['CpuQuota'], host['Memory'], host['PidsLimit']) == (0, 0, 0)
@@ -0,0 +1,44 @@
+"""
+Recoloring SVG icons in themed and tint mode
+"""
+from ui.svg_templates import TINT, SvgTemplate
+
+STYLED = (
+    '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">'
+    '<style>.dot { fill: #123456 }</style>'
+    '<path d="M0 0h24v12H0z" style="fill:#ff0000;fill-opacity:0.5"/>'
+    '<circle class="dot" cx="6" cy="18" r="3"/>'
+    '<rect x="12" y="12" width="12" height="12"/>'
+    '<line x1="0" y1="0" x2="24" y2="24" fill="none" stroke="white"/>'
+    '</svg>'
+)
+
+
+def test_tint_recolors_style_declarations_and_default_fills():
+    tinted = SvgTemplate(STYLED).substitute('#00ff00', TINT)
+    assert tinted.startswith('<svg fill="#00ff00" ')
+    assert '.dot { fill: #00ff00 }' in tinted
+    assert 'style="fill:#00ff00;fill-opacity:0.5"' in tinted
+    assert 'fill="none" stroke="#00ff00"' in tinted
+
+
+def test_themed_mode_leaves_other_colors_alone():
+    themed = SvgTemplate(STYLED).substitute('#c0caf5')
+    assert themed == STYLED.replace('stroke="white"', 'stroke="#c0caf5"')
+
+
+def test_root_fill_is_kept():
+    svg = '<svg viewBox="0 0 24 24" fill="none" stroke="currentColor"><path d="M2 2h20"/></svg>'
+    assert SvgTemplate(svg).substitute('#00ff00', TINT) == svg.replace('currentColor', '#00ff00')
+
+
+def test_tinted_render_paints_default_fill_shapes(qapp):
+    from PyQt6.QtGui import QColor, QImage, QPainter
+
+    image = QImage(24, 24, QImage.Format.Format_ARGB32)
+    image.fill(0)
+    painter = QPainter(image)
+    SvgTemplate(STYLED).renderer('#00ff00', TINT).render(painter)
+    painter.end()
+    # Inside the rect, which has no fill of its own and used to paint black
+    assert image.pixelColor(21, 15) == QColor('#00ff00')
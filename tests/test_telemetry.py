@@ -0,0 +1,33 @@
+"""
+Telemetry sample routing and CPU budget accounting
+"""
+from services.telemetry import StatsSample, StatsStreamWorker, TelemetryCollector
+
+SETTINGS = {'enabled': True, 'interval_seconds': 1, 'cpu_budget_percent': 1.0}
+
+
+def test_samples_reach_only_their_container():
+    collector = TelemetryCollector(SETTINGS)
+    lane, cruise = [], []
+    collector.notifier('adas-lane-detection').updated.connect(lambda: lane.append(1))
+    collector.notifier('adas-cruise-control').updated.connect(lambda: cruise.append(1))
+
+    collector._on_samples({'adas-lane-detection': StatsSample(0.0, 3.0, 1024)})
+    assert lane == [1]
+    assert cruise == []
+    assert collector.history('adas-lane-detection').latest.cpu_percent == 3.0
+
+
+def test_gui_handling_time_counts_against_budget():
+    collector = TelemetryCollector(SETTINGS)
+    collector.worker = StatsStreamWorker(['adas-lane-detection'], 1, 1.0)
+
+    def busy():
+        total = 0
+        for i in range(200000):
+            total += i
+
+    collector.notifier('adas-lane-detection').updated.connect(busy)
+    collector._on_samples({'adas-lane-detection': StatsSample(0.0, 3.0, 1024)})
+    assert collector.worker._take_gui_time() > 0
+    assert collector.worker._take_gui_time() == 0
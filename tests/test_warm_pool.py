@@ -0,0 +1,31 @@
+"""
+Warm pool accounting and its store card wiring
+"""
+from services.container_lifecycle import RUNNING, ContainerInfo, ContainerLifecycleService
+from services.warm_pool import WarmPool
+
+SETTINGS = {'enabled': True, 'max_running': 1, 'policy': 'lru', 'checkpoint': False}
+
+
+def test_lru_stop_is_counted_in_stats(resources_dir, monkeypatch):
+    monkeypatch.setenv('PODMAN_SOCKET_PATH', str(resources_dir / 'missing.sock'))
+    lifecycle = ContainerLifecycleService()
+    pool = WarmPool(lifecycle, SETTINGS)
+    lifecycle.containers['adas-lane-detection'] = ContainerInfo('adas-lane-detection', RUNNING)
+    try:
+        assert pool.start('adas-cruise-control')
+        assert pool.is_pending('adas-cruise-control')
+        assert pool.stats()['evictions'] == 1
+        assert pool.stats()['pending_starts'] == 1
+    finally:
+        lifecycle.stop()
+
+
+def test_card_with_warm_pool_and_no_lifecycle(qapp):
+    from models.feature import Feature
+    from ui.components import FeatureCard
+
+    pool = WarmPool(ContainerLifecycleService(), SETTINGS)
+    feature = Feature('lane-detection', 'Lane detection.', '', '', 'adas/lane-detection')
+    card = FeatureCard(feature, set(), warm_pool=pool)
+    assert card.warm_pool is pool
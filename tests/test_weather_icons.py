@@ -0,0 +1,22 @@
+"""
+Bundled stand-ins for WeatherAPI condition icons
+"""
+from ui.weather_icons import local_weather_icon
+
+ICON_URL = 'https://cdn.weatherapi.com/weather/64x64/{}/{}.png'
+
+
+def test_clear_day_and_night():
+    assert local_weather_icon(ICON_URL.format('day', 113)) == 'resources/icons/weather-clear.svg'
+    assert local_weather_icon(ICON_URL.format('night', 113)) == 'resources/icons/night-mode.svg'
+
+
+def test_sun_icons_are_not_used_at_night():
+    assert local_weather_icon(ICON_URL.format('day', 116)) == 'resources/icons/partly-cloudy.svg'
+    # Partly cloudy at night has a moon; it is downloaded instead
+    assert local_weather_icon(ICON_URL.format('night', 116)) is None
+
+
+def test_sunless_icons_serve_both():
+    assert local_weather_icon(ICON_URL.format('night', 296)) == 'resources/icons/rainy.svg'
+    assert local_weather_icon('https://example.com/other.png') is None
@@ -12,6 +12,8 @@ class AlertScreen(QDialog):
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Dialog)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setModal(True)
+        self.setObjectName("AlertScreen")
+        theme_manager.attach(self)
         self.setMinimumWidth(650)
         self.setMaximumWidth(800)
         
@@ -19,15 +21,12 @@ class AlertScreen(QDialog):
         self.advice_message = advice_message
         
         self._setup_ui()
-        theme_manager.theme_changed.connect(self.update_styles)
-        self.update_styles()
         
         # Adjust size based on content
         self.adjustSize()
 
     def _setup_ui(self):
         """Setup the alert screen UI"""
-        self.setObjectName("AlertScreen")
         container = QWidget()
         container.setObjectName("Container")
         
@@ -75,51 +74,54 @@ class AlertScreen(QDialog):
         layout.addWidget(header)
         layout.addWidget(body)
 
-    def update_styles(self):
-        """Apply styles from the theme manager."""
-        theme = theme_manager.theme
-        border_radius = "16px"
-        self.setStyleSheet(f"""
-            #Container {{
-                background-color: {theme['card_bg']};
-                border: 2px solid {theme['alert_color']};
-                border-radius: {border_radius};
-            }}
-            #AlertHeader {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 {theme['alert_color']}, stop:1 {theme['alert_color']}dd);
-                border-top-left-radius: {border_radius};
-                border-top-right-radius: {border_radius};
-                min-height: 50px;
-                padding: 8px;
-            }}
-            #AlertHeaderText {{
-                font-size: 22px;
-                font-weight: bold;
-                color: {theme['alert_text_color']};
-                background-color: transparent;
-                letter-spacing: 1px;
-            }}
-            #AlertBody {{
-                background-color: transparent;
-                padding: 8px;
-            }}
-            #AlertMainText {{
-                font-size: 36px;
-                font-weight: bold;
-                color: {theme['text']};
-                padding: 20px 0 15px 0;
-                line-height: 1.4;
-            }}
-            #AlertAdviceText {{
-                font-size: 20px;
-                color: {theme['text_secondary']};
-                line-height: 1.5;
-                padding: 0 10px 20px 10px;
-            }}
-        """)
-
     def set_message(self, main_message: str, advice_message: str):
         """Update the displayed messages."""
         self.main_label.setText(main_message)
-        self.advice_label.setText(advice_message) 
\ No newline at end of file
+        self.advice_label.setText(advice_message)
+
+
+def _alert_stylesheet(theme: dict) -> str:
+    """The alert screen's stylesheet section for a theme."""
+    border_radius = "16px"
+    return f"""
+        #AlertScreen #Container {{
+            background-color: {theme['card_bg']};
+            border: 2px solid {theme['alert_color']};
+            border-radius: {border_radius};
+        }}
+        #AlertScreen #AlertHeader {{
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 {theme['alert_color']}, stop:1 {theme['alert_color']}dd);
+            border-top-left-radius: {border_radius};
+            border-top-right-radius: {border_radius};
+            min-height: 50px;
+            padding: 8px;
+        }}
+        #AlertScreen #AlertHeaderText {{
+            font-size: 22px;
+            font-weight: bold;
+            color: {theme['alert_text_color']};
+            background-color: transparent;
+            letter-spacing: 1px;
+        }}
+        #AlertScreen #AlertBody {{
+            background-color: transparent;
+            padding: 8px;
+        }}
+        #AlertScreen #AlertMainText {{
+            font-size: 36px;
+            font-weight: bold;
+            color: {theme['text']};
+            padding: 20px 0 15px 0;
+            line-height: 1.4;
+        }}
+        #AlertScreen #AlertAdviceText {{
+            font-size: 20px;
+            color: {theme['text_secondary']};
+            line-height: 1.5;
+            padding: 0 10px 20px 10px;
+        }}
+    """
+
+
+theme_manager.register_stylesheet('AlertScreen', _alert_stylesheet)
@@ -4,40 +4,94 @@ UI components for the ADAS App Store
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QGridLayout, QLabel, QPushButton, 
     QScrollArea, QHBoxLayout, QFrame, QStackedWidget, QDialog, 
-    QDialogButtonBox
+    QDialogButtonBox, QProgressBar, QApplication, QCheckBox
 )
-from PyQt6.QtGui import QPixmap, QFont, QIcon
+from PyQt6.QtGui import QPixmap, QFont, QIcon, QColor
 from PyQt6.QtCore import Qt, QSize, QThread, QPropertyAnimation, QEasingCurve, QRect, QTimer
 from models.feature import Feature
 from ui.dialogs import InfoDialog, DownloadInstallDialog
-from utils.file_utils import extract_image_name, save_installed_images
-from .widgets import ClockWidget, WeatherWidget
+from ui.log_viewer import LogViewerDialog
+from utils.disk_cache import get_disk_cache
+from utils.file_utils import (
+    extract_image_name, update_installed_images, load_settings, record_store_interest, INSTALLED_FILE
+)
+from .widgets import ClockWidget, WeatherWidget, SparklineWidget
 from .styles import theme_manager
 from .icon_utils import get_themed_icon
+from .remote_icons import get_remote_icon_loader
 from .top_bar import TopBar
 from PyQt6.QtCore import pyqtSignal
-from services.podman_service import PodmanWorker
+from services.podman_service import PodmanWorker, container_name_for
+from services.install_manager import InstallManager, QUEUED, RUNNING, CANCELLING, FAILED
+from services.reconciler import InstalledStateReconciler, reconcile_installed
+from services.prefetcher import ImagePrefetcher
+from services.container_lifecycle import ContainerLifecycleService, RUNNING as CONTAINER_RUNNING, REMOVED
+from services.telemetry import TelemetryCollector, RESOLUTIONS
+from services.image_storage import ImageStorageManager
+from services.warm_pool import WarmPool
+from services.scheduler import get_scheduler
+from services.clock_service import ClockService
+from services.weather_service import WeatherService
 import os
+import time
 
 
 class FeatureCard(QFrame):
     """A card widget for displaying feature information"""
+    selection_changed = pyqtSignal()
     
-    def __init__(self, feature: Feature, installed_images: set, parent=None):
+    def __init__(self, feature: Feature, installed_images: set, install_manager: InstallManager = None,
+                 lifecycle: ContainerLifecycleService = None, telemetry: TelemetryCollector = None,
+                 storage: ImageStorageManager = None, warm_pool: WarmPool = None, parent=None):
         super().__init__(parent)
         self.feature = feature
         self.installed_images = installed_images
+        self.install_manager = install_manager
+        self.lifecycle = lifecycle
+        self.telemetry = telemetry
+        self.storage = storage
+        self.warm_pool = warm_pool
+        self._resolution = 0  # Index into RESOLUTIONS shown by the sparklines
+        self.container_name = container_name_for(feature.image_name) if feature.image_name else ''
+        self._showing_container_state = False
         self._setup_ui()
         self._check_installed_state()
         theme_manager.theme_changed.connect(self._update_icons)
+        if self._get_feature_icon().startswith('http'):
+            get_remote_icon_loader().icon_ready.connect(self._on_remote_icon)
+        if self.install_manager:
+            self.install_manager.job_changed.connect(self._on_job_changed)
+            self.install_manager.job_status.connect(self._on_job_status)
+            self.install_manager.job_progress.connect(self._on_job_progress)
+            self._on_job_changed(self.feature.image_name)
+        if self.lifecycle:
+            self.lifecycle.container_changed.connect(self._on_container_changed)
+            self.lifecycle.action_finished.connect(self._on_container_action_finished)
+            self._update_container_controls()
+        if self.telemetry and self.container_name:
+            self.telemetry.notifier(self.container_name).updated.connect(self._update_telemetry)
+        if self.storage:
+            self.storage.busy_changed.connect(self._on_storage_busy_changed)
+            self.storage.uninstall_finished.connect(self._on_uninstall_finished)
+        if self.warm_pool:
+            self.warm_pool.start_rejected.connect(self._on_start_rejected)
+            if self.lifecycle:
+                self.lifecycle.container_started.connect(self._on_container_started)
 
     def _setup_ui(self):
         """Setup the feature card UI"""
         self.setObjectName("FeatureCard")
-        self.setFixedSize(600, 200)
+        self.setFixedSize(600, 260)
         layout = QVBoxLayout()
         layout.setSpacing(12)
         
+        # Batch selection (shown in the store's selection mode)
+        self.select_box = QCheckBox("Select")
+        self.select_box.setObjectName("SelectBox")
+        self.select_box.setVisible(False)
+        self.select_box.toggled.connect(lambda _: self.selection_changed.emit())
+        layout.addWidget(self.select_box, alignment=Qt.AlignmentFlag.AlignRight)
+        
         layout.addStretch()
         
         # Icon section
@@ -55,6 +109,46 @@ class FeatureCard(QFrame):
         title.setWordWrap(True)
         layout.addWidget(title)
         
+        # Inline install progress (hidden until a job exists)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setObjectName("InstallProgress")
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedHeight(6)
+        self.progress_bar.setVisible(False)
+        layout.addWidget(self.progress_bar)
+        
+        self.status_label = QLabel()
+        self.status_label.setObjectName("InstallStatus")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setVisible(False)
+        layout.addWidget(self.status_label)
+        
+        # CPU / memory sparklines while the container runs
+        self.telemetry_row = QWidget()
+        telemetry_layout = QHBoxLayout(self.telemetry_row)
+        telemetry_layout.setContentsMargins(0, 0, 0, 0)
+        telemetry_layout.setSpacing(6)
+        telemetry_layout.addStretch()
+        self.cpu_label = QLabel()
+        self.cpu_label.setObjectName("TelemetryLabel")
+        telemetry_layout.addWidget(self.cpu_label)
+        self.cpu_sparkline = SparklineWidget()
+        telemetry_layout.addWidget(self.cpu_sparkline)
+        telemetry_layout.addSpacing(12)
+        self.mem_label = QLabel()
+        self.mem_label.setObjectName("TelemetryLabel")
+        telemetry_layout.addWidget(self.mem_label)
+        self.mem_sparkline = SparklineWidget()
+        telemetry_layout.addWidget(self.mem_sparkline)
+        self.resolution_btn = QPushButton(self._resolution_text())
+        self.resolution_btn.setObjectName("ResolutionButton")
+        self.resolution_btn.setToolTip("History resolution")
+        self.resolution_btn.clicked.connect(self.cycle_resolution)
+        telemetry_layout.addWidget(self.resolution_btn)
+        telemetry_layout.addStretch()
+        self.telemetry_row.setVisible(False)
+        layout.addWidget(self.telemetry_row)
+        
         # Buttons
         button_layout = QHBoxLayout()
         button_layout.setSpacing(8)
@@ -69,6 +163,25 @@ class FeatureCard(QFrame):
         self.download_btn.setObjectName("DownloadButton")
         self.download_btn.clicked.connect(self.download_feature)
         button_layout.addWidget(self.download_btn)
+
+        # Container controls (shown once installed)
+        self.container_btn = QPushButton("Stop")
+        self.container_btn.setObjectName("ContainerButton")
+        self.container_btn.clicked.connect(self.toggle_container)
+        self.container_btn.setVisible(False)
+        button_layout.addWidget(self.container_btn)
+
+        self.logs_btn = QPushButton("Logs")
+        self.logs_btn.setObjectName("LogsButton")
+        self.logs_btn.clicked.connect(self.show_logs)
+        self.logs_btn.setVisible(False)
+        button_layout.addWidget(self.logs_btn)
+
+        self.remove_btn = QPushButton("Uninstall" if self.storage else "Remove")
+        self.remove_btn.setObjectName("RemoveButton")
+        self.remove_btn.clicked.connect(self.remove_container)
+        self.remove_btn.setVisible(False)
+        button_layout.addWidget(self.remove_btn)
         button_layout.addStretch()
         
         layout.addLayout(button_layout)
@@ -121,6 +234,13 @@ class FeatureCard(QFrame):
         icon = get_themed_icon(icon_path)
         pixmap = icon.pixmap(64, 64)
         self.icon_label.setPixmap(pixmap)
+        self.cpu_sparkline.set_color(QColor(theme_manager.theme['accent']))
+        self.mem_sparkline.set_color(QColor(theme_manager.theme['success']))
+
+    def _on_remote_icon(self, url: str, path: str):
+        """Swap the placeholder for the downloaded icon"""
+        if path and url == self._get_feature_icon():
+            self.icon_label.setPixmap(get_themed_icon(url).pixmap(64, 64))
 
     def _check_installed_state(self):
         """Check if this feature is already installed"""
@@ -131,17 +251,297 @@ class FeatureCard(QFrame):
         """Mark the feature as installed"""
         self.download_btn.setText("Installed")
         self.download_btn.setEnabled(False)
-        self.download_btn.setObjectName("InstalledButton")
+        self._set_button_role("InstalledButton")
+        self._update_container_controls()
+
+    def set_not_installed(self):
+        """Mark the feature as available for download"""
+        self.download_btn.setText("Download")
+        self.download_btn.setEnabled(True)
+        self._set_button_role("DownloadButton")
+        self._update_container_controls()
+
+    def refresh_installed_state(self):
+        """Re-sync the badge with installed_images unless an install is active."""
+        if self.install_manager:
+            job = self.install_manager.get_job(self.feature.image_name)
+            if job and job.is_active:
+                return
+        if self.feature.image_name in self.installed_images:
+            self.set_installed()
+        else:
+            self.set_not_installed()
+
+    def _set_button_role(self, object_name: str):
+        """Switch the download button's style role and re-polish it."""
+        if self.download_btn.objectName() == object_name:
+            return
+        self.download_btn.setObjectName(object_name)
+        style = self.download_btn.style()
+        if style:
+            style.unpolish(self.download_btn)
+            style.polish(self.download_btn)
+
+    def set_selection_mode(self, enabled: bool):
+        """Offer the card for batch install if it can be installed."""
+        selectable = (
+            enabled and bool(self.feature.location)
+            and self.feature.image_name not in self.installed_images
+            and not self._install_active()
+        )
+        if not selectable:
+            self.select_box.setChecked(False)
+        self.select_box.setVisible(selectable)
+
+    def is_selected(self) -> bool:
+        return not self.select_box.isHidden() and self.select_box.isChecked()
+
+    def _on_job_changed(self, image_name: str):
+        """Reflect the install job state for this card's image."""
+        if image_name != self.feature.image_name:
+            return
+        job = self.install_manager.get_job(image_name)
+        if job is None:
+            return
+
+        if job.is_active:
+            self.progress_bar.setRange(0, 0)  # Indeterminate until real progress arrives
+            self.progress_bar.setVisible(job.state != QUEUED)
+            self.status_label.setVisible(True)
+            if job.state == QUEUED:
+                self.status_label.setText("Queued")
+            elif job.state == RUNNING:
+                self.status_label.setText("Installing...")
+            elif job.state == CANCELLING:
+                self.status_label.setText("Cancelling...")
+            self.download_btn.setText("Cancel")
+            self.download_btn.setEnabled(job.state != CANCELLING)
+            self._set_button_role("CancelInstallButton")
+            return
+
+        self.progress_bar.setVisible(False)
+        if image_name in self.installed_images:
+            self.status_label.setVisible(False)
+            self.set_installed()
+            return
+
+        self.status_label.setVisible(job.state == FAILED)
+        self.status_label.setText("Installation failed. Please try again.")
+        self.set_not_installed()
+
+    def _on_job_progress(self, image_name: str, progress):
+        """Show pull percent, throughput and ETA while the image downloads."""
+        if image_name != self.feature.image_name:
+            return
+        job = self.install_manager.get_job(image_name)
+        if not job or job.state != RUNNING:
+            return
+        if progress.total_bytes:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(progress.percent)
+        self.status_label.setText(f"Downloading {progress.describe()}")
+
+    def _on_job_status(self, image_name: str, text: str):
+        """Show the latest worker status line while installing."""
+        if image_name == self.feature.image_name and self.status_label.isVisible():
+            job = self.install_manager.get_job(image_name)
+            # Pull progress owns the label while the image downloads
+            if job and job.state == RUNNING and not text.startswith('Pulling image'):
+                first_line = text.splitlines()[0] if text else ''
+                elided = self.status_label.fontMetrics().elidedText(
+                    first_line, Qt.TextElideMode.ElideRight, self.width() - 80
+                )
+                self.status_label.setText(elided)
+
+    def _install_active(self) -> bool:
+        if not self.install_manager:
+            return False
+        job = self.install_manager.get_job(self.feature.image_name)
+        return bool(job and job.is_active)
+
+    def _update_container_controls(self):
+        """Show the container state and Start/Stop/Remove for installed apps."""
+        if not self.lifecycle or not self.container_name:
+            return
+        installed = self.feature.image_name in self.installed_images
+        info = self.lifecycle.get(self.container_name)
+        show = installed and info is not None and not self._install_active()
+        self.container_btn.setVisible(show)
+        self.logs_btn.setVisible(show)
+        self.remove_btn.setVisible(show)
+        self._update_telemetry()
+        if not show:
+            if self._showing_container_state and not self._install_active():
+                self.status_label.setVisible(False)
+            self._showing_container_state = False
+            return
+
+        busy = self.lifecycle.is_busy(self.container_name) or bool(
+            self.storage and self.storage.is_busy(self.feature.image_name)
+        ) or bool(self.warm_pool and self.warm_pool.is_pending(self.container_name))
+        running = info.status == CONTAINER_RUNNING
+        self.container_btn.setText("Stop" if running else "Start")
+        self.container_btn.setEnabled(not busy)
+        self.remove_btn.setEnabled(not busy)
+
+        if self.storage and self.storage.is_busy(self.feature.image_name):
+            text = "Uninstalling..."
+        elif self.warm_pool and self.warm_pool.is_pending(self.container_name):
+            text = "Waiting for another app to stop..."
+        elif info.crashed:
+            text = f"Crashed (exit code {info.exit_code})"
+        elif running:
+            text = "Running"
+        elif info.status == 'exited':
+            text = "Stopped (checkpointed)" if info.checkpointed else "Stopped"
+        elif info.status == 'created':
+            text = "Ready to start"
+        else:
+            text = info.status.capitalize()
+        if info.health and running:
+            text += f" · {info.health}"
+        if running and self.warm_pool:
+            text += self._start_latency_text()
+        self.status_label.setText(text)
+        self.status_label.setVisible(True)
+        self._showing_container_state = True
+
+    def _on_container_changed(self, container_name: str, info):
+        if container_name == self.container_name:
+            self._update_container_controls()
+
+    def _resolution_text(self) -> str:
+        step = RESOLUTIONS[self._resolution][0]
+        return f"{step}s" if step < 60 else f"{step // 60}m"
+
+    def cycle_resolution(self):
+        """Switch the sparklines between the 1 s, 10 s and 1 min histories."""
+        self._resolution = (self._resolution + 1) % len(RESOLUTIONS)
+        self.resolution_btn.setText(self._resolution_text())
+        self._update_telemetry()
+
+    def _update_telemetry(self):
+        """Show CPU and memory history while the app's container is running."""
+        if not self.telemetry:
+            return
+        info = self.lifecycle.get(self.container_name) if self.lifecycle else None
+        history = self.telemetry.history(self.container_name)
+        running = info is not None and info.status == CONTAINER_RUNNING
+        show = running and history is not None and history.latest is not None and not self._install_active()
+        self.telemetry_row.setVisible(show)
+        if not show:
+            return
+
+        series = history.series[self._resolution]
+        self.cpu_label.setText(f"CPU {history.latest.cpu_percent:.1f}%")
+        self.cpu_sparkline.set_values(series.cpu_values(), floor=5.0)
+        mem_mb = [mem / (1024 * 1024) for mem in series.mem_values()]
+        self.mem_label.setText(f"MEM {history.latest.mem_bytes / (1024 * 1024):.0f} MB")
+        self.mem_sparkline.set_values(mem_mb, floor=16.0)
+
+    def _on_container_action_finished(self, container_name: str, action: str, success: bool, message: str):
+        if container_name != self.container_name:
+            return
+        self._update_container_controls()
+        if not success:
+            first_line = message.splitlines()[0] if message else ''
+            self.status_label.setText(f"Failed to {action}: {first_line}")
+            self.status_label.setVisible(True)
+
+    def toggle_container(self):
+        """Start or stop the app's container without blocking the UI."""
+        info = self.lifecycle.get(self.container_name)
+        if info is None:
+            return
+        if info.status == CONTAINER_RUNNING:
+            started = (self.warm_pool.stop(self.container_name) if self.warm_pool
+                       else self.lifecycle.stop_container(self.container_name))
+        else:
+            started = (self.warm_pool.start(self.container_name) if self.warm_pool
+                       else self.lifecycle.start_container(self.container_name))
+        if started:
+            self._update_container_controls()
+
+    def _start_latency_text(self) -> str:
+        """' · warm start 40 ms (cold 850 ms)' for the last start of this app."""
+        last = self.lifecycle.last_start.get(self.container_name)
+        if last is None:
+            return ''
+        kind, seconds = last
+        text = f" · {kind} start {seconds * 1000:.0f} ms"
+        cold = self.warm_pool.start_latency(self.feature.image_name).get('cold')
+        if cold is not None:
+            text += f" (cold {cold:.0f} ms)"
+        return text
+
+    def _on_container_started(self, container_name: str, kind: str, seconds: float):
+        if container_name == self.container_name:
+            self._update_container_controls()
+
+    def _on_start_rejected(self, container_name: str, reason: str):
+        if container_name != self.container_name:
+            return
+        self._update_container_controls()
+        self.status_label.setText(f"Not started: {reason}")
+        self.status_label.setVisible(True)
+
+    def remove_container(self):
+        """
+        Uninstall the app (container, image and registry entry) or, without a
+        storage manager, remove just its container. The card returns to
+        Download once it is gone.
+        """
+        if self.storage:
+            self.storage.uninstall(self.feature.image_name)
+        elif self.lifecycle.remove_container(self.container_name):
+            self._update_container_controls()
+
+    def _on_storage_busy_changed(self, image_name: str):
+        if image_name == self.feature.image_name:
+            self._update_container_controls()
+
+    def _on_uninstall_finished(self, image_name: str, success: bool, message: str, freed_bytes):
+        if image_name != self.feature.image_name:
+            return
+        self.refresh_installed_state()
+        self._update_container_controls()
+        first_line = message.splitlines()[0] if message else ''
+        self.status_label.setText(first_line if success else f"Failed to uninstall: {first_line}")
+        self.status_label.setVisible(True)
 
     def show_info(self):
         """Show detailed information about the feature in a dialog."""
+        if self.feature.image_name:
+            try:
+                record_store_interest(self.feature.image_name)
+            except Exception as e:
+                print(f"Failed to record store interest: {e}")
         dialog = InfoDialog(self.feature, self)
         dialog.exec()
 
+    def show_logs(self):
+        """Open (or raise) the live log viewer for the app's container."""
+        viewer = self.findChild(LogViewerDialog)
+        if viewer is None:
+            viewer = LogViewerDialog(self.container_name, self.feature.name, self)
+        viewer.show()
+        viewer.raise_()
+        viewer.activateWindow()
+
     def download_feature(self):
         """Download and install the feature"""
         if not self.feature.location:
             return
+        
+        if self.install_manager:
+            # Non-modal: queue the install, or cancel it if one is already active
+            job = self.install_manager.get_job(self.feature.image_name)
+            if job and job.is_active:
+                self.install_manager.cancel(self.feature.image_name)
+            else:
+                self.install_manager.submit(self.feature.location, digest=self.feature.digest,
+                                            resources=self.feature.resources)
+            return
             
         main_window = self.window()
         main_window.hide()
@@ -151,7 +551,7 @@ class FeatureCard(QFrame):
         def after_install(success: bool):
             if success:
                 self.installed_images.add(self.feature.image_name)
-                save_installed_images(self.installed_images)
+                update_installed_images(added=[self.feature.image_name])
                 self.set_installed()
         
         dialog.start_worker(self.feature.location, main_window, after_install)
@@ -161,14 +561,27 @@ class FeatureCard(QFrame):
 class StoreView(QWidget):
     """Store view with feature cards"""
     
-    def __init__(self, features: list, installed_images: set, dashboard=None):
+    def __init__(self, features: list, installed_images: set, dashboard=None, install_manager: InstallManager = None,
+                 lifecycle: ContainerLifecycleService = None, telemetry: TelemetryCollector = None,
+                 storage: ImageStorageManager = None, warm_pool: WarmPool = None):
         super().__init__()
         self.setObjectName("StoreView")
         self.features = features
         self.installed_images = installed_images
         self.dashboard = dashboard
+        self.install_manager = install_manager
+        self.lifecycle = lifecycle
+        self.telemetry = telemetry
+        self.storage = storage
+        self.warm_pool = warm_pool
         self._cards = []  # To hold card widgets for animation
+        self.selection_mode = False
         self._setup_ui()
+        if self.install_manager:
+            self.install_manager.batch_planned.connect(self._on_batch_planned)
+            self.install_manager.batch_finished.connect(self._on_batch_finished)
+        if self.storage:
+            self.storage.report_ready.connect(self._on_storage_report)
     
     def _setup_ui(self):
         """Setup the store view UI"""
@@ -178,17 +591,40 @@ class StoreView(QWidget):
         font.setPointSize(20)
         font.setWeight(QFont.Weight.Bold)
         title.setFont(font)
+        title.setObjectName("StoreTitle")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("margin: 12px 0;")
         layout.addWidget(title)
 
+        # Batch install toolbar
+        toolbar = QHBoxLayout()
+        toolbar.setContentsMargins(12, 0, 12, 0)
+        self.batch_label = QLabel()
+        self.batch_label.setObjectName("BatchSummary")
+        toolbar.addWidget(self.batch_label, 1)
+        self.storage_label = QLabel()
+        self.storage_label.setObjectName("StorageSummary")
+        toolbar.addWidget(self.storage_label)
+        self.install_selected_btn = QPushButton("Install Selected")
+        self.install_selected_btn.setObjectName("InstallSelectedButton")
+        self.install_selected_btn.clicked.connect(self.install_selected)
+        self.install_selected_btn.setVisible(False)
+        toolbar.addWidget(self.install_selected_btn)
+        self.select_btn = QPushButton("Select")
+        self.select_btn.setObjectName("SelectButton")
+        self.select_btn.clicked.connect(self.toggle_selection_mode)
+        self.select_btn.setVisible(self.install_manager is not None)
+        toolbar.addWidget(self.select_btn)
+        layout.addLayout(toolbar)
+
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         content = QWidget()
         grid = QGridLayout()
         grid.setSpacing(24)
         for i, feature in enumerate(self.features):
-            card = FeatureCard(feature, self.installed_images)
+            card = FeatureCard(feature, self.installed_images, self.install_manager, self.lifecycle,
+                               self.telemetry, self.storage, self.warm_pool)
+            card.selection_changed.connect(self._update_selection_count)
             grid.addWidget(card, i // 2, i % 2)
             self._cards.append(card)
         
@@ -200,6 +636,56 @@ class StoreView(QWidget):
         layout.addWidget(scroll)
         self.setLayout(layout)
 
+    def refresh_installed_state(self):
+        """Re-sync every card's installed badge in one pass."""
+        self.setUpdatesEnabled(False)
+        for card in self._cards:
+            card.refresh_installed_state()
+        self.setUpdatesEnabled(True)
+
+    def toggle_selection_mode(self):
+        """Enter or leave the mode for picking apps to install as a batch."""
+        self.selection_mode = not self.selection_mode
+        self.select_btn.setText("Done" if self.selection_mode else "Select")
+        for card in self._cards:
+            card.set_selection_mode(self.selection_mode)
+        self._update_selection_count()
+
+    def _update_selection_count(self):
+        count = sum(1 for card in self._cards if card.is_selected())
+        self.install_selected_btn.setVisible(self.selection_mode)
+        self.install_selected_btn.setEnabled(count > 0)
+        self.install_selected_btn.setText(f"Install Selected ({count})" if count else "Install Selected")
+
+    def install_selected(self):
+        """Install the selected apps with one layer-aware batch."""
+        features = [card.feature for card in self._cards if card.is_selected()]
+        self.toggle_selection_mode()
+        if not features:
+            return
+        if len(features) == 1:
+            self.install_manager.submit(features[0].location, digest=features[0].digest,
+                                        resources=features[0].resources)
+            return
+        self.batch_label.setText("Planning batch install...")
+        self.install_manager.submit_batch(
+            [feature.location for feature in features],
+            {feature.image_name: feature.digest for feature in features},
+            {feature.image_name: feature.resources for feature in features}
+        )
+
+    def _on_batch_planned(self, plan):
+        self.batch_label.setText(f"Batch: {plan.describe()}")
+
+    def _on_batch_finished(self, report):
+        self.batch_label.setText(report.describe())
+
+    def _on_storage_report(self, report):
+        """Show storage use against the budget and what pruning reclaimed."""
+        self.storage_label.setText(report.describe())
+        if report.removed:
+            self.refresh_installed_state()
+
 
 class NavBar(QFrame):
     """A centered navigation bar with evenly distributed icons."""
@@ -323,18 +809,109 @@ class Dashboard(QWidget):
     def __init__(self, features: list, installed_images: set):
         super().__init__()
         self.setObjectName("Dashboard")
+        theme_manager.attach(self)
         self.features = features
         self.installed_images = installed_images
+        settings = load_settings()
+        self.install_manager = InstallManager(
+            self.installed_images,
+            max_workers=settings['install']['max_concurrent_jobs'],
+            parent=self
+        )
+        self.lifecycle = ContainerLifecycleService(self)
+        self.telemetry = TelemetryCollector(settings['telemetry'], self)
+        self.weather_service = WeatherService(settings['weather'], self)
+        self.clock_service = ClockService(settings['clock'], self)
+        self.warm_pool = WarmPool(self.lifecycle, settings['warm_pool'], self)
+        self.storage = ImageStorageManager(
+            self.installed_images,
+            {feature.image_name for feature in self.features if feature.image_name},
+            settings['storage'],
+            self
+        )
         self._setup_ui()
-        theme_manager.theme_changed.connect(self.update_styles)
+        self.lifecycle.container_changed.connect(self._on_container_changed)
+        self.lifecycle.start()
+        self._setup_reconciler(settings['reconcile']['interval_seconds'])
+        self._setup_prefetcher(settings['prefetch'])
+        self._setup_storage()
         # Set initial state without triggering a transition
         self.main_stack.setCurrentIndex(0)
         self.nav_bar.set_active_button('home')
-        self.update_styles()
     
-    def update_styles(self):
-        """Update the dashboard's style from the theme manager"""
-        self.setStyleSheet(theme_manager.get_stylesheet())
+    def _setup_reconciler(self, interval_seconds: int):
+        """Reconcile installed badges with Podman without blocking startup."""
+        self.reconciler = InstalledStateReconciler(interval_seconds, self)
+        self.reconciler.state_changed.connect(self._apply_podman_state)
+        self._last_install_finished = 0.0
+        self.install_manager.job_finished.connect(self._on_install_job_finished)
+        # Use the cached snapshot only if it is newer than the installed registry
+        cached = self.reconciler.state
+        if cached and (not os.path.exists(INSTALLED_FILE) or cached.timestamp >= os.path.getmtime(INSTALLED_FILE)):
+            self._apply_podman_state(cached)
+        QTimer.singleShot(0, self.reconciler.refresh)
+
+    def _setup_storage(self):
+        """Track app image use and keep image storage within its budget."""
+        self.install_manager.job_finished.connect(self._on_install_finished)
+        self.prefetcher.image_prefetched.connect(lambda _: self._enforce_storage_budget())
+        if self.storage.auto_prune:
+            QTimer.singleShot(0, self._enforce_storage_budget)
+
+    def _enforce_storage_budget(self):
+        if self.storage.auto_prune:
+            self.storage.enforce_budget(job.image_name for job in self.install_manager.active_jobs())
+
+    def _on_install_finished(self, image_name: str, success: bool, message: str):
+        if success:
+            self.storage.touch(image_name)
+            self._enforce_storage_budget()
+
+    def _setup_prefetcher(self, prefetch_settings: dict):
+        """Pre-pull likely installs while nobody is using the dashboard."""
+        self.prefetcher = ImagePrefetcher(self.features, self.installed_images, prefetch_settings, self)
+        self.prefetcher.add_busy_check(lambda: bool(self.install_manager.active_jobs()))
+        self.install_manager.job_changed.connect(lambda _: self.prefetcher.notify_activity())
+        app = QApplication.instance()
+        if app and prefetch_settings['enabled']:
+            app.installEventFilter(self.prefetcher)
+
+    def _apply_podman_state(self, state):
+        """Diff a PodmanState against the registry and update all cards at once."""
+        if state.timestamp < self._last_install_finished:
+            # Listed before an install finished, so it may be missing that app
+            self.reconciler.refresh()
+            return
+        catalog_images = {feature.image_name for feature in self.features if feature.image_name}
+        busy_images = {job.image_name for job in self.install_manager.active_jobs()}
+        before = set(self.installed_images)
+        if reconcile_installed(self.installed_images, catalog_images, state, busy_images):
+            update_installed_images(self.installed_images - before, before - self.installed_images)
+            self.store_view.refresh_installed_state()
+
+    def _on_install_job_finished(self, image_name: str, success: bool, message: str):
+        self._last_install_finished = time.time()
+
+    def _on_container_changed(self, container_name: str, info):
+        """Follow running containers with telemetry; a removed one means the app is no longer installed."""
+        self.telemetry.set_containers(
+            name for name, container in self.lifecycle.containers.items()
+            if container.status == CONTAINER_RUNNING
+        )
+        if info.image:
+            self.storage.set_running(info.image_name, info.status == CONTAINER_RUNNING)
+        if info.status != REMOVED:
+            return
+        self.telemetry.forget(container_name)
+        busy_images = {job.image_name for job in self.install_manager.active_jobs()}
+        for feature in self.features:
+            image_name = feature.image_name
+            if (image_name and container_name_for(image_name) == container_name
+                    and image_name in self.installed_images and image_name not in busy_images):
+                self.installed_images.discard(image_name)
+                update_installed_images(removed=[image_name])
+                self.store_view.refresh_installed_state()
+                return
 
     def _setup_ui(self):
         """Setup the dashboard UI"""
@@ -346,7 +923,7 @@ class Dashboard(QWidget):
         layout.setSpacing(0)
         
         # Top Bar
-        self.top_bar = TopBar()
+        self.top_bar = TopBar(self.weather_service, self.clock_service)
         
         # Main content area
         self.main_stack = QStackedWidget()
@@ -366,17 +943,18 @@ class Dashboard(QWidget):
         right_layout = QVBoxLayout(right_panel)
         right_layout.setContentsMargins(20, 20, 40, 40)
         
-        self.clock = ClockWidget()
+        self.clock = ClockWidget(self.clock_service)
         right_layout.addWidget(self.clock, alignment=Qt.AlignmentFlag.AlignCenter)
         
-        self.weather = WeatherWidget()
+        self.weather = WeatherWidget(self.weather_service)
         right_layout.addWidget(self.weather, alignment=Qt.AlignmentFlag.AlignCenter)
         
         right_layout.addStretch()
         self.dashboard_layout.addWidget(right_panel, 4) # Less space to widgets
         
         self.main_stack.addWidget(self.dashboard_view)
-        self.store_view = StoreView(self.features, self.installed_images, self)
+        self.store_view = StoreView(self.features, self.installed_images, self, self.install_manager,
+                                    self.lifecycle, self.telemetry, self.storage, self.warm_pool)
         self.main_stack.addWidget(self.store_view)
 
         layout.addWidget(self.top_bar)
@@ -389,7 +967,6 @@ class Dashboard(QWidget):
         layout.addWidget(self.nav_bar)
         
         self.setLayout(layout)
-        self.update_styles()
 
     def _slide_transition(self, next_index: int):
         current_widget = self.main_stack.currentWidget()
@@ -426,19 +1003,23 @@ class Dashboard(QWidget):
     
     def closeEvent(self, event):
         """Handle application close event to clean up resources."""
-        # Stop any running timers
-        if hasattr(self.clock, 'timer'):
-            self.clock.timer.stop()
-        if hasattr(self.weather, 'timer'):
-            self.weather.timer.stop()
-        
-        # Stop TopBar timers
-        if hasattr(self.top_bar, 'weather_timer'):
-            self.top_bar.weather_timer.stop()
-        # Stop the unnamed timer in TopBar
-        for child in self.top_bar.children():
-            if hasattr(child, 'timeout') and hasattr(child, 'stop'):
-                child.stop()
+        # Stop the recurring jobs: clocks, weather, reconcile
+        get_scheduler().stop()
+        
+        # Log viewers follow their stream on a thread each
+        for viewer in self.findChildren(LogViewerDialog):
+            viewer.close()
+
+        get_remote_icon_loader().shutdown()
+        get_disk_cache().flush()
+
+        # Cancel queued installs and wait for running workers
+        self.install_manager.shutdown()
+        self.reconciler.stop()
+        self.prefetcher.stop()
+        self.lifecycle.stop()
+        self.telemetry.stop()
+        self.storage.stop()
         
         # Accept the close event
         event.accept()
\ No newline at end of file
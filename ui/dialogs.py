@@ -4,13 +4,13 @@ Dialog components for the ADAS App Store
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QDialogButtonBox, QHBoxLayout, QPushButton, QWidget, QFrame, QProgressBar, QGraphicsDropShadowEffect
 )
-from PyQt6.QtGui import QPixmap, QFont, QIcon, QPainter, QColor
-from PyQt6.QtSvg import QSvgRenderer
-from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QByteArray, QTimer
+from PyQt6.QtGui import QPixmap, QFont, QIcon, QColor
+from PyQt6.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QByteArray, QTimer
 from models.feature import Feature
 from services.podman_service import PodmanWorker
 from .styles import theme_manager
-from .icon_utils import get_themed_icon
+from .icon_utils import get_themed_icon, get_tinted_pixmap
+from .remote_icons import get_remote_icon_loader
 import os
 
 
@@ -63,10 +63,11 @@ class DownloadInstallDialog(QDialog):
         self.setMinimumHeight(300)
         # Frameless window for a modern look
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Dialog)
+        self.setObjectName("DownloadInstallDialog")
+        theme_manager.attach(self)
         self.image_name = image_name
         self.worker = None
         self._setup_ui()
-        self.update_styles()
     
     def _setup_ui(self):
         """Setup the modern dialog UI"""
@@ -154,109 +155,29 @@ class DownloadInstallDialog(QDialog):
         self.result_fade_anim.setDuration(400)
         self.result_fade_anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
     
-    def update_styles(self):
-        """Update the dialog styles based on current theme"""
-        theme = theme_manager.theme
-        
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {theme['card_bg']};
-                color: {theme['text']};
-                border-radius: 16px;
-                border: 1px solid {theme['border']};
-            }}
-            
-            #DownloadTitle {{
-                font-size: 24px;
-                font-weight: bold;
-                color: {theme['text']};
-                margin-bottom: 4px;
-            }}
-            
-            #DownloadSubtitle {{
-                font-size: 14px;
-                color: {theme['text_secondary']};
-            }}
-            
-            #ProgressFrame {{
-                background-color: {theme['background']};
-                border-radius: 12px;
-                padding: 20px;
-                border: 1px solid {theme['border']};
-            }}
-            
-            #ProgressBar {{
-                border: 2px solid {theme['border']};
-                border-radius: 8px;
-                background-color: {theme['card_bg']};
-                height: 12px;
-                text-align: center;
-            }}
-            
-            #ProgressBar::chunk {{
-                background-color: {theme['accent']};
-                border-radius: 6px;
-                margin: 1px;
-            }}
-            
-            #StatusLabel {{
-                font-size: 16px;
-                font-weight: bold;
-                color: {theme['text']};
-                margin-top: 16px;
-            }}
-            
-            #ResultFrame {{
-                background-color: {theme['background']};
-                border-radius: 12px;
-                padding: 20px;
-                border: 1px solid {theme['border']};
-            }}
-            
-            #ResultMessage {{
-                font-size: 16px;
-                font-weight: bold;
-                margin-top: 12px;
-            }}
-            
-            #CancelButton, #CloseButton {{
-                background-color: {theme['accent']};
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 24px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 100px;
-            }}
-            
-            #CancelButton:hover, #CloseButton:hover {{
-                background-color: {theme['accent_hover']};
-            }}
-            
-            #CancelButton:pressed, #CloseButton:pressed {{
-                background-color: {theme['accent']};
-            }}
-        """)
-    
     def set_status(self, text: str):
-        """Update the status text - simplified to just show 'Downloading...'"""
-        # Keep it simple - just show "Downloading..." regardless of technical status
-        self.status_label.setText("Downloading...")
+        """Update the status text with the first line of the worker status"""
+        first_line = text.splitlines()[0] if text else "Downloading..."
+        self.status_label.setText(first_line)
+    
+    def set_progress(self, progress):
+        """Show pull percent, throughput and ETA from a PullProgress"""
+        if progress.total_bytes:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(progress.percent)
+        self.status_label.setText(f"Downloading {progress.describe()}")
     
     def colorize_svg_icon(self, svg_path, color, size=48):
         """Load an SVG icon and tint it with the given color, returning a QPixmap."""
-        renderer = QSvgRenderer(svg_path)
-        pixmap = QPixmap(size, size)
-        pixmap.fill(Qt.GlobalColor.transparent)
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        renderer.render(painter)
-        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
-        painter.fillRect(pixmap.rect(), QColor(color))
-        painter.end()
-        return pixmap
+        return get_tinted_pixmap(svg_path, QSize(size, size), color)
     
+    def _set_result_state(self, state: str):
+        """Color the result message for state through its dynamic property"""
+        self.result_message.setProperty("state", state)
+        style = self.result_message.style()
+        style.unpolish(self.result_message)
+        style.polish(self.result_message)
+
     def show_success(self, message: str):
         """Show success state"""
         self.progress_frame.setVisible(False)
@@ -274,15 +195,13 @@ class DownloadInstallDialog(QDialog):
             self.result_icon.setPixmap(get_themed_icon('resources/icons/hello.svg').pixmap(48, 48))
         
         self.result_message.setText("Downloaded and installed successfully!")
-        self.result_message.setStyleSheet(f"color: {theme_manager.theme['success']};")
+        self._set_result_state("success")
         
         self.cancel_button.setVisible(False)
         self.close_button.setVisible(True)
         
         self.title_label.setText("Installation Complete!")
-        self.title_label.setFont(QFont('Segoe UI', 24, QFont.Weight.Bold))
         self.subtitle_label.setText("Your ADAS service is ready to use.")
-        self.subtitle_label.setFont(QFont('Segoe UI', 14))
     
     def show_error(self, message: str):
         """Show error state"""
@@ -302,20 +221,19 @@ class DownloadInstallDialog(QDialog):
             self.result_icon.setPixmap(get_themed_icon('resources/icons/brake.svg').pixmap(48, 48))
         
         self.result_message.setText("Installation failed. Please try again.")
-        self.result_message.setStyleSheet(f"color: {error_color};")
+        self._set_result_state("error")
         
         self.cancel_button.setVisible(False)
         self.close_button.setVisible(True)
         
         self.title_label.setText("Installation Failed")
-        self.title_label.setFont(QFont('Segoe UI', 24, QFont.Weight.Bold))
         self.subtitle_label.setText("There was an issue with the installation.")
-        self.subtitle_label.setFont(QFont('Segoe UI', 14))
     
     def start_worker(self, url: str, main_window, on_finish_callback=None):
         """Start the Podman worker thread"""
         self.worker = PodmanWorker(url)
         self.worker.status_update.connect(self.set_status)
+        self.worker.progress_update.connect(self.set_progress)
         
         def on_finish(success: bool, msg: str):
             if success:
@@ -351,11 +269,19 @@ class InfoDialog(QDialog):
         self.feature = feature
         # Frameless window for a modern look
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Dialog)
+        self.setObjectName("InfoDialog")
+        theme_manager.attach(self)
         self.setModal(True)
         self.setMinimumWidth(700)
         self.setMinimumHeight(420)
         self._setup_ui()
-        self.update_styles()
+        self._update_icon()
+        if self._get_feature_icon_path().startswith('http'):
+            get_remote_icon_loader().icon_ready.connect(self._on_remote_icon)
+
+    def _on_remote_icon(self, url: str, path: str):
+        if path and url == self._get_feature_icon_path():
+            self.icon_label.setPixmap(get_themed_icon(url).pixmap(90, 90))
 
     def _get_feature_icon_path(self) -> str:
         # First, try to use the icon field from the feature
@@ -435,57 +361,154 @@ class InfoDialog(QDialog):
         close_button.setMinimumHeight(44)
         layout.addWidget(close_button, alignment=Qt.AlignmentFlag.AlignCenter)
 
-    def update_styles(self):
-        theme = theme_manager.theme
-        icon_path = self._get_feature_icon_path()
-        themed_icon = get_themed_icon(icon_path)
-        self.icon_label.setPixmap(themed_icon.pixmap(90, 90))
-        self.setStyleSheet(f"""
-            QDialog {{
-                background-color: {theme['card_bg']};
-                color: {theme['text']};
-                border-radius: 28px;
-                border: none;
-                padding: 0px;
-            }}
-            #IconCircle {{
-                background-color: {theme['background']};
-                border-radius: 70px;
-                border: 2px solid {theme['border']};
-            }}
-            #InfoTitle {{
-                font-size: 32px;
-                font-weight: bold;
-                color: {theme['text']};
-                margin-bottom: 8px;
-            }}
-            #InfoShortDescription {{
-                font-size: 18px;
-                font-style: italic;
-                color: {theme['text_secondary']};
-                margin-bottom: 12px;
-            }}
-            #Separator {{
-                background-color: {theme['accent']};
-                height: 2px;
-                margin: 10px 0 18px 0;
-            }}
-            #InfoLongDescription {{
-                font-size: 16px;
-                color: {theme['text']};
-                margin-bottom: 10px;
-            }}
-            #CloseButton {{
-                background-color: {theme['accent']};
-                color: white;
-                border: none;
-                border-radius: 12px;
-                padding: 14px 36px;
-                font-size: 18px;
-                font-weight: bold;
-                min-width: 180px;
-            }}
-            #CloseButton:hover {{
-                background-color: {theme['accent_hover']};
-            }}
-        """) 
\ No newline at end of file
+    def _update_icon(self):
+        self.icon_label.setPixmap(get_themed_icon(self._get_feature_icon_path()).pixmap(90, 90))
+
+
+def _download_dialog_stylesheet(theme: dict) -> str:
+    """The download dialog's stylesheet section for a theme."""
+    return f"""
+        QDialog#DownloadInstallDialog {{
+            background-color: {theme['card_bg']};
+            color: {theme['text']};
+            border-radius: 16px;
+            border: 1px solid {theme['border']};
+        }}
+        
+        #DownloadInstallDialog #DownloadTitle {{
+            font-size: 24px;
+            font-weight: bold;
+            color: {theme['text']};
+            margin-bottom: 4px;
+        }}
+        
+        #DownloadInstallDialog #DownloadSubtitle {{
+            font-size: 14px;
+            color: {theme['text_secondary']};
+        }}
+        
+        #DownloadInstallDialog #ProgressFrame {{
+            background-color: {theme['background']};
+            border-radius: 12px;
+            padding: 20px;
+            border: 1px solid {theme['border']};
+        }}
+        
+        #DownloadInstallDialog #ProgressBar {{
+            border: 2px solid {theme['border']};
+            border-radius: 8px;
+            background-color: {theme['card_bg']};
+            height: 12px;
+            text-align: center;
+        }}
+        
+        #DownloadInstallDialog #ProgressBar::chunk {{
+            background-color: {theme['accent']};
+            border-radius: 6px;
+            margin: 1px;
+        }}
+        
+        #DownloadInstallDialog #StatusLabel {{
+            font-size: 16px;
+            font-weight: bold;
+            color: {theme['text']};
+            margin-top: 16px;
+        }}
+        
+        #DownloadInstallDialog #ResultFrame {{
+            background-color: {theme['background']};
+            border-radius: 12px;
+            padding: 20px;
+            border: 1px solid {theme['border']};
+        }}
+        
+        #DownloadInstallDialog #ResultMessage {{
+            font-size: 16px;
+            font-weight: bold;
+            margin-top: 12px;
+        }}
+
+        #DownloadInstallDialog #ResultMessage[state="success"] {{
+            color: {theme['success']};
+        }}
+
+        #DownloadInstallDialog #ResultMessage[state="error"] {{
+            color: {theme.get('error', '#ff6b6b')};
+        }}
+        
+        #DownloadInstallDialog #CancelButton, #DownloadInstallDialog #CloseButton {{
+            background-color: {theme['accent']};
+            color: white;
+            border: none;
+            border-radius: 8px;
+            padding: 10px 24px;
+            font-size: 14px;
+            font-weight: bold;
+            min-width: 100px;
+        }}
+        
+        #DownloadInstallDialog #CancelButton:hover, #DownloadInstallDialog #CloseButton:hover {{
+            background-color: {theme['accent_hover']};
+        }}
+        
+        #DownloadInstallDialog #CancelButton:pressed, #DownloadInstallDialog #CloseButton:pressed {{
+            background-color: {theme['accent']};
+        }}
+    """
+
+
+def _info_dialog_stylesheet(theme: dict) -> str:
+    """The info dialog's stylesheet section for a theme."""
+    return f"""
+        QDialog#InfoDialog {{
+            background-color: {theme['card_bg']};
+            color: {theme['text']};
+            border-radius: 28px;
+            border: none;
+            padding: 0px;
+        }}
+        #InfoDialog #IconCircle {{
+            background-color: {theme['background']};
+            border-radius: 70px;
+            border: 2px solid {theme['border']};
+        }}
+        #InfoDialog #InfoTitle {{
+            font-size: 32px;
+            font-weight: bold;
+            color: {theme['text']};
+            margin-bottom: 8px;
+        }}
+        #InfoDialog #InfoShortDescription {{
+            font-size: 18px;
+            font-style: italic;
+            color: {theme['text_secondary']};
+            margin-bottom: 12px;
+        }}
+        #InfoDialog #Separator {{
+            background-color: {theme['accent']};
+            height: 2px;
+            margin: 10px 0 18px 0;
+        }}
+        #InfoDialog #InfoLongDescription {{
+            font-size: 16px;
+            color: {theme['text']};
+            margin-bottom: 10px;
+        }}
+        #InfoDialog #CloseButton {{
+            background-color: {theme['accent']};
+            color: white;
+            border: none;
+            border-radius: 12px;
+            padding: 14px 36px;
+            font-size: 18px;
+            font-weight: bold;
+            min-width: 180px;
+        }}
+        #InfoDialog #CloseButton:hover {{
+            background-color: {theme['accent_hover']};
+        }}
+    """
+
+
+theme_manager.register_stylesheet('DownloadInstallDialog', _download_dialog_stylesheet)
+theme_manager.register_stylesheet('InfoDialog', _info_dialog_stylesheet)
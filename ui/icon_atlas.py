@@ -0,0 +1,184 @@
+"""
+Pre-rendered atlas of the themed icons, one PNG per theme and pixel ratio
+"""
+import hashlib
+import json
+import math
+import os
+from typing import Callable, Dict, Optional
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QIcon, QImage, QImageReader, QPainter, QPixmap
+
+# Square sizes the UI shows icons at (logical pixels)
+ATLAS_SIZES = (32, 48, 64)
+
+# Bump when the atlas layout or index format changes
+ATLAS_VERSION = 1
+
+ICONS_DIR = 'resources/icons'
+ATLAS_DIR = 'resources/cache'
+
+# PNG text chunk holding the index, so the atlas is a single file
+_INDEX_KEY = 'adas-icon-atlas'
+
+
+def atlas_path(theme_name: str, dpr: float) -> str:
+    return os.path.join(ATLAS_DIR, f'icon_atlas_{theme_name}@{dpr:g}x.png')
+
+
+def is_atlas_icon(icon_path: str) -> bool:
+    """True for the bundled SVGs the atlas is built from."""
+    return (icon_path.endswith('.svg')
+            and os.path.normpath(os.path.dirname(icon_path)) == os.path.normpath(ICONS_DIR))
+
+
+def _source_files() -> Dict[str, list]:
+    """{file name: [mtime_ns, size]} of every SVG in ICONS_DIR"""
+    sources = {}
+    for name in sorted(os.listdir(ICONS_DIR)):
+        if name.endswith('.svg'):
+            stat = os.stat(os.path.join(ICONS_DIR, name))
+            sources[name] = [stat.st_mtime_ns, stat.st_size]
+    return sources
+
+
+def _fingerprint(color: str, dpr: float, sources: Dict[str, list]) -> str:
+    data = json.dumps([ATLAS_VERSION, list(ATLAS_SIZES), color, dpr, sources], sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class IconAtlas:
+    """
+    Every icon in ICONS_DIR rendered at ATLAS_SIZES for one theme color,
+    packed into one image. The index (a PNG text chunk) maps each icon and
+    size to its rectangle and records the SVG's mtime, so slices of a file
+    edited since the build are refused and rendered normally instead.
+    """
+
+    def __init__(self, pixmap: QPixmap, index: dict):
+        self.pixmap = pixmap
+        self.index = index
+        self.dpr = index['dpr']
+
+    def slice(self, icon_path: str, size: int) -> Optional[QPixmap]:
+        """The icon at one of ATLAS_SIZES, or None if absent or out of date."""
+        entry = self._entry(icon_path)
+        if entry is None or str(size) not in entry['rects']:
+            return None
+        pixmap = self.pixmap.copy(QRect(*entry['rects'][str(size)]))
+        pixmap.setDevicePixelRatio(self.dpr)
+        return pixmap
+
+    def icon(self, icon_path: str) -> Optional[QIcon]:
+        """A QIcon carrying every atlas size of the icon, or None."""
+        if self._entry(icon_path) is None:
+            return None
+        icon = QIcon()
+        for size in ATLAS_SIZES:
+            pixmap = self.slice(icon_path, size)
+            if pixmap is not None:
+                icon.addPixmap(pixmap)
+        return icon if not icon.isNull() else None
+
+    def _entry(self, icon_path: str) -> Optional[dict]:
+        name = os.path.basename(icon_path)
+        entry = self.index['icons'].get(name)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(os.path.join(ICONS_DIR, name))
+        except OSError:
+            return None
+        if [stat.st_mtime_ns, stat.st_size] != entry['source']:
+            return None
+        return entry
+
+    @classmethod
+    def load(cls, path: str, color: str, dpr: float) -> Optional['IconAtlas']:
+        """The atlas saved at path, or None if missing or built from other SVGs or colors."""
+        if not os.path.exists(path):
+            return None
+        reader = QImageReader(path)
+        try:
+            index = json.loads(reader.text(_INDEX_KEY) or '{}')
+        except ValueError:
+            return None
+        if index.get('fingerprint') != _fingerprint(color, dpr, _source_files()):
+            return None
+        image = reader.read()
+        if image.isNull():
+            return None
+        return cls(QPixmap.fromImage(image), index)
+
+    @classmethod
+    def build(cls, color: str, dpr: float, render: Callable[[str, int], Optional[QPixmap]]) -> 'IconAtlas':
+        """
+        Render every icon with render(path, size), which returns a pixmap
+        fitting size x size at dpr, and shelf-pack the results.
+        """
+        sources = _source_files()
+        rendered = []
+        for name in sources:
+            for size in ATLAS_SIZES:
+                pixmap = render(os.path.join(ICONS_DIR, name), size)
+                if pixmap is not None and not pixmap.isNull():
+                    image = pixmap.toImage()
+                    # Pack in physical pixels
+                    image.setDevicePixelRatio(1.0)
+                    rendered.append((name, size, image))
+
+        # Roughly square, so loading decodes few empty pixels
+        area = sum(image.width() * image.height() for _, _, image in rendered)
+        width = max([math.ceil(math.sqrt(area) * 1.1)] + [image.width() for _, _, image in rendered])
+        cells, icons = [], {}
+        x = y = row_height = 0
+        # Tallest first, so each shelf wastes little height
+        for name, size, image in sorted(rendered, key=lambda cell: -cell[2].height()):
+            if x + image.width() > width:
+                x, y, row_height = 0, y + row_height, 0
+            cells.append((x, y, image))
+            entry = icons.setdefault(name, {'source': sources[name], 'rects': {}})
+            entry['rects'][str(size)] = [x, y, image.width(), image.height()]
+            x += image.width()
+            row_height = max(row_height, image.height())
+
+        atlas = QImage(width, max(1, y + row_height), QImage.Format.Format_ARGB32_Premultiplied)
+        atlas.fill(0)
+        painter = QPainter(atlas)
+        for cell_x, cell_y, image in cells:
+            painter.drawImage(cell_x, cell_y, image)
+        painter.end()
+
+        index = {
+            'version': ATLAS_VERSION,
+            'fingerprint': _fingerprint(color, dpr, sources),
+            'color': color,
+            'dpr': dpr,
+            'icons': icons,
+        }
+        return cls(QPixmap.fromImage(atlas), index)
+
+    def save(self, path: str):
+        """Write the atlas and its index atomically."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        image = self.pixmap.toImage()
+        image.setText(_INDEX_KEY, json.dumps(self.index))
+        tmp_path = path + '.tmp'
+        if not image.save(tmp_path, 'PNG'):
+            raise OSError(f"could not write {tmp_path}")
+        os.replace(tmp_path, path)
+
+
+def load_or_build_atlas(theme_name: str, color: str, dpr: float,
+                        render: Callable[[str, int], Optional[QPixmap]]) -> IconAtlas:
+    """The saved atlas for the theme, rebuilt and saved first if it is missing or stale."""
+    path = atlas_path(theme_name, dpr)
+    atlas = IconAtlas.load(path, color, dpr)
+    if atlas is not None:
+        return atlas
+    atlas = IconAtlas.build(color, dpr, render)
+    try:
+        atlas.save(path)
+    except Exception as e:
+        print(f"Failed to save icon atlas {path}: {e}")
+    return atlas
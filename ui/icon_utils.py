@@ -1,110 +1,190 @@
 """
 Utilities for handling themed SVG icons.
 """
-from PyQt6.QtGui import QIcon, QPixmap, QPainter
+from PyQt6.QtGui import QGuiApplication, QIcon, QPixmap, QPainter
 from PyQt6.QtSvg import QSvgRenderer
-from PyQt6.QtCore import QByteArray, Qt, QSize
-from .styles import theme_manager
-import requests
+from PyQt6.QtCore import Qt, QSize
+from utils.disk_cache import get_disk_cache
+from utils.file_utils import load_settings
+from .icon_atlas import IconAtlas, is_atlas_icon, load_or_build_atlas
+from .remote_icons import get_remote_icon_loader
+from .styles import DAY_THEME, NIGHT_THEME, theme_manager
+from .svg_templates import THEMED, TINT, get_svg_template
+from collections import OrderedDict
 import os
 import base64
 import re
-import hashlib
-from urllib.parse import urlparse
 
-def decode_and_save_base64_image(base64_data: str, cache_dir: str = 'resources/cache') -> str:
-    """Decode a base64 data URL and save it as a cached image"""
+def decode_and_save_base64_image(base64_data: str) -> str:
+    """Decode a base64 data URL into the disk cache and return its path"""
     try:
-        # Create cache directory if it doesn't exist
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        # Extract the base64 data from the data URL
-        # Format: data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAOEAAADhCAMAAAAJbSJIAAAAflBMVEX///8AAADy8vKDg4Ojo6Pa2tpdXV3v7+/39/f7+/vk5OSoqKifn5/c3NzIyMi4uLiVlZXBwcE7OzsmJibS0tKOjo6urq4rKyt5eXlRUVFKSkpycnJqamqxsbHp6emZmZkODg5ZWVkyMjIXFxdEREQ/Pz8eHh4TExNNTU1+fn7rnAwgAAAIXElEQVR4nO2daXcaOwyG2cIwJIEQICErW0ra//8Hb0NvCsm8smVJtuf0+PnceiQyY2t3p1MoFAqFQqFQKBQKhUKhIGFUVa/j69eq6o1yi2LOeHbz9Dbvnpg/9AeTf0TP0aR/2yW4X72Mc8unpJ4OKe3+sprkllLO5Nmr3h9+LXKLKqG+nPtVO72vd7nlDaW+CVDvD1e5ZQ5iEKzfB5e5xWYzE+n3m/dZbtFZvD5IFfzNtsotvp8rhX4ftP1zrB6VCna7D602dSZq/T5o8ekYfkRgWrup+i00Lv3cqkBGpIEtYJhbG0DvYKjg7/0mtz4Neu+mCrZPRXMFu93H3Dp9heVHvK2WN1dXN8v+0z3nn7fqW/Se89urxVd7rJr1f/j+U4t21Ce3pM+EFz+6e3P/x5e0atBcuqQ8DFxW2LjvVLEl1s2FS7+p73/XTlO9TqGAlw0tIMv8qpf0As+xhedAf4TDHnOJ6ie5hvcdiA/tToQEl+7IVbi/Ujwoye5fg5YZ76kXIZLcbCiHKViwmjpTM++nFSHWL8FaxAd9ay40n9cBFXRaitZb4cVybTbVmvYHZQpSKm4MpeYzcfnzT+Jlt3C9DMbbpdNX+qlYGfoo92aCM3GaoV2dpfUKV0ybf5s6jLQjut0d/nwpz8Sxx9+RnRPnwO05Xazf7et8sNE+Ap6wA73oLMaMWIX+8EK/4g8D6RnQ1rGpKCO0bpLXlJWUt9j1kLuYIAlee7cYoz9hp9MDC8ffTSteRNvm4EJvi8nCDsYs/bpbm6ctwNLXNktTYEujwdwqbgTWjmubMhXcmSVvgacYNTqMvnyA4ak8ba5+iOnq77zKzYdr0zoR+NI8R4tJec7BTX9m/2j8qEjVNu7qkeVFlIcS/rU0duAE7dyfzKNZGkTEpvsWoRKFCmN2o1ZMkC/Ou7mBSv2Ykd6YT17o39W4qJh8R/dxvr9PXJVHtipS2ejYKSEq0HzE8kWlPMK14TMwrtqcg+F2QzwiQRAaWDUn7OL8ROYySZmrs/ZBHnL+Sp3tL9jxGcNGMuDIb6oK18pZcxOWnKSAbn3CxLojvd/dWTwA1qMnTSG4yjQsXiVo/aZuU6L/jvpTEYYt4x+E3xlTJ6M+JoRMw72ByMFQprHa6d+CRfM0fBDZPG11JjqPTDYwAYSBowzOIus+W6kgdqaUVcSoTsZGXAl4S9VFiUGiUpv71LBFGq5US4IFcxYnYRtZE2MHiYqNkbAyoIWl2dtB+CJzCR0ysTQigTMoVS6dAKa/FK8p2LxyN5Uj20axNYBQfu7ZAOiPqAhpbk3fCBvAAaYoMANZeztRhSDjTb4a8FnsRBWC/Dn5p9PMGW7MJBUDKvrlJyLIihqKKmTdFEoezGjjW4rsGvlm2sadBp0X8tAfsJFsQpQagPktd/R/NRdrQR9ZUyh5mRlwgFvQJN8USh5YAXGDnA7w/zQLsOUaAu9pbiiqkKZQ8kQbsh/ybzVNmRQhRVCRn32UE4hwKnxg4D7lbLE6ct2USZErRYHm3B4icC4UDiL4vbL3xwMvXxOkRq1Nmaf/gGYIjRmCwiJR66C8oDCGpiwSliVlbTtGoX3VgkjDrO3x5vIA4ztrSBEloHTZMLSb5txsUGmI8vyCXTJvNuKGg0YxHpRr4vGHmfZTWK2olgU34+XJX8DGS7WRRVTq5nCF4egGgy+G6KhMP7wRfzAGzg41iDS1u08UY1tkUqipENukaRqi6vvGYm26pyth5I2qxbb5lelplslcKWhbWf0JO86S8iQFRBdk/7jVE1zdo7voBdEjegiV3bOdVfObQUx/qnIMODBqyD1CNwYdGU4j9crPnANfTR/qHYq4W91dmz6xWqw9I7Nt94CaNyB/v3scGvBwy3icrqKtCbMROB32ha7MZu5kRPjy26VilOkDxnOQVURqfay9E2NTES8Yxr1SJTIxm1d9M76SEDc7dOFo7E5DjG71r1CeTCJSeGyLnHtqooC79g4SMU/JIie9LK/qLmnBUuVxqOzZJ59h2rO6jYRF/FgCxO2gGkLNrE/AiHExnpbtNHcB/WK9jabd47Itd0D2JpfL1cPusPdNNuWx2R9uV+tZ5AFthUKhUCgU/n3Gd+s+i6spkVxbDJa8FdSs78JjU7OQm4q7D03rSnAXsIp5YIue5/6tJt/z6eSNMfEIqmcX3JT6tboMlzRGJqDtQhSDOX9LahsHIxR2DRNzqvV3zlZwDeiKCXe/EYaYzuIotnLz4WaFha/Yqdza5kJgAe88BZ1DNR2c2toSHxRn8PLCrnv+nPxdwX/FRyx4WTdpMvs05SzXRsPtHZQWXZy6cVG9eRqYxVnCVPbpzBceN3q4FdGci1YAZ4eR5dXVIbArokXHxXlvjmvCeUSYh4VQwM2XyHTyvNSRgNwbVbzu4NsuFuycGBDkP12zbpQ+sW1sYsn30/vQDEBI3myFXo+R42pEe4ayGTU9Fo4FRrwV1Ii0KxQKhUKhgKlmLwMtl/76it5k6lrhZRbrLsuZlRX27uy+XjAC7rcxpqbXWyP9jtARI6ZTYt+/ymwKYkOVqbEzJmbXLH7i6bEKBwfgA9xK5TD27zj7D0VAAYOCC7bVmIEOMQe0pQaVOZrelBKj4wn0KBP3ElFYjo6zf0lhh2tgBMzyNY1Rmg8GvwUGwCynj8RoBQI56cCsnOXwEUF00QsYBRiY9bIs/Y7RIYvesbAVTANQ5gc+TmYGhcotm/EVWVMSWDcRlH427kG0bgLa4wL8gE3bvIXNtnl0Q53W7PRxhLF4YBa6mEe6hYKZvIxyM1rVN2o7HDq3+dGN1wg+9GN5+Z1qfKHluvK3wLgfM46mXqFQKBQKhUKhUCgUCoUW8x8uHHRjs6/YMQAAAABJRU5ErkJggg==
-        
-        # Parse the data URL
+        cache = get_disk_cache()
+        cache_path = cache.get(base64_data)
+        if cache_path:
+            return cache_path
+
+        # Parse the data URL (data:image/png;base64,...)
         match = re.match(r'data:image/(\w+);base64,(.+)', base64_data)
         if not match:
             raise ValueError("Invalid base64 data URL format")
-        
+
         image_type, base64_string = match.groups()
-        
-        # Generate a unique filename based on the content hash using MD5
-        content_hash = hashlib.md5(base64_string.encode('utf-8')).hexdigest()[:8]
-        filename = f"base64_{content_hash}.{image_type}"
-        cache_path = os.path.join(cache_dir, filename)
-        
-        # Check if already cached
-        if os.path.exists(cache_path):
-            return cache_path
-        
-        # Decode and save the image
-        image_data = base64.b64decode(base64_string)
-        with open(cache_path, 'wb') as f:
-            f.write(image_data)
-        
-        return cache_path
+        return cache.put(base64_data, base64.b64decode(base64_string), f'.{image_type}')
     except Exception as e:
         print(f"Failed to decode base64 image: {e}")
         return None
 
-def download_and_cache_image(url: str, cache_dir: str = 'resources/cache') -> str:
-    """Download an image from URL and cache it locally"""
+def _svg_renderer(icon_path: str, color: str | None, mode: str = THEMED) -> QSvgRenderer | None:
+    """The compiled renderer of an SVG in color (None keeps its own colors), or None."""
+    template = get_svg_template(icon_path)
+    if template is None:
+        return None
+    renderer = template.renderer(color, mode)
+    return renderer if renderer.isValid() else None
+
+def _device_pixel_ratio() -> float:
+    app = QGuiApplication.instance()
+    return app.devicePixelRatio() if app is not None else 1.0
+
+def _file_mtime(path: str) -> int | None:
     try:
-        # Create cache directory if it doesn't exist
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        # Generate cache filename from URL using MD5 hash for consistency
-        url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()[:8]
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
-        if not filename or '.' not in filename:
-            filename = f"cached_{url_hash}.png"
-        else:
-            # Keep original extension but use hash for uniqueness
-            name, ext = os.path.splitext(filename)
-            filename = f"{name}_{url_hash}{ext}"
-        
-        cache_path = os.path.join(cache_dir, filename)
-        
-        # Check if already cached
-        if os.path.exists(cache_path):
-            return cache_path
-        
-        # Download the image
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        # Save to cache
-        with open(cache_path, 'wb') as f:
-            f.write(response.content)
-        
-        return cache_path
-    except Exception as e:
-        print(f"Failed to download image from {url}: {e}")
+        return os.stat(path).st_mtime_ns
+    except OSError:
         return None
 
-def _get_svg_data_with_color(icon_path: str, color: str | None = None) -> bytes:
-    """Reads an SVG file and replaces its color with the provided color or the theme's text color, unless it's weather-clear.svg."""
-    # Do not recolor weather-clear.svg so it stays yellow
-    if icon_path.endswith("weather-clear.svg"):
+class IconCache:
+    """
+    Bounded LRU of rendered icons and pixmaps keyed by (path, color, size,
+    device pixel ratio). Each entry remembers its file's mtime, so an edited
+    SVG is rendered again on the next lookup. GUI thread only, like the
+    pixmaps it holds.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0  # Misses caused by a changed file
+        self.evictions = 0
+
+    def get(self, key: tuple, render):
+        """The cached value for key, calling render() on a miss."""
+        mtime = _file_mtime(key[0])
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.invalidations += 1
+        self.misses += 1
+        value = render()
+        self._entries[key] = (mtime, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+_icon_cache: IconCache | None = None
+
+def get_icon_cache() -> IconCache:
+    """The process-wide IconCache, sized from settings on first use."""
+    global _icon_cache
+    if _icon_cache is None:
+        _icon_cache = IconCache(load_settings()['icons']['memory_cache_entries'])
+    return _icon_cache
+
+_THEMES = {'day': DAY_THEME, 'night': NIGHT_THEME}
+_icon_atlases: dict = {}
+
+def get_icon_atlas(theme_name: str | None = None) -> IconAtlas | None:
+    """
+    The icon atlas of a theme (default: the current one) at the screen's
+    pixel ratio, loaded or built on first use. None when icons.atlas_enabled
+    is off or the atlas cannot be built.
+    """
+    if theme_name is None:
+        theme_name = 'day' if theme_manager.is_day_mode() else 'night'
+    dpr = _device_pixel_ratio()
+    key = (theme_name, dpr)
+    if key not in _icon_atlases:
+        if not load_settings()['icons']['atlas_enabled']:
+            _icon_atlases[key] = None
+            return None
+        color = _THEMES[theme_name]['text']
+
+        def render(icon_path: str, size: int) -> QPixmap | None:
+            renderer = _svg_renderer(icon_path, _icon_color(icon_path, color))
+            if renderer is None:
+                return None
+            return _render_svg(renderer, QSize(size, size), dpr, keep_aspect=True)
+
         try:
-            with open(icon_path, 'r', encoding='utf-8') as f:
-                return f.read().encode('utf-8')
-        except FileNotFoundError:
-            print(f"Warning: Icon SVG not found at {icon_path}")
-            return b''
-    if color is None:
-        color = theme_manager.theme["text"]
-    try:
-        with open(icon_path, 'r', encoding='utf-8') as f:
-            svg_data = f.read()
-        themed_svg_data = svg_data.replace('stroke="white"', f'stroke="{color}"')
-        themed_svg_data = themed_svg_data.replace('stroke="#FFFFFF"', f'stroke="{color}"')
-        themed_svg_data = themed_svg_data.replace('fill="currentColor"', f'fill="{color}"')
-        return themed_svg_data.encode('utf-8')
-    except FileNotFoundError:
-        print(f"Warning: Icon SVG not found at {icon_path}")
-        return b''
+            _icon_atlases[key] = load_or_build_atlas(theme_name, color, dpr, render)
+        except Exception as e:
+            print(f"Icon atlas unavailable, rendering icons directly: {e}")
+            _icon_atlases[key] = None
+    return _icon_atlases[key]
+
+def _atlas_for(icon_path: str, color: str | None) -> IconAtlas | None:
+    """The current theme's atlas if it holds this icon in this color."""
+    if not is_atlas_icon(icon_path):
+        return None
+    if color is not None and color != theme_manager.theme['text']:
+        return None
+    return get_icon_atlas()
+
+def _icon_color(icon_path: str, color: str | None) -> str | None:
+    """The color an SVG is rendered in; None for files that are not recolored."""
+    if icon_path.endswith("weather-clear.svg"):
+        return None
+    return color if color is not None else theme_manager.theme["text"]
+
+def _load_image_icon(image_path: str) -> QIcon:
+    """A raster icon (downloaded or decoded) as a QIcon, or a null QIcon."""
+    def render():
+        pixmap = QPixmap(image_path)
+        return QIcon(pixmap) if not pixmap.isNull() else QIcon()
+    return QIcon(get_icon_cache().get((image_path, None, None, _device_pixel_ratio()), render))
+
+def _render_svg(renderer: QSvgRenderer | None, size: QSize | None, dpr: float,
+                keep_aspect: bool = False) -> QPixmap | None:
+    """
+    Paint a compiled SVG at size (default: the SVG's own size) for the
+    given pixel ratio. With keep_aspect the result fits inside size
+    instead. Without a renderer the pixmap stays transparent.
+    """
+    if size is None:
+        if renderer is None or not renderer.defaultSize().isValid():
+            return None
+        size = renderer.defaultSize()
+    elif keep_aspect and renderer is not None and renderer.defaultSize().isValid():
+        size = renderer.defaultSize().scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
+    pixmap = QPixmap(QSize(round(size.width() * dpr), round(size.height() * dpr)))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    if renderer is not None:
+        painter = QPainter(pixmap)
+        renderer.render(painter)
+        painter.end()
+    return pixmap
 
 def get_themed_icon(icon_path: str, color_override: str | None = None) -> QIcon:
     """Loads a themed SVG icon as a QIcon, with an optional color override."""
@@ -113,53 +193,78 @@ def get_themed_icon(icon_path: str, color_override: str | None = None) -> QIcon:
         cached_path = decode_and_save_base64_image(icon_path)
         if cached_path:
             # Load as regular image (not SVG)
-            pixmap = QPixmap(cached_path)
-            if not pixmap.isNull():
-                return QIcon(pixmap)
+            icon = _load_image_icon(cached_path)
+            if not icon.isNull():
+                return icon
+            # Unreadable file: decode it again next time
+            get_disk_cache().discard(icon_path)
         # Fallback to default icon if decode fails
         return get_themed_icon('resources/icons/store.svg')
     
-    # Handle remote URLs
+    # Handle remote URLs; never download on the GUI thread
     if icon_path.startswith('http'):
-        cached_path = download_and_cache_image(icon_path)
+        cached_path = get_disk_cache().get(icon_path)
         if cached_path:
             # Load as regular image (not SVG)
-            pixmap = QPixmap(cached_path)
-            if not pixmap.isNull():
-                return QIcon(pixmap)
-        # Fallback to default icon if download fails
+            icon = _load_image_icon(cached_path)
+            if not icon.isNull():
+                return icon
+            # Unreadable file: fetch it again
+            get_disk_cache().discard(icon_path)
+        # RemoteIconLoader.icon_ready tells callers when to ask again
+        get_remote_icon_loader().request(icon_path)
+        # Placeholder while downloading, or if the download failed
         return get_themed_icon('resources/icons/store.svg')
     
     # Handle local SVG files
-    themed_svg_bytes = _get_svg_data_with_color(icon_path, color_override)
-    if not themed_svg_bytes:
-        return QIcon()
-
-    renderer = QSvgRenderer(QByteArray(themed_svg_bytes))
-    size = renderer.defaultSize()
-    if not size.isValid():
-        return QIcon()
-        
-    pixmap = QPixmap(size)
-    pixmap.fill(Qt.GlobalColor.transparent)
-    painter = QPainter(pixmap)
-    renderer.render(painter)
-    painter.end()
+    color = _icon_color(icon_path, color_override)
 
-    return QIcon(pixmap)
+    def render():
+        # Atlas icons carry every size the UI uses, so pixmap(64, 64) is not an upscale
+        atlas = _atlas_for(icon_path, color)
+        icon = atlas.icon(icon_path) if atlas is not None else None
+        if icon is not None:
+            return icon
+        pixmap = _render_svg(_svg_renderer(icon_path, color), None, dpr)
+        return QIcon(pixmap) if pixmap is not None else QIcon()
+
+    dpr = _device_pixel_ratio()
+    # QIcon and QPixmap are implicitly shared: the copy is cheap and callers cannot alter the cached one
+    return QIcon(get_icon_cache().get((icon_path, color, None, dpr), render))
 
 def get_themed_pixmap(icon_path: str, size: QSize, color_override: str | None = None) -> QPixmap:
     """Loads a themed SVG icon as a QPixmap of a specific size."""
-    themed_svg_bytes = _get_svg_data_with_color(icon_path, color_override)
-    pixmap = QPixmap(size)
-    pixmap.fill(Qt.GlobalColor.transparent)
+    color = _icon_color(icon_path, color_override)
+
+    def render():
+        if size.width() == size.height():
+            atlas = _atlas_for(icon_path, color)
+            pixmap = atlas.slice(icon_path, size.width()) if atlas is not None else None
+            # Slices keep the icon's aspect ratio; use them only when that fills size
+            if pixmap is not None and pixmap.deviceIndependentSize().toSize() == size:
+                return pixmap
+        return _render_svg(_svg_renderer(icon_path, color), size, dpr)
+
+    dpr = _device_pixel_ratio()
+    key = (icon_path, color, (size.width(), size.height()), dpr)
+    return QPixmap(get_icon_cache().get(key, render))
 
-    if not themed_svg_bytes:
-        return pixmap
+def get_tinted_pixmap(icon_path: str, size: QSize, color: str) -> QPixmap:
+    """An SVG icon as a QPixmap of a specific size with everything it paints in one color."""
+    def render():
+        return _render_svg(_svg_renderer(icon_path, color, TINT), size, dpr)
 
-    renderer = QSvgRenderer(QByteArray(themed_svg_bytes))
-    painter = QPainter(pixmap)
-    renderer.render(painter)
-    painter.end()
+    dpr = _device_pixel_ratio()
+    key = (icon_path, (TINT, color), (size.width(), size.height()), dpr)
+    return QPixmap(get_icon_cache().get(key, render))
 
-    return pixmap 
\ No newline at end of file
+if __name__ == '__main__':
+    # Build step: python -m ui.icon_utils pre-renders the atlases of both themes
+    import sys
+    app = QGuiApplication(sys.argv)
+    for name in _THEMES:
+        atlas = get_icon_atlas(name)
+        if atlas is None:
+            sys.exit("Icon atlas is disabled (icons.atlas_enabled)")
+        print(f"{name}: {len(atlas.index['icons'])} icons, "
+              f"{atlas.pixmap.width()}x{atlas.pixmap.height()} px")
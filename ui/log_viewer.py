@@ -0,0 +1,293 @@
+"""
+Live log viewer for adas-* containers
+"""
+from PyQt6.QtCore import (
+    QAbstractListModel, QModelIndex, QSortFilterProxyModel, Qt, QTimer
+)
+from PyQt6.QtGui import QColor, QFontDatabase
+from PyQt6.QtWidgets import (
+    QAbstractSlider, QDialog, QHBoxLayout, QLabel, QLineEdit, QListView, QPushButton, QVBoxLayout
+)
+from services.container_logs import LogBuffer, LogStreamWorker
+from utils.file_utils import load_settings
+from .styles import theme_manager
+
+# GUI refresh rate; new lines are taken from the buffer in one batch per tick
+REFRESH_INTERVAL_MS = 100
+
+# Delay before a changed search is applied
+SEARCH_DEBOUNCE_MS = 150
+
+
+class LogListModel(QAbstractListModel):
+    """
+    Rows over a LogBuffer, kept in step with it by sync(). Lines that fall
+    out of the ring are removed from the top and new ones appended, so the
+    view only lays out what changed. freeze() pins the current rows to a
+    copy, so a paused view keeps its lines while the buffer moves on.
+    """
+
+    def __init__(self, buffer: LogBuffer, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.stderr_color = QColor()
+        self._start = 0      # Sequence number of row 0
+        self._end = 0        # Sequence number after the last row
+        self._frozen = None  # Copied lines while paused
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._end - self._start
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if self._frozen is not None:
+            line = self._frozen[index.row()] if index.row() < len(self._frozen) else None
+        else:
+            line = self.buffer.get(self._start + index.row())
+        if line is None:
+            return None
+        text, is_stderr = line
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.ForegroundRole and is_stderr:
+            return self.stderr_color
+        return None
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen is not None
+
+    def pending(self) -> int:
+        """Lines written to the buffer since the rows were last synced."""
+        return self.buffer.span()[1] - self._end
+
+    def freeze(self):
+        # Catch up first so no row has been overwritten yet, then pin copies
+        # of the same rows: the view needs no update while paused.
+        self.sync()
+        lines = self.buffer.snapshot(self._start, self._end)
+        self._frozen = [None] * (self.rowCount() - len(lines)) + lines
+
+    def unfreeze(self):
+        self._frozen = None
+        self.sync()
+
+    def sync(self):
+        """Apply lines added to and dropped from the buffer since the last sync."""
+        if self._frozen is not None:
+            return
+        start, end = self.buffer.span()
+        if end < self._end or start >= self._end:
+            # Cleared, or every row was overwritten: cheaper to start over
+            self.beginResetModel()
+            self._start, self._end = start, end
+            self.endResetModel()
+            return
+        if start > self._start:
+            self.beginRemoveRows(QModelIndex(), 0, start - self._start - 1)
+            self._start = start
+            self.endRemoveRows()
+        if end > self._end:
+            rows = self.rowCount()
+            self.beginInsertRows(QModelIndex(), rows, rows + end - self._end - 1)
+            self._end = end
+            self.endInsertRows()
+
+
+class LogViewerDialog(QDialog):
+    """
+    Follows an app container's stdout and stderr. Lines land in a ring
+    buffer of logs.buffer_lines on a background thread and reach the list
+    view at most every REFRESH_INTERVAL_MS. The view only lays out and
+    paints the rows on screen, so memory and GUI work stay flat however
+    fast the app logs. Pause freezes the view while the buffer keeps
+    filling; scrolling up pauses too. The search box filters the lines.
+    """
+
+    def __init__(self, container_name: str, title: str, parent=None):
+        super().__init__(parent)
+        self.container_name = container_name
+        settings = load_settings()['logs']
+        self.buffer = LogBuffer(settings['buffer_lines'])
+        self.model = LogListModel(self.buffer, self)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self._ended = ''
+
+        self.setWindowTitle(f"{title} logs")
+        self.setObjectName("LogViewerDialog")
+        theme_manager.attach(self)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.resize(900, 560)
+        self._setup_ui(title)
+        self.update_styles()
+        theme_manager.theme_changed.connect(self.update_styles)
+
+        self.worker = LogStreamWorker(container_name, self.buffer, settings['tail_lines'], self)
+        self.worker.stream_ended.connect(self._on_stream_ended)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self._refresh)
+        self.refresh_timer.start(REFRESH_INTERVAL_MS)
+        self.worker.start()
+
+    def _setup_ui(self, title: str):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+
+        header = QHBoxLayout()
+        title_label = QLabel(f"{title} logs")
+        title_label.setObjectName("LogTitle")
+        header.addWidget(title_label)
+        header.addStretch()
+        self.search_edit = QLineEdit()
+        self.search_edit.setObjectName("LogSearch")
+        self.search_edit.setPlaceholderText("Search")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setMinimumWidth(240)
+        header.addWidget(self.search_edit)
+        self.follow_btn = QPushButton("Pause")
+        self.follow_btn.setObjectName("LogFollowButton")
+        self.follow_btn.clicked.connect(self.toggle_follow)
+        header.addWidget(self.follow_btn)
+        layout.addLayout(header)
+
+        self.view = QListView()
+        self.view.setObjectName("LogView")
+        self.view.setModel(self.proxy)
+        # Uniform rows let the view skip measuring every line
+        self.view.setUniformItemSizes(True)
+        self.view.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.view.setSelectionMode(QListView.SelectionMode.ExtendedSelection)
+        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.view.verticalScrollBar().actionTriggered.connect(self._on_scroll_action)
+        layout.addWidget(self.view, 1)
+
+        footer = QHBoxLayout()
+        self.status_label = QLabel("Connecting...")
+        self.status_label.setObjectName("LogStatus")
+        footer.addWidget(self.status_label)
+        footer.addStretch()
+        close_button = QPushButton("Close")
+        close_button.setObjectName("LogCloseButton")
+        close_button.clicked.connect(self.close)
+        footer.addWidget(close_button)
+        layout.addLayout(footer)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self._apply_search)
+        self.search_edit.textChanged.connect(lambda: self.search_timer.start(SEARCH_DEBOUNCE_MS))
+
+    @property
+    def following(self) -> bool:
+        return not self.model.frozen
+
+    def toggle_follow(self):
+        """Pause the view, or resume following the end of the log."""
+        if self.following:
+            self.model.freeze()
+        else:
+            self.model.unfreeze()
+            self.view.scrollToBottom()
+        self.follow_btn.setText("Pause" if self.following else "Follow")
+        self._update_status()
+
+    def _on_scroll_action(self, action: int):
+        # Scrolling up while following would fight the auto-scroll; pause instead
+        if self.following and action in (
+            QAbstractSlider.SliderAction.SliderSingleStepSub,
+            QAbstractSlider.SliderAction.SliderPageStepSub,
+            QAbstractSlider.SliderAction.SliderMove,
+        ):
+            self.toggle_follow()
+
+    def _apply_search(self):
+        self.proxy.setFilterFixedString(self.search_edit.text())
+        if self.following:
+            self.view.scrollToBottom()
+        self._update_status()
+
+    def _refresh(self):
+        if self.following and self.model.pending():
+            self.model.sync()
+            self.view.scrollToBottom()
+        self._update_status()
+
+    def _update_status(self):
+        lines = self.model.rowCount()
+        if self.search_edit.text():
+            text = f"{self.proxy.rowCount()} of {lines} lines match"
+        else:
+            text = f"{lines} lines"
+        if not self.following:
+            text += f" · paused, {self.model.pending()} new"
+        if self._ended:
+            text += f" · {self._ended}"
+        self.status_label.setText(text)
+
+    def _on_stream_ended(self, reason: str):
+        self._ended = f"Log stream ended: {reason}" if reason else "Container stopped"
+        self._update_status()
+
+    def update_styles(self):
+        self.model.stderr_color = QColor(theme_manager.theme['alert_color'])
+        self.view.viewport().update()
+
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        theme_manager.theme_changed.disconnect(self.update_styles)
+        self.worker.stop()
+        self.worker.wait()
+        super().closeEvent(event)
+
+
+def _log_viewer_stylesheet(theme: dict) -> str:
+    """The log viewer's stylesheet section for a theme."""
+    return f"""
+        QDialog#LogViewerDialog {{
+            background-color: {theme['card_bg']};
+            color: {theme['text']};
+        }}
+        #LogViewerDialog #LogTitle {{
+            font-size: 20px;
+            font-weight: bold;
+            color: {theme['text']};
+        }}
+        #LogViewerDialog #LogSearch {{
+            background-color: {theme['background']};
+            color: {theme['text']};
+            border: 1px solid {theme['border']};
+            border-radius: 8px;
+            padding: 6px 10px;
+        }}
+        #LogViewerDialog #LogView {{
+            background-color: {theme['background']};
+            color: {theme['text']};
+            border: 1px solid {theme['border']};
+            border-radius: 8px;
+        }}
+        #LogViewerDialog #LogStatus {{
+            font-size: 12px;
+            color: {theme['text_secondary']};
+        }}
+        #LogViewerDialog #LogFollowButton, #LogViewerDialog #LogCloseButton {{
+            background-color: {theme['accent']};
+            color: white;
+            border: none;
+            border-radius: 8px;
+            padding: 8px 18px;
+            font-weight: bold;
+        }}
+        #LogViewerDialog #LogFollowButton:hover, #LogViewerDialog #LogCloseButton:hover {{
+            background-color: {theme['accent_hover']};
+        }}
+    """
+
+
+theme_manager.register_stylesheet('LogViewerDialog', _log_viewer_stylesheet)
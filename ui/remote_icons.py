@@ -0,0 +1,192 @@
+"""
+Background downloads of remote (http) feature icons
+"""
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Optional, Set
+from urllib.parse import urlparse
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal
+from utils.disk_cache import get_disk_cache
+from utils.file_utils import load_settings
+
+# Seconds before a failed URL is requested again
+RETRY_SECONDS = 60
+
+
+def _expires_at(headers) -> float:
+    """Expiry (epoch seconds) from Cache-Control max-age or Expires; 0 if neither is given."""
+    cache_control = headers.get('Cache-Control', '').lower()
+    if 'no-cache' in cache_control or 'no-store' in cache_control:
+        return time.time()
+    match = re.search(r'max-age=(\d+)', cache_control)
+    if match:
+        return time.time() + int(match.group(1))
+    try:
+        return parsedate_to_datetime(headers['Expires']).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return 0.0
+
+
+def download_and_cache_image(url: str) -> str:
+    """
+    Download an image from URL into the disk cache and return its path. A
+    cached file past its expiry is revalidated with a conditional request,
+    so an unchanged image costs a 304 instead of a download.
+    """
+    try:
+        cache = get_disk_cache()
+        entry = cache.entry(url)
+        if entry is not None and entry.is_fresh():
+            cache_path = cache.get(url)
+            if cache_path:
+                return cache_path
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        response = requests.get(url, headers=headers, timeout=10)
+        if response.status_code == 304 and entry is not None:
+            cache.refresh(
+                url,
+                etag=response.headers.get('ETag', ''),
+                last_modified=response.headers.get('Last-Modified', ''),
+                expires=_expires_at(response.headers),
+            )
+            cache_path = cache.get(url)
+            if cache_path:
+                return cache_path
+            # Evicted meanwhile: fetch the whole file
+            response = requests.get(url, timeout=10)
+        response.raise_for_status()
+
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        return cache.put(
+            url, response.content, ext,
+            etag=response.headers.get('ETag', ''),
+            last_modified=response.headers.get('Last-Modified', ''),
+            expires=_expires_at(response.headers),
+        )
+    except Exception as e:
+        print(f"Failed to download image from {url}: {e}")
+        return None
+
+
+class RemoteIconLoader(QObject):
+    """
+    Downloads remote icons on a bounded thread pool, at most per_host at a
+    time from any one host, so slow servers never block the GUI thread and
+    one host cannot take every worker. Requests for a URL already queued or
+    downloading are merged. icon_ready(url, path) arrives on the GUI thread
+    with the cached file, or '' if the download failed; a failed URL is not
+    requested again for RETRY_SECONDS.
+    """
+    icon_ready = pyqtSignal(str, str)
+
+    def __init__(self, max_workers: int, per_host: int, parent=None):
+        super().__init__(parent)
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='remote-icon')
+        self._lock = threading.Lock()
+        self._queued: Dict[str, Deque[str]] = {}  # Host -> URLs waiting for a slot
+        self._in_flight: Set[str] = set()         # Queued or downloading
+        self._active = 0
+        self._active_per_host: Dict[str, int] = {}
+        self._failed: Dict[str, float] = {}       # URL -> monotonic time of the failure
+        self._stopped = False
+        self.requested = 0
+        self.merged = 0
+        self.downloaded = 0
+        self.failures = 0
+
+    def request(self, url: str):
+        """Download url in the background unless it is already on its way."""
+        with self._lock:
+            if self._stopped:
+                return
+            self.requested += 1
+            if url in self._in_flight:
+                self.merged += 1
+                return
+            failed_at = self._failed.get(url)
+            if failed_at is not None and time.monotonic() - failed_at < RETRY_SECONDS:
+                return
+            self._in_flight.add(url)
+            self._queued.setdefault(urlparse(url).netloc, deque()).append(url)
+            self._dispatch()
+
+    def is_pending(self, url: str) -> bool:
+        with self._lock:
+            return url in self._in_flight
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'requested': self.requested,
+                'merged': self.merged,
+                'downloaded': self.downloaded,
+                'failures': self.failures,
+                'active': self._active,
+                'queued': sum(len(urls) for urls in self._queued.values()),
+            }
+
+    def shutdown(self):
+        """Drop queued downloads; running ones finish in the background."""
+        with self._lock:
+            self._stopped = True
+            self._queued.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self):
+        # Caller holds the lock
+        for host in list(self._queued):
+            urls = self._queued[host]
+            while (urls and self._active < self.max_workers
+                   and self._active_per_host.get(host, 0) < self.per_host):
+                self._active += 1
+                self._active_per_host[host] = self._active_per_host.get(host, 0) + 1
+                self._executor.submit(self._download, host, urls.popleft())
+            if not urls:
+                del self._queued[host]
+
+    def _download(self, host: str, url: str):
+        path = None
+        try:
+            path = download_and_cache_image(url)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._active_per_host[host] -= 1
+                if not self._active_per_host[host]:
+                    del self._active_per_host[host]
+                self._in_flight.discard(url)
+                if path:
+                    self.downloaded += 1
+                    self._failed.pop(url, None)
+                else:
+                    self.failures += 1
+                    self._failed[url] = time.monotonic()
+                if not self._stopped:
+                    self._dispatch()
+            self.icon_ready.emit(url, path or '')
+
+
+_remote_icon_loader: Optional[RemoteIconLoader] = None
+
+
+def get_remote_icon_loader() -> RemoteIconLoader:
+    """The process-wide RemoteIconLoader, sized from settings on first use."""
+    global _remote_icon_loader
+    if _remote_icon_loader is None:
+        settings = load_settings()['icons']
+        _remote_icon_loader = RemoteIconLoader(settings['remote_workers'], settings['remote_per_host'])
+    return _remote_icon_loader
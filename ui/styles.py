@@ -1,7 +1,20 @@
 """
 Modern UI styles for the ADAS Dashboard
 """
-from PyQt6.QtCore import QObject, pyqtSignal
+import re
+import time
+from typing import Callable, Dict, List, Tuple
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QWidget
+
+# Widgets off screen at a theme switch are restyled in slices of this many
+# seconds per event loop pass, so they catch up without stalling a frame
+RESTYLE_SLICE = 0.008
+
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_RULE = re.compile(r'([^{}]+)\{([^{}]*)\}')
+_PSEUDO_STATES = re.compile(r'(?::{1,2}!?[-\w]+)*$')
 
 # A softer, more comfortable dark theme inspired by popular code editors.
 NIGHT_THEME = {
@@ -40,8 +53,47 @@ DAY_THEME = {
 }
 
 
+def scope_stylesheet(css: str, window: str, name: str) -> str:
+    """
+    css limited to a window while its theme property is name, as if set on
+    that window. window is the window's class name, which the windows also
+    use as object name: selectors starting at #window get the property,
+    the rest are put below the class. The class selector is less specific
+    than the id ones sections start with, so a dialog's own section still
+    wins over the dashboard's when the dialog is opened from a card.
+    Selector lists are split on commas and compounds on whitespace, which
+    is all the repo's stylesheets use.
+    """
+    attribute = f'[theme="{name}"]'
+    window_id = re.compile(rf'#{window}(?![-\w])')
+    rules = []
+    for selectors, body in _RULE.findall(_COMMENT.sub('', css)):
+        scoped = []
+        for selector in selectors.split(','):
+            parts = selector.split()
+            if not parts:
+                continue
+            if window_id.search(parts[0]):
+                states = _PSEUDO_STATES.search(parts[0]).group(0)
+                parts[0] = f'{parts[0][:len(parts[0]) - len(states)]}{attribute}{states}'
+            else:
+                parts.insert(0, f'{window}{attribute}')
+            scoped.append(' '.join(parts))
+        rules.append(f"{', '.join(scoped)} {{{body}}}")
+    return '\n'.join(rules)
+
+
 class ThemeManager(QObject):
-    """Manages color themes for the application"""
+    """
+    Manages color themes for the application. Each window registers its
+    stylesheet section; every theme's sections are compiled once, scoped
+    to their window and its value of the theme property, and set on the
+    application together. Windows passed to attach() carry the property.
+    A theme switch only changes that property, so the stylesheet is never
+    parsed again and Qt does not re-polish the whole tree: widgets on
+    screen are re-polished right away, the rest in RESTYLE_SLICE slices
+    from the event loop.
+    """
     theme_changed = pyqtSignal()
 
     def __init__(self):
@@ -49,46 +101,126 @@ class ThemeManager(QObject):
         self._themes = {'night': NIGHT_THEME, 'day': DAY_THEME}
         self._current_theme_name = 'night'
         self.theme = NIGHT_THEME
+        # (window object name, section builder)
+        self._sections: List[Tuple[str, Callable[[dict], str]]] = [('Dashboard', self._core_stylesheet)]
+        self._stylesheets: Dict[str, str] = {}  # Theme name -> compiled stylesheet
+        self._installed = False
+        self._pending: List[QWidget] = []       # Widgets still styled for the previous theme
+        self._restyle_timer = QTimer(self)
+        self._restyle_timer.timeout.connect(self._restyle_pending)
+
+    def register_stylesheet(self, window: str, build: Callable[[dict], str]):
+        """Add the stylesheet section of the window class named window, built from a theme's colors."""
+        self._sections.append((window, build))
+        self._stylesheets.clear()
+        if self._installed:
+            self._install()
+
+    def get_stylesheet(self, name: str = None) -> str:
+        """The compiled stylesheet of a theme (default: the current one)."""
+        name = name or self._current_theme_name
+        if name not in self._stylesheets:
+            self._stylesheets[name] = '\n'.join(
+                scope_stylesheet(build(self._themes[name]), window, name) for window, build in self._sections
+            )
+        return self._stylesheets[name]
+
+    def attach(self, widget: QWidget):
+        """
+        Style a window with a registered section, and its children, with
+        the theme. Call it before the children are polished, i.e. in the
+        constructor, since they are only polished again when the theme
+        changes.
+        """
+        if not self._installed:
+            self._install()
+        widget.setProperty('theme', self._current_theme_name)
+
+    def pending_restyles(self) -> int:
+        """Widgets not yet restyled for the current theme."""
+        return len(self._pending)
 
     def set_theme(self, name: str):
         """Set the current theme by name ('day' or 'night')"""
         if name in self._themes and name != self._current_theme_name:
-            self._current_theme_name = name
-            self.theme = self._themes[name]
-            self.theme_changed.emit()
+            self._apply(name)
 
     def toggle_theme(self):
         """Toggle between day and night themes"""
-        if self._current_theme_name == 'day':
-            self.theme = NIGHT_THEME
-            self._current_theme_name = 'night'
-        else:
-            self.theme = DAY_THEME
-            self._current_theme_name = 'day'
+        self._apply('night' if self._current_theme_name == 'day' else 'day')
+
+    def _install(self):
+        app = QApplication.instance()
+        if app is None:
+            return
+        app.setStyleSheet('\n'.join(self.get_stylesheet(name) for name in self._themes))
+        self._installed = True
+
+    def _apply(self, name: str):
+        self._current_theme_name = name
+        self.theme = self._themes[name]
+        app = QApplication.instance()
+        widgets: Dict[int, QWidget] = {}
+        for window in app.topLevelWidgets() if app is not None else []:
+            if window.property('theme') is None:
+                continue
+            window.setProperty('theme', name)
+            widgets.setdefault(id(window), window)
+            for child in window.findChildren(QWidget):
+                widgets.setdefault(id(child), child)
+        on_screen = []
+        self._pending = []
+        for widget in widgets.values():
+            if widget.isVisible() and not widget.visibleRegion().isEmpty():
+                on_screen.append(widget)
+            else:
+                self._pending.append(widget)
+        self._pending.reverse()  # Popped from the end: top of the tree first
+        for widget in on_screen:
+            self._repolish(widget)
+        if self._pending:
+            self._restyle_timer.start(0)
         self.theme_changed.emit()
 
+    def _restyle_pending(self):
+        deadline = time.perf_counter() + RESTYLE_SLICE
+        while self._pending and time.perf_counter() < deadline:
+            widget = self._pending.pop()
+            if not sip.isdeleted(widget):
+                self._repolish(widget)
+        if not self._pending:
+            self._restyle_timer.stop()
+
+    @staticmethod
+    def _repolish(widget: QWidget):
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
+
     def is_day_mode(self) -> bool:
         """Returns True if the current theme is 'day'."""
         return self._current_theme_name == 'day'
 
-    def get_stylesheet(self) -> str:
-        """Get the full stylesheet for the application for the current theme."""
+    @staticmethod
+    def _core_stylesheet(theme: dict) -> str:
+        """The dashboard's stylesheet section for a theme."""
         return f"""
             /* Global Styles */
             QWidget {{
                 font-family: 'Ubuntu', 'Cantarell', 'DejaVu Sans', 'Verdana', sans-serif;
-                color: {self.theme['text']};
+                color: {theme['text']};
             }}
             
             /* Main Dashboard */
             QWidget#Dashboard, #StoreView, QScrollArea > QWidget > QWidget {{
-                background-color: {self.theme['background']};
+                background-color: {theme['background']};
             }}
 
             /* Navigation Bar */
             QFrame#NavBar {{
-                background-color: {self.theme['card_bg']};
-                border-top: 1px solid {self.theme['border']};
+                background-color: {theme['card_bg']};
+                border-top: 1px solid {theme['border']};
                 padding: 8px 16px;
             }}
             #NavBar QPushButton {{
@@ -98,23 +230,23 @@ class ThemeManager(QObject):
                 padding: 8px;
             }}
             #NavBar QPushButton:hover {{
-                background-color: {self.theme['accent']};
+                background-color: {theme['accent']};
             }}
             #NavBar QPushButton[active="true"] {{
-                background-color: {self.theme['accent']};
+                background-color: {theme['accent']};
             }}
 
             /* Feature Cards */
             QFrame#FeatureCard {{
                 border-radius: 12px;
-                background-color: {self.theme['card_bg']};
-                border: 1px solid {self.theme['border']};
+                background-color: {theme['card_bg']};
+                border: 1px solid {theme['border']};
                 padding: 20px;
                 margin: 8px;
             }}
 
             QFrame#FeatureCard:hover {{
-                border-color: {self.theme['accent']};
+                border-color: {theme['accent']};
             }}
 
             #FeatureCard #FeatureTitle {{
@@ -124,7 +256,7 @@ class ThemeManager(QObject):
 
             #FeatureCard #FeatureDesc {{
                 font-size: 14px;
-                color: {self.theme['text_secondary']};
+                color: {theme['text_secondary']};
             }}
 
             #FeatureCard QPushButton {{
@@ -137,27 +269,101 @@ class ThemeManager(QObject):
             }}
             
             #FeatureCard #InfoButton {{
-                background-color: {self.theme['background']};
-                color: {self.theme['text']};
-                border: 1px solid {self.theme['border']};
+                background-color: {theme['background']};
+                color: {theme['text']};
+                border: 1px solid {theme['border']};
             }}
             
             #FeatureCard #InfoButton:hover {{
-                background-color: {self.theme['border']};
+                background-color: {theme['border']};
             }}
 
             #FeatureCard #DownloadButton {{
-                background-color: {self.theme['accent']};
+                background-color: {theme['accent']};
                 color: white;
             }}
             
             #FeatureCard #DownloadButton:hover {{
-                background-color: {self.theme['accent_hover']};
+                background-color: {theme['accent_hover']};
             }}
 
             #FeatureCard #InstalledButton {{
-                background-color: {self.theme['success']};
+                background-color: {theme['success']};
+                color: white;
+            }}
+
+            #FeatureCard #CancelInstallButton {{
+                background-color: {theme['background']};
+                color: {theme['text']};
+                border: 1px solid {theme['accent']};
+            }}
+
+            #FeatureCard #CancelInstallButton:hover {{
+                background-color: {theme['border']};
+            }}
+
+            #FeatureCard #ContainerButton, #FeatureCard #LogsButton, #FeatureCard #RemoveButton {{
+                background-color: {theme['background']};
+                color: {theme['text']};
+                border: 1px solid {theme['border']};
+            }}
+
+            #FeatureCard #ContainerButton:hover, #FeatureCard #LogsButton:hover,
+            #FeatureCard #RemoveButton:hover {{
+                background-color: {theme['border']};
+            }}
+
+            #FeatureCard #TelemetryLabel {{
+                font-size: 12px;
+                color: {theme['text_secondary']};
+            }}
+
+            #FeatureCard #ResolutionButton {{
+                font-size: 11px;
+                padding: 2px 6px;
+                min-width: 0px;
+                background-color: transparent;
+                color: {theme['text_secondary']};
+                border: 1px solid {theme['border']};
+            }}
+
+            #StoreView #StoreTitle {{
+                margin: 12px 0;
+            }}
+
+            #StoreView #SelectButton, #StoreView #InstallSelectedButton {{
+                padding: 6px 14px;
+                border-radius: 8px;
+                font-weight: bold;
+                background-color: {theme['card_bg']};
+                border: 1px solid {theme['border']};
+            }}
+
+            #StoreView #InstallSelectedButton:enabled {{
+                background-color: {theme['accent']};
                 color: white;
+                border: none;
+            }}
+
+            #StoreView #BatchSummary, #StoreView #StorageSummary, #FeatureCard #SelectBox {{
+                font-size: 13px;
+                color: {theme['text_secondary']};
+            }}
+
+            #FeatureCard #InstallProgress {{
+                border: none;
+                border-radius: 3px;
+                background-color: {theme['border']};
+            }}
+
+            #FeatureCard #InstallProgress::chunk {{
+                border-radius: 3px;
+                background-color: {theme['accent']};
+            }}
+
+            #FeatureCard #InstallStatus {{
+                font-size: 13px;
+                color: {theme['text_secondary']};
             }}
 
             /* Clock Widget */
@@ -173,29 +379,30 @@ class ThemeManager(QObject):
             #ClockWidget #DateLabel {{
                 font-size: 24px;
                 font-weight: 300;
-                color: {self.theme['text_secondary']};
+                color: {theme['text_secondary']};
             }}
             
             /* Top Bar */
             #TopBar {{
-                background-color: {self.theme['card_bg']};
-                border-bottom: 1px solid {self.theme['border']};
+                background-color: {theme['card_bg']};
+                border-bottom: 1px solid {theme['border']};
                 min-height: 50px;
             }}
             #TopBarTimeLabel {{
                 font-size: 20px;
                 font-weight: bold;
-                color: {self.theme['text']};
+                color: {theme['text']};
             }}
             #TopBarTempLabel {{
                 font-size: 18px;
                 font-weight: bold;
-                color: {self.theme['text']};
+                color: {theme['text']};
             }}
             #TopBarWeatherIcon, #TopBarTempLabel {{
                 background-color: transparent;
             }}
             #NetworkTypeLabel {{
+                color: {theme['text']};
                 font-size: 18px;
                 font-weight: bold;
                 background-color: transparent;
@@ -204,8 +411,8 @@ class ThemeManager(QObject):
             /* Weather Widget */
             QFrame#WeatherWidget {{
                 border-radius: 16px;
-                background-color: {self.theme['card_bg']};
-                border: 1px solid {self.theme['border']};
+                background-color: {theme['card_bg']};
+                border: 1px solid {theme['border']};
                 padding: 24px;
                 margin-top: 20px;
             }}
@@ -217,12 +424,12 @@ class ThemeManager(QObject):
                 font-size: 20px;
             }}
             #WeatherWidget #Separator {{
-                background-color: {self.theme['border']};
+                background-color: {theme['border']};
                 height: 1px;
             }}
             #WeatherWidget QLabel {{
                 font-size: 16px;
-                color: {self.theme['text_secondary']};
+                color: {theme['text_secondary']};
             }}
 
             /* Car Display */
@@ -238,17 +445,17 @@ class ThemeManager(QObject):
             
             /* Feature Info View */
             #FeatureInfoView {{
-                background-color: {self.theme['background']};
+                background-color: {theme['background']};
             }}
             #FeatureInfoView #BackButton {{
                 font-size: 16px;
                 font-weight: bold;
                 padding: 8px 16px;
                 border-radius: 8px;
-                border: 1px solid {self.theme['border']};
+                border: 1px solid {theme['border']};
             }}
             #FeatureInfoView #BackButton:hover {{
-                background-color: {self.theme['accent']};
+                background-color: {theme['accent']};
                 color: white;
             }}
             #FeatureInfoView #InfoTitle {{
@@ -260,11 +467,11 @@ class ThemeManager(QObject):
                 font-weight: bold;
                 padding: 12px 24px;
                 border-radius: 8px;
-                background-color: {self.theme['accent']};
+                background-color: {theme['accent']};
                 color: white;
             }}
             #FeatureInfoView #InfoDownloadButton:hover {{
-                background-color: {self.theme['accent_hover']};
+                background-color: {theme['accent_hover']};
             }}
             #FeatureInfoView #DescLabel {{
                 font-size: 18px;
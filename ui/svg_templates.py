@@ -0,0 +1,109 @@
+"""
+SVG icons parsed once into color templates with compiled renderers
+"""
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from PyQt6.QtCore import QByteArray
+from PyQt6.QtSvg import QSvgRenderer
+
+# Paint values the theme recolors: the icons are drawn white (strokes) or
+# in currentColor (fills) and take the theme's text color
+THEMED = 'themed'
+
+# Every stroke and fill that paints, so the whole icon takes one color.
+# Shapes without a fill paint black by default, so the root gets a fill too
+TINT = 'tint'
+
+_THEMED_SLOTS = {('stroke', 'white'), ('stroke', '#FFFFFF'), ('fill', 'currentColor')}
+
+_PAINT_ATTRIBUTE = re.compile(r'\b(stroke|fill)="([^"]*)"')
+# style="..." attributes and <style> elements, and the paint declarations in them
+_STYLE = re.compile(r'\bstyle="([^"]*)"|<style\b[^>]*>(.*?)</style>', re.DOTALL)
+_PAINT_DECLARATION = re.compile(r'(?<![-\w])(stroke|fill)\s*:\s*([^;"\'}]*[^;"\'}\s])')
+_ROOT = re.compile(r'<svg\b([^>]*)>')
+_ROOT_FILL = re.compile(r'\bfill(?:="|\s*:)')
+
+
+class SvgTemplate:
+    """
+    One SVG split at its stroke/fill values, from attributes and from
+    style declarations. Each value is a slot that a color can be
+    substituted into, so recoloring is a join instead of a read and several
+    passes of str.replace. A root element without a fill gets an empty
+    slot where TINT adds one. Renderers are compiled once per (color, mode)
+    and reused.
+    """
+
+    def __init__(self, svg: str):
+        self.source = svg
+        self._chunks: List[str] = []               # Literal text around the slots
+        self._slots: List[Tuple[str, str]] = []    # (attribute, original value)
+        # (start, end, attribute, value) of every slot, in document order
+        found = [(m.start(2), m.end(2), m.group(1), m.group(2)) for m in _PAINT_ATTRIBUTE.finditer(svg)]
+        for style in _STYLE.finditer(svg):
+            group = 1 if style.group(1) is not None else 2
+            offset = style.start(group)
+            found.extend(
+                (offset + m.start(2), offset + m.end(2), m.group(1), m.group(2))
+                for m in _PAINT_DECLARATION.finditer(style.group(group))
+            )
+        root = _ROOT.search(svg)
+        if root is not None and not _ROOT_FILL.search(root.group(1)):
+            found.append((root.start(1), root.start(1), 'root', ''))
+        position = 0
+        for start, end, attribute, value in sorted(found):
+            self._chunks.append(svg[position:start])
+            self._slots.append((attribute, value))
+            position = end
+        self._chunks.append(svg[position:])
+        self._renderers: Dict[Tuple[Optional[str], str], QSvgRenderer] = {}
+
+    def substitute(self, color: Optional[str], mode: str = THEMED) -> str:
+        """The SVG with color in the slots of mode; None keeps the original colors."""
+        if color is None or not self._slots:
+            return self.source
+        parts = [self._chunks[0]]
+        for (attribute, value), chunk in zip(self._slots, self._chunks[1:]):
+            if attribute == 'root':
+                parts.append(f' fill="{color}"' if mode == TINT else '')
+            elif mode == TINT:
+                parts.append(color if value != 'none' else value)
+            else:
+                parts.append(color if (attribute, value) in _THEMED_SLOTS else value)
+            parts.append(chunk)
+        return ''.join(parts)
+
+    def renderer(self, color: Optional[str], mode: str = THEMED) -> QSvgRenderer:
+        """The compiled renderer of the SVG in color."""
+        key = (color, mode)
+        renderer = self._renderers.get(key)
+        if renderer is None:
+            renderer = QSvgRenderer(QByteArray(self.substitute(color, mode).encode('utf-8')))
+            self._renderers[key] = renderer
+        return renderer
+
+
+# Path -> (mtime_ns, template); GUI thread only, like the renderers
+_templates: Dict[str, Tuple[int, SvgTemplate]] = {}
+
+
+def get_svg_template(path: str) -> Optional[SvgTemplate]:
+    """The template of an SVG file, parsed again when the file changes; None if unreadable."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        print(f"Warning: Icon SVG not found at {path}")
+        _templates.pop(path, None)
+        return None
+    cached = _templates.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            template = SvgTemplate(f.read())
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Warning: Could not read icon SVG {path}: {e}")
+        return None
+    _templates[path] = (mtime, template)
+    return template
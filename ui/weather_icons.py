@@ -0,0 +1,84 @@
+"""
+Weather condition icons: bundled SVGs for the known WeatherAPI icons, cached downloads for the rest
+"""
+import re
+from typing import Dict, Optional, Tuple
+from PyQt6.QtGui import QPixmap
+from utils.disk_cache import get_disk_cache
+from .icon_utils import get_themed_icon
+from .remote_icons import get_remote_icon_loader
+
+ICONS_DIR = 'resources/icons'
+
+# WeatherAPI icon URLs end in /weather/64x64/<day|night>/<code>.png, the same
+# few dozen for every location. Icons with a bundled counterpart are served
+# from it and never downloaded. The sun-based SVGs stand in for day icons
+# only; WeatherAPI draws a moon at night.
+LOCAL_CONDITION_ICONS: Dict[Tuple[str, int], str] = {
+    ('day', 113): f'{ICONS_DIR}/weather-clear.svg',
+    ('night', 113): f'{ICONS_DIR}/night-mode.svg',
+    ('day', 116): f'{ICONS_DIR}/partly-cloudy.svg',
+}
+for _svg, _codes in {
+    'cloudy.svg': (119, 122),
+    'foggy.svg': (143, 248, 260),
+    'rainy.svg': (176, 185, 200, 263, 266, 281, 284, 293, 296, 299, 302, 305, 308,
+                  311, 314, 353, 356, 359, 386, 389),
+    'snowy.svg': (179, 182, 227, 230, 317, 320, 323, 326, 329, 332, 335, 338, 350,
+                  362, 365, 368, 371, 374, 377, 392, 395),
+}.items():
+    for _code in _codes:
+        LOCAL_CONDITION_ICONS['day', _code] = LOCAL_CONDITION_ICONS['night', _code] = f'{ICONS_DIR}/{_svg}'
+
+_CONDITION_ICON_URL = re.compile(r'/weather/\d+x\d+/(day|night)/(\d+)\.png$')
+
+
+def weather_icon_url(current: dict) -> str:
+    """The condition icon URL of WeatherAPI data, with a scheme"""
+    icon_url = current["condition"].get("icon", "")
+    if icon_url.startswith("//"):
+        icon_url = "https:" + icon_url
+    return icon_url
+
+
+def local_weather_icon(icon_url: str) -> Optional[str]:
+    """The bundled SVG standing in for a WeatherAPI icon URL, if there is one."""
+    match = _CONDITION_ICON_URL.search(icon_url)
+    return LOCAL_CONDITION_ICONS.get((match.group(1), int(match.group(2)))) if match else None
+
+
+def _fallback_weather_icon(condition: str, is_day: bool = True) -> str:
+    """Local SVG for a condition text"""
+    condition = condition.lower()
+    if "snow" in condition:
+        return f'{ICONS_DIR}/snowy.svg'
+    if "fog" in condition or "mist" in condition:
+        return f'{ICONS_DIR}/foggy.svg'
+    if "cloud" in condition:
+        return f'{ICONS_DIR}/cloudy.svg'
+    if "rain" in condition:
+        return f'{ICONS_DIR}/rainy.svg'
+    return f'{ICONS_DIR}/weather-clear.svg' if is_day else f'{ICONS_DIR}/night-mode.svg'
+
+
+def weather_icon_pixmap(current: dict, size: int) -> QPixmap:
+    """
+    The condition icon at size: the bundled SVG for known icon URLs, else
+    the downloaded icon from the disk cache. Unknown icons download in the
+    background, and expired ones are revalidated with their ETag or
+    Last-Modified, while the condition's local SVG or the old file is shown.
+    Rendered icons are kept in the in-memory icon cache either way.
+    """
+    icon_url = weather_icon_url(current)
+    local_icon = local_weather_icon(icon_url)
+    if local_icon is not None:
+        return get_themed_icon(local_icon).pixmap(size, size)
+    if icon_url.startswith("http"):
+        entry = get_disk_cache().entry(icon_url)
+        if entry is None or not entry.is_fresh():
+            # RemoteIconLoader.icon_ready tells the widgets when to render again
+            get_remote_icon_loader().request(icon_url)
+        if entry is not None:
+            return get_themed_icon(icon_url).pixmap(size, size)
+    fallback = _fallback_weather_icon(current["condition"]["text"], bool(current.get("is_day", 1)))
+    return get_themed_icon(fallback).pixmap(size, size)
@@ -2,16 +2,16 @@
 Custom widgets for the ADAS Dashboard
 """
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QLabel, QHBoxLayout, QWidget, QGridLayout
-from PyQt6.QtCore import QTimer, Qt, QSize, QTime
-from PyQt6.QtGui import QPixmap, QFont, QPainter, QColor
-from datetime import datetime
+from PyQt6.QtCore import Qt, QSize, QTime, QPointF
+from PyQt6.QtGui import QPixmap, QFont, QPainter, QColor, QPen, QPolygonF
 from .styles import theme_manager
-from .icon_utils import get_themed_pixmap, get_themed_icon
+from .remote_icons import get_remote_icon_loader
+from .weather_icons import weather_icon_pixmap, weather_icon_url
 from services.podman_service import PodmanWorker
-from utils.weather import fetch_current_weather
-import requests
+from services.clock_service import ClockService
+from services.weather_service import WeatherService
+from utils.file_utils import load_settings
 from io import BytesIO
-import pytz
 
 
 class CarDisplay(QLabel):
@@ -41,9 +41,9 @@ class CarDisplay(QLabel):
 
 
 class ClockWidget(QFrame):
-    """A modern digital clock widget"""
+    """A modern digital clock widget, updated by the shared ClockService"""
     
-    def __init__(self, parent=None):
+    def __init__(self, clock_service: ClockService, parent=None):
         super().__init__(parent)
         self.setObjectName("ClockWidget")
         
@@ -60,32 +60,22 @@ class ClockWidget(QFrame):
         layout.addWidget(self.date_label)
         self.setLayout(layout)
         
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start(1000)
-        
-        self.update_time()
-
-    def update_time(self):
-        """Update the clock display"""
-        cairo_tz = pytz.timezone("Africa/Cairo")
-        now_cairo = datetime.now(cairo_tz)
-        self.time_label.setText(now_cairo.strftime("%I:%M %p"))
-        self.date_label.setText(now_cairo.strftime("%A, %B %d"))
+        # Each label is set only when its text changes: once a minute, once a day
+        clock_service.subscribe("%I:%M %p", self.time_label.setText)
+        clock_service.subscribe("%A, %B %d", self.date_label.setText)
 
 
 class WeatherWidget(QFrame):
-    """A widget to display weather information"""
+    """A widget to display weather information from the shared WeatherService"""
     
-    def __init__(self, parent=None):
+    def __init__(self, weather_service: WeatherService, parent=None):
         super().__init__(parent)
         self.setObjectName("WeatherWidget")
+        self.current = None
         self._setup_ui()
         theme_manager.theme_changed.connect(self._update_icons)
-        self._update_weather()
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update_weather)
-        self.timer.start(10 * 60 * 1000)  # Update every 10 minutes
+        get_remote_icon_loader().icon_ready.connect(self._on_remote_icon)
+        weather_service.subscribe(self._update_weather)
 
     def _setup_ui(self):
         """Setup the weather widget UI"""
@@ -146,52 +136,23 @@ class WeatherWidget(QFrame):
         self._update_icons()
 
     def _update_icons(self):
-        """Update icons based on theme."""
-        self._update_weather()
+        """Update icons based on theme; the cached weather is only re-rendered."""
+        if self.current is not None:
+            self.weather_icon.setPixmap(weather_icon_pixmap(self.current, 64))
 
-    def _update_weather(self):
-        data = fetch_current_weather("Cairo")  # You can change location as needed
-        if not data or "current" not in data:
-            return
-        current = data["current"]
-        condition = current["condition"]["text"].lower()
-        temp_c = current["temp_c"]
-        feelslike_c = current["feelslike_c"]
-        wind_kph = current["wind_kph"]
-        humidity = current["humidity"]
-        icon_url = current["condition"]["icon"]
-
-        # Try to use the API icon
-        try:
-            if icon_url.startswith("//"):
-                icon_url = "https:" + icon_url
-            response = requests.get(icon_url, timeout=5)
-            response.raise_for_status()
-            pixmap = QPixmap()
-            pixmap.loadFromData(response.content)
-            self.weather_icon.setPixmap(pixmap.scaled(64, 64))
-        except Exception as e:
-            print(f"Failed to load weather icon from API: {e}")
-            # Fallback to local SVG based on condition
-            if "snow" in condition:
-                fallback_icon = 'resources/icons/snowy.svg'
-            elif "fog" in condition or "mist" in condition:
-                fallback_icon = 'resources/icons/foggy.svg'
-            elif "cloud" in condition:
-                fallback_icon = 'resources/icons/cloudy.svg'
-            elif "rain" in condition:
-                fallback_icon = 'resources/icons/rainy.svg'
-            elif "clear" in condition or "sun" in condition:
-                fallback_icon = 'resources/icons/weather-clear.svg'
-            else:
-                fallback_icon = 'resources/icons/weather-clear.svg'  # Default fallback
-            self.weather_icon.setPixmap(get_themed_icon(fallback_icon).pixmap(64, 64))
-
-        self.main_temp_label.setText(f"{int(round(temp_c))}°")
+    def _on_remote_icon(self, url: str, path: str):
+        """Swap the fallback for the downloaded condition icon"""
+        if path and self.current is not None and url == weather_icon_url(self.current):
+            self._update_icons()
+
+    def _update_weather(self, current: dict):
+        self.current = current
+        self._update_icons()
+        self.main_temp_label.setText(f"{int(round(current['temp_c']))}°")
         self.condition_label.setText(current["condition"]["text"])
-        self.feels_like_label.setText(f"Feels like {int(round(feelslike_c))}°")
-        self.wind_label.setText(f"{wind_kph} km/h")
-        self.humidity_label.setText(f"{humidity}%")
+        self.feels_like_label.setText(f"Feels like {int(round(current['feelslike_c']))}°")
+        self.wind_label.setText(f"{current['wind_kph']} km/h")
+        self.humidity_label.setText(f"{current['humidity']}%")
 
 
 class Dashboard(QWidget):
@@ -205,13 +166,16 @@ class Dashboard(QWidget):
     def _setup_ui(self):
         """Setup the dashboard UI"""
         layout = QVBoxLayout()
+        settings = load_settings()
         
         # Clock widget
-        self.clock_widget = ClockWidget()
+        self.clock_service = ClockService(settings['clock'], self)
+        self.clock_widget = ClockWidget(self.clock_service)
         layout.addWidget(self.clock_widget)
         
         # Weather widget
-        self.weather_widget = WeatherWidget()
+        self.weather_service = WeatherService(settings['weather'], self)
+        self.weather_widget = WeatherWidget(self.weather_service)
         layout.addWidget(self.weather_widget)
         
         self.setLayout(layout)
@@ -273,6 +237,51 @@ class NetworkStatusWidget(QWidget):
         layout.addWidget(self.network_type_label)
 
     def set_color(self, color: QColor):
-        """Sets the color for all elements in the widget."""
+        """Sets the color of the signal bars; the label takes the theme's text color."""
         self.signal_bars.set_color(color)
-        self.network_type_label.setStyleSheet(f"color: {color.name()};") 
\ No newline at end of file
+
+
+class SparklineWidget(QWidget):
+    """A compact line chart of recent values, scaled to their own range."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(80, 20)
+        self._values = []
+        self._floor = 1.0
+        self._line_color = QColor("#000000")
+
+    def set_color(self, color: QColor):
+        """Sets the line color."""
+        if self._line_color != color:
+            self._line_color = color
+            self.update()
+
+    def set_values(self, values: list, floor: float = 1.0):
+        """
+        Sets the values to draw. The vertical scale is max(values, floor),
+        so a flat idle series does not get magnified into noise.
+        """
+        self._values = values[-self.width():]  # At most one point per pixel
+        self._floor = floor
+        self.update()
+
+    def paintEvent(self, event):
+        """Paints the sparkline."""
+        if len(self._values) < 2:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self._line_color, 1.5))
+
+        top = max(max(self._values), self._floor)
+        width = self.width() - 2
+        height = self.height() - 2
+        step = width / (len(self._values) - 1)
+        points = [
+            QPointF(1 + i * step, 1 + height - (value / top) * height)
+            for i, value in enumerate(self._values)
+        ]
+        painter.drawPolyline(QPolygonF(points))
+
+    def sizeHint(self):
+        return QSize(80, 20)
@@ -0,0 +1,249 @@
+"""
+Bounded, indexed on-disk cache for downloaded and decoded images
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+from utils.file_utils import load_settings
+
+CACHE_DIR = 'resources/cache'
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Access times are written back at most this often (seconds); adds and evictions immediately
+MANIFEST_SAVE_INTERVAL = 30
+
+# Cache files are named <sha256 of the source><ext>; other files in the directory are left alone
+_CACHE_FILE = re.compile(r'^[0-9a-f]{64}(\.[A-Za-z0-9]{1,8})?$')
+
+
+@dataclass
+class CacheEntry:
+    """One cached file and what is known about its source"""
+    filename: str
+    size: int
+    source: str               # URL, or the start of a data URL
+    created: float
+    last_access: float
+    etag: str = ''            # HTTP validators for conditional requests
+    last_modified: str = ''
+    expires: float = 0.0      # Fresh until then (epoch seconds); 0 means no expiry info
+
+    def is_fresh(self) -> bool:
+        """False once the source's expiry has passed; files without one stay fresh."""
+        return not self.expires or time.time() < self.expires
+
+
+class DiskCache:
+    """
+    Files keyed by the SHA-256 of their source (URL or data URL), indexed by
+    a manifest holding each file's size, last access and HTTP validators.
+    Lookups never touch the disk. Writes go through a temp file and
+    os.replace, so readers never see a partial file. The cache is kept
+    under budget_bytes by evicting the least recently used files, and
+    files unused for max_age_days are dropped. Thread-safe.
+    """
+
+    def __init__(self, directory: str, budget_bytes: int, max_age_days: float):
+        self.directory = directory
+        self.budget_bytes = max(0, budget_bytes)
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CacheEntry] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def key_for(source: str) -> str:
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def get(self, source: str) -> Optional[str]:
+        """Path of the cached file for source, or None; counts a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(self.key_for(source))
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry.last_access = time.time()
+            self._dirty = True
+            self._save_if_due()
+            return os.path.join(self.directory, entry.filename)
+
+    def entry(self, source: str) -> Optional[CacheEntry]:
+        """A copy of the manifest entry for source, e.g. for its validators."""
+        with self._lock:
+            entry = self._entries.get(self.key_for(source))
+            return CacheEntry(**asdict(entry)) if entry else None
+
+    def put(self, source: str, data: bytes, ext: str = '', etag: str = '',
+            last_modified: str = '', expires: float = 0.0) -> str:
+        """Store data for source atomically and return its path."""
+        key = self.key_for(source)
+        filename = key + (ext if ext and _CACHE_FILE.match(key + ext) else '')
+        path = os.path.join(self.directory, filename)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        now = time.time()
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None and old.filename != filename:
+                self._remove_file(old.filename)
+            self._entries[key] = CacheEntry(
+                filename=filename, size=len(data), source=source[:200], created=now,
+                last_access=now, etag=etag, last_modified=last_modified, expires=expires,
+            )
+            self._evict(keep=key)
+            self._save()
+        return path
+
+    def refresh(self, source: str, etag: str = '', last_modified: str = '', expires: float = 0.0):
+        """Record a successful revalidation (HTTP 304) of the cached file."""
+        with self._lock:
+            entry = self._entries.get(self.key_for(source))
+            if entry is None:
+                return
+            entry.etag = etag or entry.etag
+            entry.last_modified = last_modified or entry.last_modified
+            entry.expires = expires
+            entry.last_access = time.time()
+            self._dirty = True
+            self._save_if_due()
+
+    def discard(self, source: str):
+        """Forget source, e.g. when its file turned out to be unreadable."""
+        with self._lock:
+            entry = self._entries.pop(self.key_for(source), None)
+            if entry is not None:
+                self._remove_file(entry.filename)
+                self._save()
+
+    def flush(self):
+        """Write pending access times to the manifest."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(entry.size for entry in self._entries.values()),
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _load(self):
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        try:
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                for key, data in manifest['entries'].items():
+                    self._entries[key] = CacheEntry(**data)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable cache manifest {path}: {e}")
+
+        # Reconcile with the directory: drop entries whose file is gone and
+        # files no entry owns (left by a crash between write and manifest save)
+        files = set(os.listdir(self.directory))
+        for key, entry in list(self._entries.items()):
+            if entry.filename not in files:
+                del self._entries[key]
+                self._dirty = True
+        owned = {entry.filename for entry in self._entries.values()}
+        for name in files:
+            if name.endswith('.tmp'):
+                # Temp files of put() and _save(); other writers' temp files are left alone
+                if _CACHE_FILE.match(name.split('.')[0]) or name.startswith(MANIFEST_FILE):
+                    self._remove_file(name)
+            elif _CACHE_FILE.match(name) and name not in owned:
+                self._remove_file(name)
+        with self._lock:
+            self._evict()
+            if self._dirty:
+                self._save()
+
+    def _evict(self, keep: Optional[str] = None):
+        # Caller holds the lock
+        now = time.time()
+        if self.max_age:
+            for key, entry in list(self._entries.items()):
+                if key != keep and now - entry.last_access > self.max_age:
+                    self._drop(key)
+        total = sum(entry.size for entry in self._entries.values())
+        if total <= self.budget_bytes:
+            return
+        for key in sorted(self._entries, key=lambda k: self._entries[k].last_access):
+            if total <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._entries[key].size
+            self._drop(key)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._remove_file(entry.filename)
+        self.evictions += 1
+        self._dirty = True
+
+    def _remove_file(self, filename: str):
+        try:
+            os.remove(os.path.join(self.directory, filename))
+        except OSError:
+            pass
+
+    def _save_if_due(self):
+        if time.monotonic() - self._saved_at >= MANIFEST_SAVE_INTERVAL:
+            self._save()
+
+    def _save(self):
+        # Caller holds the lock
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'entries': {key: asdict(entry) for key, entry in self._entries.items()},
+        }
+        try:
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, path)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        except Exception as e:
+            print(f"Failed to save cache manifest: {e}")
+
+
+_disk_cache: Optional[DiskCache] = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_disk_cache() -> DiskCache:
+    """The process-wide DiskCache over CACHE_DIR, sized from settings on first use."""
+    global _disk_cache
+    with _disk_cache_lock:
+        if _disk_cache is None:
+            settings = load_settings()['cache']
+            _disk_cache = DiskCache(CACHE_DIR, int(settings['disk_budget_mb'] * 1024 * 1024),
+                                    settings['max_age_days'])
+        return _disk_cache
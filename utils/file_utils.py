@@ -3,10 +3,116 @@ Utility functions for file operations
 """
 import json
 import os
-from typing import List, Set
+import threading
+from typing import Dict, Iterable, List, Set
 from models.feature import Feature
 
 INSTALLED_FILE = 'resources/installed_images.json'
+SETTINGS_FILE = 'resources/settings.json'
+PULL_STATS_FILE = 'resources/pull_stats.json'
+PODMAN_STATE_FILE = 'resources/podman_state.json'
+STORE_INTEREST_FILE = 'resources/store_interest.json'
+PREFETCHED_FILE = 'resources/prefetched_images.json'
+IMAGE_USAGE_FILE = 'resources/image_usage.json'
+START_LATENCY_FILE = 'resources/start_latency.json'
+MIRROR_STATS_FILE = 'resources/mirror_stats.json'
+WEATHER_FILE = 'resources/weather_snapshot.json'
+
+# Oldest per-layer pull records are dropped beyond this count
+MAX_PULL_STATS = 500
+
+# Start timings kept per app and kind (cold / warm / restore)
+MAX_START_SAMPLES = 20
+
+# Default values for every settings section; resources/settings.json only
+# needs to contain the keys it wants to override.
+DEFAULT_SETTINGS = {
+    'install': {
+        'max_concurrent_jobs': 2,
+    },
+    'reconcile': {
+        'interval_seconds': 300,
+    },
+    'prefetch': {
+        'enabled': False,
+        'idle_seconds': 120,
+        'bandwidth_limit_mbps': 2.0,
+        'disk_budget_mb': 2048,
+        'max_images': 3,
+    },
+    'bundles': {
+        # Searched in order for <image with '/' as '_'>.tar[.gz] archives
+        'directories': ['/media/adas-bundles', 'resources/bundles'],
+        'require_digest': True,      # Skip bundles whose catalog entry has no digest
+    },
+    'registries': {
+        # Tried in order of measured speed before upstream, e.g. a local
+        # pull-through cache: ["registry-cache.local:5000"]
+        'mirrors': [],
+        'upstream': 'docker.io',
+        'failure_cooldown_seconds': 60,  # Doubles per consecutive failure
+    },
+    'resource_limits': {
+        'enabled': True,
+        # Applied when an app container is created; a catalog entry's
+        # "resources" object overrides single keys. 0 means unlimited.
+        'default': {
+            'cpu_shares': 512,       # Half the dashboard's weight under contention
+            'cpu_percent': 50,       # Hard cap, percent of one core
+            'memory_mb': 512,
+            'pids_limit': 256,
+        },
+    },
+    'storage': {
+        'budget_mb': 6144,           # Podman image storage kept under this size
+        'auto_prune': True,          # Evict least-recently-used apps after installs
+    },
+    'warm_pool': {
+        'enabled': False,            # Installs leave a created, stopped container
+        'max_running': 3,            # Pool apps allowed to run at once
+        'policy': 'lru',             # 'lru': stop the oldest to make room; 'reject': refuse the start
+        'checkpoint': False,         # Checkpoint on stop and restore on start (needs CRIU)
+    },
+    'logs': {
+        'buffer_lines': 5000,        # Ring buffer per open log viewer; older lines are dropped
+        'tail_lines': 500,           # Lines of history shown when a viewer opens
+    },
+    'telemetry': {
+        'enabled': True,
+        'interval_seconds': 1,
+        'cpu_budget_percent': 1.0,   # Of one core, for the collector and its card updates
+    },
+    'icons': {
+        'memory_cache_entries': 256, # Rendered themed icons kept in memory (LRU)
+        'atlas_enabled': True,       # Pre-rendered per-theme atlas in resources/cache
+        'remote_workers': 4,         # Parallel downloads of remote (http) icons
+        'remote_per_host': 2,        # ... of which at most this many from one host
+    },
+    'cache': {
+        'disk_budget_mb': 64,        # Downloaded and decoded images in resources/cache (LRU)
+        'max_age_days': 30,          # Files unused this long are dropped
+    },
+    'weather': {
+        'location': 'Cairo',         # City name or "lat,lon"
+        'ttl_seconds': 600,          # Shown data is refetched once it is this old
+        'retry_seconds': 30,         # First retry after a failed fetch, doubled per failure
+    },
+    'clock': {
+        'timezone': 'Africa/Cairo',  # Shown by the top bar and dashboard clocks
+    },
+    'scheduler': {
+        'jitter': 0.1,               # Network job delays vary by +/- this fraction
+        'max_backoff_seconds': 900,  # Cap on the retry delay of a failing job
+        'probe_host': '1.1.1.1',     # TCP connectivity probe, used when the OS reports no reachability
+        'probe_port': 53,
+        'probe_interval_seconds': 30,
+    },
+}
+
+# Guards read-modify-write cycles on INSTALLED_FILE from the GUI and worker threads
+_installed_lock = threading.Lock()
+_pull_stats_lock = threading.Lock()
+_start_latency_lock = threading.Lock()
 
 
 def load_installed_images() -> Set[str]:
@@ -20,10 +126,201 @@ def load_installed_images() -> Set[str]:
     return set()
 
 
-def save_installed_images(installed_set: Set[str]) -> None:
-    """Save the set of installed image names to file"""
-    with open(INSTALLED_FILE, 'w') as f:
-        json.dump(list(installed_set), f)
+def update_installed_images(added: Iterable[str] = (), removed: Iterable[str] = ()) -> Set[str]:
+    """
+    Add and remove image names in the installed images file and return the
+    new set (thread-safe). Every write goes through here: callers pass their
+    changes rather than a whole set, so an image another thread has just
+    recorded is not dropped by a stale copy.
+    """
+    added, removed = set(added), set(removed)
+    with _installed_lock:
+        installed_images = load_installed_images()
+        updated = (installed_images | added) - removed
+        if updated != installed_images:
+            _write_json_atomic(INSTALLED_FILE, sorted(updated))
+        return updated
+
+
+def add_installed_image(image_name: str) -> None:
+    """Add a single image name to the installed images file (thread-safe)"""
+    update_installed_images(added=[image_name])
+
+
+def _write_json_atomic(path: str, data) -> None:
+    """Write data to a temporary file and rename it over path, so readers never see half a file"""
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+def load_pull_stats() -> List[dict]:
+    """Load the recorded per-layer pull timings"""
+    if os.path.exists(PULL_STATS_FILE):
+        try:
+            with open(PULL_STATS_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return []
+    return []
+
+
+def append_pull_stats(records: List[dict]) -> None:
+    """Append per-layer pull timings, keeping the newest MAX_PULL_STATS entries"""
+    if not records:
+        return
+    with _pull_stats_lock:
+        stats = load_pull_stats() + records
+        with open(PULL_STATS_FILE, 'w') as f:
+            json.dump(stats[-MAX_PULL_STATS:], f, indent=2)
+
+
+def load_start_latency() -> Dict[str, Dict[str, List[float]]]:
+    """Load recorded app start times: {image_name: {kind: [seconds]}}"""
+    if os.path.exists(START_LATENCY_FILE):
+        try:
+            with open(START_LATENCY_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    return {}
+
+
+def record_start_latency(image_name: str, kind: str, seconds: float) -> None:
+    """Append one start timing, keeping the last MAX_START_SAMPLES per kind (thread-safe)"""
+    with _start_latency_lock:
+        latency = load_start_latency()
+        samples = latency.setdefault(image_name, {}).setdefault(kind, [])
+        samples.append(round(seconds, 4))
+        del samples[:-MAX_START_SAMPLES]
+        with open(START_LATENCY_FILE, 'w') as f:
+            json.dump(latency, f, indent=2)
+
+
+def load_mirror_stats() -> Dict[str, dict]:
+    """Load per-registry pull statistics"""
+    if os.path.exists(MIRROR_STATS_FILE):
+        try:
+            with open(MIRROR_STATS_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    return {}
+
+
+def save_mirror_stats(stats: Dict[str, dict]) -> None:
+    """Save per-registry pull statistics"""
+    with open(MIRROR_STATS_FILE, 'w') as f:
+        json.dump(stats, f, indent=2)
+
+
+def load_podman_state() -> dict | None:
+    """Load the cached Podman image/container snapshot, if any"""
+    if os.path.exists(PODMAN_STATE_FILE):
+        try:
+            with open(PODMAN_STATE_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+    return None
+
+
+def save_podman_state(state: dict) -> None:
+    """Cache the Podman image/container snapshot"""
+    with open(PODMAN_STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2)
+
+
+def load_weather_snapshot() -> dict | None:
+    """Load the last fetched weather, if any"""
+    if os.path.exists(WEATHER_FILE):
+        try:
+            with open(WEATHER_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+    return None
+
+
+def save_weather_snapshot(snapshot: dict) -> None:
+    """Cache the last fetched weather"""
+    with open(WEATHER_FILE, 'w') as f:
+        json.dump(snapshot, f, indent=2)
+
+
+def load_store_interest() -> dict:
+    """Load how often each image's store card info was opened"""
+    if os.path.exists(STORE_INTEREST_FILE):
+        try:
+            with open(STORE_INTEREST_FILE, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    return {}
+
+
+def record_store_interest(image_name: str) -> None:
+    """Count one InfoDialog opening for an image"""
+    interest = load_store_interest()
+    interest[image_name] = interest.get(image_name, 0) + 1
+    with open(STORE_INTEREST_FILE, 'w') as f:
+        json.dump(interest, f, indent=2)
+
+
+def load_prefetched_images() -> Set[str]:
+    """Load the set of images pulled speculatively by the prefetcher"""
+    if os.path.exists(PREFETCHED_FILE):
+        try:
+            with open(PREFETCHED_FILE, 'r') as f:
+                return set(json.load(f))
+        except Exception:
+            return set()
+    return set()
+
+
+def save_prefetched_images(prefetched: Set[str]) -> None:
+    """Save the set of speculatively pulled images"""
+    with open(PREFETCHED_FILE, 'w') as f:
+        json.dump(sorted(prefetched), f)
+
+
+def load_image_usage() -> Dict[str, dict]:
+    """Load each app image's last-used time (epoch seconds) and size in bytes"""
+    if os.path.exists(IMAGE_USAGE_FILE):
+        try:
+            with open(IMAGE_USAGE_FILE, 'r') as f:
+                data = json.load(f)
+            # Older files held only the last-used time
+            return {
+                name: entry if isinstance(entry, dict) else {'last_used': entry, 'size': 0}
+                for name, entry in data.items()
+            }
+        except Exception:
+            return {}
+    return {}
+
+
+def save_image_usage(usage: Dict[str, dict]) -> None:
+    """Save each app image's last-used time and size"""
+    _write_json_atomic(IMAGE_USAGE_FILE, usage)
+
+
+def load_settings() -> dict:
+    """Load application settings, filling in defaults for missing keys"""
+    settings = {section: dict(values) for section, values in DEFAULT_SETTINGS.items()}
+    if os.path.exists(SETTINGS_FILE):
+        try:
+            with open(SETTINGS_FILE, 'r') as f:
+                data = json.load(f)
+            for section, values in data.items():
+                if isinstance(values, dict):
+                    settings.setdefault(section, {}).update(values)
+                else:
+                    settings[section] = values
+        except Exception as e:
+            print(f"Error reading settings, using defaults: {e}")
+    return settings
 
 
 def load_features() -> List[Feature]:
@@ -44,7 +341,10 @@ def save_features(features: list) -> None:
             "name": feature.get("name", ""),
             "location": feature.get("location", ""),
             "description": feature.get("description", ""),
-            "icon": feature.get("pictureUrl", "")  # Map pictureUrl to icon
+            "icon": feature.get("pictureUrl", ""),  # Map pictureUrl to icon
+            "priority": feature.get("priority", 0),
+            "digest": feature.get("digest", ""),
+            "resources": feature.get("resources") or {}
         })
     
     with open('resources/dummy_features.json', 'w') as f: